@@ -7,9 +7,13 @@ Supports Chrome, Edge, Brave (Chromium) and Firefox browsers.
 
 import asyncio
 import contextlib
+import itertools
 import logging
 import random
 import re
+import threading
+import weakref
+from collections import deque
 from collections.abc import Callable
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
@@ -23,7 +27,7 @@ from .constants import (
     BROWSER_VIEWPORTS,
     CAPTCHA_MARKERS,
     CLOUDFLARE_MARKERS,
-    CLOUDFLARE_TITLE_MARKERS,
+    CLOUDFLARE_TITLE_RE,
     OS_PROFILES,
     SUCCESS_STATUS_CODES,
     get_referers,
@@ -36,6 +40,7 @@ try:
     from playwright.async_api import (
         Browser,
         BrowserContext,
+        Error as PlaywrightError,
         Page,
         Playwright,
         async_playwright,
@@ -43,7 +48,74 @@ try:
 
     playwright_available = True
 except ImportError:
-    pass
+    PlaywrightError = Exception
+
+
+# Protection markers live in <head>/bootstrap scripts; only scan this much
+PROTECTION_SCAN_BYTES = 32 * 1024
+
+# Detection markers pre-encoded for bytes-level scanning of raw page bodies
+CLOUDFLARE_MARKERS_B = tuple(m.encode() for m in CLOUDFLARE_MARKERS)
+AKAMAI_MARKERS_B = tuple(m.encode() for m in AKAMAI_MARKERS)
+# Presence-only checks use one compiled alternation instead of N scans
+CF_STRONG_MARKERS_RE = re.compile(
+    rb"challenge-platform|__cf_chl_opt|cf_chl_prog|window\._cf_chl_opt"
+)
+# Generic (non-Turnstile) captcha markers; Turnstile is handled as Cloudflare
+GENERIC_CAPTCHA_MARKERS_RE = re.compile(
+    b"|".join(
+        re.escape(m.encode())
+        for m in CAPTCHA_MARKERS
+        if "cf-turnstile" not in m and "cloudflare" not in m.lower()
+    )
+)
+# Challenge still running (used by the bypass check on rendered HTML)
+CF_CHALLENGE_RE = re.compile("challenge-platform|__cf_chl_opt|cf_chl_prog")
+
+# Interned viewport/screen dicts keyed by (width, height); never mutated.
+_VIEWPORT_CACHE: dict[tuple[int, int], dict] = {}
+
+# Shared Playwright driver, one per event loop. Each engine runs in its own
+# asyncio.run() thread and Playwright objects are bound to the loop that
+# started them, so engines on the same loop share a driver (refcounted).
+_playwright_shared: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+_playwright_shared_guard = threading.Lock()
+
+
+def _get_playwright_entry() -> dict:
+    """Get (or create) the shared driver entry for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _playwright_shared_guard:
+        entry = _playwright_shared.get(loop)
+        if entry is None:
+            entry = {"lock": asyncio.Lock(), "playwright": None, "refs": 0}
+            _playwright_shared[loop] = entry
+        return entry
+
+
+async def _acquire_playwright() -> "Playwright":
+    """Start the shared Playwright driver if needed and take a reference."""
+    entry = _get_playwright_entry()
+    async with entry["lock"]:
+        if entry["playwright"] is None:
+            entry["playwright"] = await async_playwright().start()
+        entry["refs"] += 1
+        return entry["playwright"]
+
+
+async def _release_playwright():
+    """Drop a reference; stop the driver when the last engine releases it."""
+    entry = _get_playwright_entry()
+    async with entry["lock"]:
+        entry["refs"] = max(0, entry["refs"] - 1)
+        if entry["refs"] > 0 or entry["playwright"] is None:
+            return
+        playwright = entry["playwright"]
+        entry["playwright"] = None
+        with contextlib.suppress(Exception):
+            await playwright.stop()
 
 
 def generate_stealth_script(profile: dict, session_seed: int = None) -> str:
@@ -427,7 +499,7 @@ class PlaywrightTrafficEngine:
 
         # Get browser name for display
         browser_info = BrowserManager.get_browser_info_from_path(
-            self._executable_path or ""
+            self._executable_path or "", fetch_version=False
         )
         self._browser_name = (
             browser_info.name
@@ -438,9 +510,41 @@ class PlaywrightTrafficEngine:
         # Playwright objects
         self._playwright: Playwright | None = None
         self._browser: Browser | None = None
-        # Context pool: list of (context, proxy, metadata) tuples
+        # Static context options, copied and completed per context
+        self._ctx_base_opts = {
+            "locale": config.browser.locale,
+            "ignore_https_errors": not config.verify_ssl,
+            "color_scheme": "light",
+        }
+
+        # OS profiles compatible with the configured browser type
+        browser_type_map = {
+            "chromium": ["chromium", "webkit"],
+            "firefox": ["firefox"],
+            "webkit": ["webkit", "chromium"],
+        }
+        compatible_types = browser_type_map.get(self._browser_type, ["chromium"])
+        self._compatible_profiles = [
+            p for p in OS_PROFILES if p.get("browser_type") in compatible_types
+        ] or [OS_PROFILES[0]]
+
+        # Context pool: {key: (context, proxy, metadata)}, keyed by proxy
+        # (host, port) or ("direct", id(context)) for direct connections
         # metadata = {"created_at": timestamp, "request_count": int, "profile_name": str}
-        self._contexts: list[tuple] = []
+        self._contexts: dict[tuple, tuple] = {}
+        # Proxies without a context, next in line when a context is recycled
+        self._spare_proxies: deque[ProxyConfig] = deque()
+        # Idle context keys, handed out to request workers (created in run())
+        self._ctx_queue: asyncio.Queue | None = None
+        # Keys currently held by a worker; never queued a second time, so a
+        # context serves at most one visit even if its proxy is re-added
+        self._checked_out: set[tuple] = set()
+        # Event loop of the current run() plus its signalling events:
+        # _stop_event is set once on shutdown, _wake_event wakes the
+        # supervisor (shutdown or context pool drained)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop_event: asyncio.Event | None = None
+        self._wake_event: asyncio.Event | None = None
 
         # Captcha manager (lazy loaded)
         self._captcha_manager = None
@@ -495,18 +599,18 @@ class PlaywrightTrafficEngine:
         await self._update_balances()
 
         while self.running:
-            # Wait 5 minutes between checks
-            for _ in range(300):  # 300 seconds = 5 minutes
-                if not self.running:
-                    return
-                await asyncio.sleep(1)
+            # Wait 5 minutes between checks, returning early on shutdown
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop_event.wait(), timeout=300)
+            if not self.running:
+                return
 
             # Check balances
             await self._update_balances()
 
     async def _launch_browser(self):
         """Launch browser with configured settings. Supports Chrome, Edge, Brave, and Firefox."""
-        self._playwright = await async_playwright().start()
+        self._playwright = await _acquire_playwright()
 
         launch_options = {
             "headless": self.config.browser.headless,
@@ -542,36 +646,24 @@ class PlaywrightTrafficEngine:
         Returns:
             Configured BrowserContext
         """
-        # Select an OS profile that matches the current browser type
-        browser_type_map = {
-            "chromium": ["chromium", "webkit"],
-            "firefox": ["firefox"],
-            "webkit": ["webkit", "chromium"],
-        }
-        compatible_types = browser_type_map.get(self._browser_type, ["chromium"])
-        compatible_profiles = [
-            p for p in OS_PROFILES if p.get("browser_type") in compatible_types
-        ]
-
-        # Select a random compatible profile
-        os_profile = (
-            random.choice(compatible_profiles)
-            if compatible_profiles
-            else OS_PROFILES[0]
-        )
+        # Select a random OS profile compatible with the current browser type
+        os_profile = random.choice(self._compatible_profiles)
 
         # Random viewport for variety
         viewport = random.choice(BROWSER_VIEWPORTS)
+        viewport_dict = _VIEWPORT_CACHE.get(viewport)
+        if viewport_dict is None:
+            viewport_dict = _VIEWPORT_CACHE.setdefault(
+                viewport, {"width": viewport[0], "height": viewport[1]}
+            )
 
-        context_options = {
-            "viewport": {"width": viewport[0], "height": viewport[1]},
-            "user_agent": os_profile["user_agent"],
-            "locale": self.config.browser.locale,
-            "timezone_id": os_profile.get("timezone", self.config.browser.timezone),
-            "ignore_https_errors": not self.config.verify_ssl,
-            "color_scheme": "light",
-            "screen": {"width": viewport[0], "height": viewport[1]},
-        }
+        context_options = dict(self._ctx_base_opts)
+        context_options["viewport"] = viewport_dict
+        context_options["screen"] = viewport_dict
+        context_options["user_agent"] = os_profile["user_agent"]
+        context_options["timezone_id"] = os_profile.get(
+            "timezone", self.config.browser.timezone
+        )
 
         # Load persisted cookies from session manager
         if self.session_manager:
@@ -614,12 +706,35 @@ class PlaywrightTrafficEngine:
 
         return context, metadata
 
-    async def _detect_protection(self, page: Page) -> tuple:
+    async def _add_context(self, proxy: ProxyConfig | None = None) -> tuple:
+        """
+        Create a context for the given proxy and register it in the pool.
+
+        Returns:
+            The pool key of the context (existing key if the proxy already has one)
+        """
+        if proxy and (proxy.host, proxy.port) in self._contexts:
+            return (proxy.host, proxy.port)
+
+        context, metadata = await self._create_context(proxy)
+        key = (proxy.host, proxy.port) if proxy else ("direct", id(context))
+        self._contexts[key] = (context, proxy, metadata)
+        if self._ctx_queue is not None and key not in self._checked_out:
+            self._ctx_queue.put_nowait(key)
+        return key
+
+    async def _detect_protection(self, page: Page, response=None) -> tuple:
         """
         Detect if page has bot protection using multiple signals.
 
+        Markers are matched as bytes against the first PROTECTION_SCAN_BYTES
+        of the raw response body when the navigation response is given (no
+        DOM serialization); otherwise the rendered page content is used.
+        Site keys are read from the DOM.
+
         Args:
             page: Playwright page object
+            response: Optional navigation response whose body is scanned
 
         Returns:
             Tuple of (protection_type, site_key, confidence)
@@ -627,15 +742,17 @@ class PlaywrightTrafficEngine:
             site_key: Captcha site key if found, else None
         """
         try:
-            content = await page.content()
-            title = await page.title()
+            content = None
+            if response is not None:
+                with contextlib.suppress(PlaywrightError):
+                    content = await response.body()
+            if content is None:
+                content = (await page.content()).encode()
+            content = content[:PROTECTION_SCAN_BYTES]
 
             # Count Cloudflare markers for confidence scoring
             cf_marker_count = sum(
-                1 for marker in CLOUDFLARE_MARKERS if marker in content
-            )
-            cf_title_match = any(
-                marker.lower() in title.lower() for marker in CLOUDFLARE_TITLE_MARKERS
+                1 for marker in CLOUDFLARE_MARKERS_B if marker in content
             )
 
             # Check for Cloudflare challenge page
@@ -643,23 +760,16 @@ class PlaywrightTrafficEngine:
             is_cloudflare = False
 
             # Strong signals (any one = definite Cloudflare)
-            strong_cf_signals = [
-                "challenge-platform" in content,
-                "__cf_chl_opt" in content,
-                "cf_chl_prog" in content,
-                "cdn-cgi/challenge-platform" in content,
-                "window._cf_chl_opt" in content,
-            ]
-
-            if any(strong_cf_signals):
+            if CF_STRONG_MARKERS_RE.search(content):
                 is_cloudflare = True
                 logging.debug("Cloudflare detected via strong signal")
             elif cf_marker_count >= 2:
                 is_cloudflare = True
                 logging.debug(f"Cloudflare detected via {cf_marker_count} markers")
-            elif cf_title_match and cf_marker_count >= 1:
-                is_cloudflare = True
-                logging.debug("Cloudflare detected via title + marker")
+            elif cf_marker_count >= 1:
+                if CLOUDFLARE_TITLE_RE.search(await page.title()):
+                    is_cloudflare = True
+                    logging.debug("Cloudflare detected via title + marker")
 
             if is_cloudflare:
                 # Check for Turnstile specifically
@@ -667,21 +777,17 @@ class PlaywrightTrafficEngine:
                 return "cloudflare", site_key
 
             # Check Akamai
-            akamai_count = sum(1 for marker in AKAMAI_MARKERS if marker in content)
+            akamai_count = sum(1 for marker in AKAMAI_MARKERS_B if marker in content)
             if akamai_count >= 2:
                 return "akamai", None
 
             # Check generic captcha (non-Cloudflare)
-            for marker in CAPTCHA_MARKERS:
-                if marker in content:
-                    # Skip if it's Turnstile (handled by Cloudflare)
-                    if "cf-turnstile" in marker or "cloudflare" in marker.lower():
-                        continue
-                    site_key = await self._extract_site_key(page, "recaptcha")
-                    if not site_key:
-                        site_key = await self._extract_site_key(page, "hcaptcha")
-                    if site_key:
-                        return "captcha", site_key
+            if GENERIC_CAPTCHA_MARKERS_RE.search(content):
+                site_key = await self._extract_site_key(page, "recaptcha")
+                if not site_key:
+                    site_key = await self._extract_site_key(page, "hcaptcha")
+                if site_key:
+                    return "captcha", site_key
 
         except Exception as e:
             logging.debug(f"Protection detection error: {e}")
@@ -786,21 +892,11 @@ class PlaywrightTrafficEngine:
 
             # Check 2: No challenge markers in content
             content = await page.content()
-            has_challenge = any(
-                marker in content
-                for marker in [
-                    "challenge-platform",
-                    "__cf_chl_opt",
-                    "cf_chl_prog",
-                    "cdn-cgi/challenge-platform",
-                ]
-            )
+            has_challenge = CF_CHALLENGE_RE.search(content) is not None
 
             # Check 3: Title doesn't indicate challenge
             title = await page.title()
-            challenge_title = any(
-                marker.lower() in title.lower() for marker in CLOUDFLARE_TITLE_MARKERS
-            )
+            challenge_title = CLOUDFLARE_TITLE_RE.search(title) is not None
 
             # Check 4: Page has actual content (not just challenge)
             body_text = await page.evaluate(
@@ -1006,7 +1102,7 @@ class PlaywrightTrafficEngine:
                         await asyncio.sleep(2)
 
                         # May timeout, that's ok
-                        with contextlib.suppress(Exception):
+                        with contextlib.suppress(PlaywrightError):
                             await page.wait_for_load_state("networkidle", timeout=10000)
 
                         # Final verification
@@ -1131,94 +1227,83 @@ class PlaywrightTrafficEngine:
             except ValueError:
                 pass
 
-        # Find and remove the context from our pool
-        for i, (ctx, ctx_proxy, _meta) in enumerate(self._contexts):
-            if ctx_proxy == proxy:
-                with contextlib.suppress(Exception):
-                    await ctx.close()
-                self._contexts.pop(i)
-                logging.debug(
-                    f"Closed context for dead proxy {proxy.host}:{proxy.port}"
-                )
-                break
+        # Remove the context from our pool
+        entry = self._contexts.pop((proxy.host, proxy.port), None)
+        if entry:
+            with contextlib.suppress(PlaywrightError):
+                await entry[0].close()
+            logging.debug(f"Closed context for dead proxy {proxy.host}:{proxy.port}")
 
         # Schedule context recreation if we have spare proxies
         if self.proxies and len(self._contexts) < self.config.browser.max_contexts:
             await self._recycle_context()
 
+        if not self._contexts:
+            self._wake_supervisor()
+
     async def _recycle_context(self):
         """Create a new context with an available proxy to replace a dead one."""
         if not self._browser or not self.proxies:
             return
 
-        # Find a proxy not currently in use
-        # Use (host, port) tuples as keys since ProxyConfig is not hashable
-        used_proxy_keys = {
-            (ctx_proxy.host, ctx_proxy.port)
-            for _, ctx_proxy, _ in self._contexts
-            if ctx_proxy is not None
-        }
-        available = [p for p in self.proxies if (p.host, p.port) not in used_proxy_keys]
-
-        if not available:
-            # All proxies in use, just pick any
-            available = self.proxies
+        # Take the next spare proxy (pool is keyed by (host, port))
+        while self._spare_proxies:
+            proxy = self._spare_proxies.popleft()
+            if (proxy.host, proxy.port) not in self._contexts:
+                break
+        else:
+            # Every live proxy already has a context
+            return
 
-        if available:
-            proxy = random.choice(available)
-            try:
-                context, metadata = await self._create_context(proxy)
-                self._contexts.append((context, proxy, metadata))
-                logging.info(f"Recycled context with proxy {proxy.host}:{proxy.port}")
-            except Exception as e:
-                logging.debug(f"Failed to recycle context: {e}")
+        try:
+            await self._add_context(proxy)
+            logging.info(f"Recycled context with proxy {proxy.host}:{proxy.port}")
+        except Exception as e:
+            self._spare_proxies.append(proxy)
+            logging.debug(f"Failed to recycle context: {e}")
 
-    async def _check_fingerprint_rotation(self):
+    async def _check_fingerprint_rotation(self, key: tuple):
         """
-        Check if any contexts need fingerprint rotation based on request count or time.
-        Rotates contexts that exceed thresholds to simulate user closing/reopening browser.
+        Check if a context needs fingerprint rotation based on request count or time.
+        Rotates it in place (same pool key) to simulate user closing/reopening browser.
+        Called by the worker holding the context, so it is never in use elsewhere.
         """
-        if not self._contexts:
+        entry = self._contexts.get(key)
+        if entry is None:
             return
 
+        ctx, proxy, meta = entry
         rotation_requests = self.config.browser.fingerprint_rotation_requests
         rotation_minutes = self.config.browser.fingerprint_rotation_minutes
-        current_time = self._time.time()
-
-        contexts_to_rotate = []
 
-        for i, (_ctx, _proxy, meta) in enumerate(self._contexts):
-            # Check request count threshold
-            if meta["request_count"] >= rotation_requests:
-                contexts_to_rotate.append(i)
-                continue
-
-            # Check time threshold (convert minutes to seconds)
-            age_seconds = current_time - meta["created_at"]
-            if age_seconds >= (rotation_minutes * 60):
-                contexts_to_rotate.append(i)
+        # Check request count and time thresholds (convert minutes to seconds)
+        age_seconds = self._time.time() - meta["created_at"]
+        if (
+            meta["request_count"] < rotation_requests
+            and age_seconds < rotation_minutes * 60
+        ):
+            return
 
-        # Rotate contexts (in reverse order to preserve indices)
-        for i in reversed(contexts_to_rotate):
-            ctx, proxy, meta = self._contexts[i]
-            old_profile = meta.get("profile_name", "Unknown")
-            old_requests = meta["request_count"]
+        old_profile = meta.get("profile_name", "Unknown")
+        old_requests = meta["request_count"]
 
-            # Close old context
-            with contextlib.suppress(Exception):
-                await ctx.close()
+        # Close old context
+        with contextlib.suppress(PlaywrightError):
+            await ctx.close()
 
-            # Create new context with fresh fingerprint
-            try:
-                new_ctx, new_meta = await self._create_context(proxy)
-                self._contexts[i] = (new_ctx, proxy, new_meta)
-                self._log(
-                    f"Rotated fingerprint: {old_profile} ({old_requests} reqs) -> {new_meta['profile_name']}"
-                )
-            except Exception as e:
-                # Remove failed context
-                self._contexts.pop(i)
-                logging.warning(f"Failed to rotate context: {e}")
+        # Create new context with fresh fingerprint
+        try:
+            new_ctx, new_meta = await self._create_context(proxy)
+            self._contexts[key] = (new_ctx, proxy, new_meta)
+            self._log(
+                f"Rotated fingerprint: {old_profile} ({old_requests} reqs) -> {new_meta['profile_name']}"
+            )
+        except Exception as e:
+            # Remove failed context
+            self._contexts.pop(key, None)
+            logging.warning(f"Failed to rotate context: {e}")
+            if not self._contexts:
+                self._wake_supervisor()
 
     async def _handle_captcha(self, page: Page, site_key: str) -> bool:
         """
@@ -1342,7 +1427,9 @@ class PlaywrightTrafficEngine:
                 status = response.status
 
                 # Check for protection
-                protection_type, site_key = await self._detect_protection(page)
+                protection_type, site_key = await self._detect_protection(
+                    page, response
+                )
 
                 if protection_type == "cloudflare":
                     bypass_success = await self._handle_cloudflare(page, site_key)
@@ -1459,7 +1546,7 @@ class PlaywrightTrafficEngine:
 
         finally:
             if page:
-                with contextlib.suppress(Exception):
+                with contextlib.suppress(PlaywrightError):
                     await page.close()
 
             self.stats.active_threads -= 1
@@ -1468,8 +1555,66 @@ class PlaywrightTrafficEngine:
                 self.stats.active_proxies = len(self.proxies)
                 self.on_update(self.stats)
 
-    async def run(self):
-        """Main loop - spawn browser contexts and workers."""
+    def _wake_supervisor(self):
+        """Wake run()'s supervisor loop (must be called on the engine's loop)."""
+        if self._wake_event is not None:
+            self._wake_event.set()
+
+    def _request_stop(self):
+        """Stop the engine and wake everything waiting on shutdown."""
+        self.running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
+        self._wake_supervisor()
+
+    def _visit_limit_reached(self) -> bool:
+        """Check whether the configured total visit count has been reached."""
+        return (
+            self.config.total_visits > 0
+            and self.stats.total_requests >= self.config.total_visits
+        )
+
+    async def _context_worker(self):
+        """
+        Request worker: take an idle context, visit with it, hand it back.
+
+        Contexts removed from the pool while queued or in use (dead proxy,
+        failed rotation) are simply not handed back.
+        """
+        while self.running:
+            key = await self._ctx_queue.get()
+            if key is None or not self.running:
+                return
+
+            entry = self._contexts.get(key)
+            if entry is None or key in self._checked_out:
+                continue
+
+            if self._visit_limit_reached():
+                self._request_stop()
+                return
+
+            context, proxy, metadata = entry
+            # Increment request count for this context
+            metadata["request_count"] += 1
+
+            self._checked_out.add(key)
+            try:
+                await self._make_request(context, proxy)
+                if self.config.browser.fingerprint_rotation_enabled:
+                    await self._check_fingerprint_rotation(key)
+            except Exception as e:
+                logging.debug(f"Context worker error: {e}")
+            finally:
+                self._checked_out.discard(key)
+                if key in self._contexts:
+                    self._ctx_queue.put_nowait(key)
+
+    async def _init(self):
+        """
+        Prepare a run: reset stats, start captcha solver, launch the browser
+        and create the context pool. Called by run() or __aenter__.
+        """
         self.running = True
         self.stats = TrafficStats()
 
@@ -1479,44 +1624,78 @@ class PlaywrightTrafficEngine:
 
         self._log(f"Browser engine starting with {len(self.proxies)} proxies...")
 
+        self._ctx_queue = asyncio.Queue()
+        self._checked_out.clear()
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._wake_event = asyncio.Event()
+
+        # Initialize captcha solver
+        await self._init_captcha_solver()
+
+        # Launch browser
+        await self._launch_browser()
+
+        # Determine number of contexts
+        max_contexts = self.config.browser.max_contexts
+        if self.proxies:
+            max_contexts = min(max_contexts, len(self.proxies))
+        max_contexts = max(1, max_contexts)
+
+        # Create context pool with proxies
+        self._log(f"Creating {max_contexts} browser contexts...")
+        for proxy in itertools.islice(
+            itertools.cycle(self.proxies or [None]), max_contexts
+        ):
+            await self._add_context(proxy)
+        self._spare_proxies = deque(
+            p for p in self.proxies if (p.host, p.port) not in self._contexts
+        )
+
+        self._log(f"Browser engine ready with {len(self._contexts)} contexts")
+
+    async def __aenter__(self):
+        """Initialize the engine; resources are released on exit."""
+        try:
+            await self._init()
+        except BaseException:
+            await self._cleanup()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Stop the engine and release browser resources."""
+        self.running = False
+        await self._cleanup()
+
+    async def run(self):
+        """Main loop - spawn browser contexts and workers."""
         balance_task = None
+        workers: set[asyncio.Task] = set()
+        wake_waiter = None
         try:
-            # Initialize captcha solver
-            await self._init_captcha_solver()
+            # Initialize unless already entered via "async with"
+            if self._browser is None:
+                await self._init()
 
             # Start balance check background task
             if self._captcha_manager:
                 balance_task = asyncio.create_task(self._balance_check_loop())
 
-            # Launch browser
-            await self._launch_browser()
-
-            # Determine number of contexts
-            max_contexts = self.config.browser.max_contexts
-            if self.proxies:
-                max_contexts = min(max_contexts, len(self.proxies))
-            max_contexts = max(1, max_contexts)
-
-            # Create context pool with proxies
-            self._log(f"Creating {max_contexts} browser contexts...")
-            for i in range(max_contexts):
-                proxy = self.proxies[i % len(self.proxies)] if self.proxies else None
-                context, metadata = await self._create_context(proxy)
-                self._contexts.append((context, proxy, metadata))
-
-            self._log(f"Browser engine ready with {len(self._contexts)} contexts")
-
-            tasks = set()
-            context_index = 0
+            # One worker per context; each context serves one visit at a time
+            workers = {
+                asyncio.create_task(self._context_worker())
+                for _ in range(len(self._contexts))
+            }
             no_proxy_warned = False
 
+            # Supervisor: sleeps until shutdown, a drained pool or a worker exit
             while self.running:
+                self._wake_event.clear()
+
                 # Check if we've hit visit limit
-                if (
-                    self.config.total_visits > 0
-                    and self.stats.total_requests >= self.config.total_visits
-                ):
-                    self.running = False
+                if self._visit_limit_reached():
+                    self._request_stop()
                     break
 
                 # Handle case where all proxies/contexts have died
@@ -1528,68 +1707,75 @@ class PlaywrightTrafficEngine:
                         no_proxy_warned = True
                     # Create a single direct context (no proxy)
                     try:
-                        direct_context, direct_meta = await self._create_context(
-                            proxy=None
-                        )
-                        self._contexts.append((direct_context, None, direct_meta))
+                        await self._add_context(proxy=None)
                         self._log("Direct connection context created")
                     except Exception as e:
                         self._log(f"Failed to create direct context: {e}")
-                        self.running = False
+                        self._request_stop()
                         break
 
-                # Check for fingerprint rotation
-                if self.config.browser.fingerprint_rotation_enabled:
-                    await self._check_fingerprint_rotation()
-
-                # Replenish tasks up to max contexts
-                while (
-                    len(tasks) < len(self._contexts) and self.running and self._contexts
-                ):
-                    if (
-                        self.config.total_visits > 0
-                        and self.stats.total_requests >= self.config.total_visits
-                    ):
-                        self.running = False
-                        break
-
-                    idx = context_index % len(self._contexts)
-                    context, proxy, metadata = self._contexts[idx]
-                    context_index += 1
-
-                    # Increment request count for this context
-                    metadata["request_count"] += 1
-
-                    task = asyncio.create_task(self._make_request(context, proxy))
-                    tasks.add(task)
-                    task.add_done_callback(tasks.discard)
-
-                if not self.running:
-                    break
-
-                # Slower polling for browser mode (more resource intensive)
-                await asyncio.sleep(0.5)
+                wake_waiter = asyncio.create_task(self._wake_event.wait())
+                done, _pending = await asyncio.wait(
+                    workers | {wake_waiter}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if wake_waiter not in done:
+                    wake_waiter.cancel()
 
-            # Wait for pending tasks
-            if tasks:
+                # Replace workers that exited while the engine is still running
+                for worker in done & workers:
+                    workers.discard(worker)
+                    if not self.running:
+                        continue
+                    if not worker.cancelled() and worker.exception():
+                        logging.warning(f"Context worker died: {worker.exception()}")
+                    workers.add(asyncio.create_task(self._context_worker()))
+
+            # Wake idle workers and wait for in-flight requests
+            for _ in workers:
+                self._ctx_queue.put_nowait(None)
+            if workers:
                 self._log("Waiting for pending requests...")
-                await asyncio.wait(tasks, timeout=15)
+                _done, pending = await asyncio.wait(workers, timeout=15)
+                for worker in pending:
+                    worker.cancel()
 
         except Exception as e:
             self._log(f"Browser engine error: {e}")
 
         finally:
-            # Cancel balance check task
+            stopping = [task for task in (*workers, wake_waiter) if task]
+            for task in stopping:
+                if not task.done():
+                    task.cancel()
+
+            # A cancellation arriving here must not skip cleanup (leaked
+            # browser processes); remember it and re-raise once done
+            cancelled = False
+
+            # Let cancelled workers unwind before their contexts are closed
+            try:
+                await asyncio.gather(*stopping, return_exceptions=True)
+            except asyncio.CancelledError:
+                cancelled = True
+
+            # Cancel balance check task (bounded wait, never raises its error)
             if balance_task and not balance_task.done():
                 balance_task.cancel()
-                with contextlib.suppress(asyncio.CancelledError):
-                    await balance_task
+                try:
+                    await asyncio.wait([balance_task], timeout=2)
+                except asyncio.CancelledError:
+                    cancelled = True
 
-            # Cleanup
-            await self._cleanup()
+            # Cleanup runs to completion even if run() itself is cancelled
+            try:
+                await asyncio.shield(self._cleanup())
+            except asyncio.CancelledError:
+                cancelled = True
             self._log(
                 f"Browser engine stopped. {self.stats.success} success, {self.stats.failed} failed."
             )
+            if cancelled:
+                raise asyncio.CancelledError()
 
     async def _cleanup(self):
         """Clean up browser resources."""
@@ -1597,7 +1783,7 @@ class PlaywrightTrafficEngine:
         if self.session_manager and self._contexts:
             try:
                 # Get cookies from the first active context
-                context, _proxy, _meta = self._contexts[0]
+                context, _proxy, _meta = next(iter(self._contexts.values()))
                 cookies = await context.cookies()
                 if cookies:
                     self.session_manager.save_session(self._target_domain, cookies)
@@ -1605,25 +1791,34 @@ class PlaywrightTrafficEngine:
             except Exception as e:
                 logging.debug(f"Could not save session cookies: {e}")
 
-        # Close contexts
-        for context, _proxy, _meta in self._contexts:
-            with contextlib.suppress(Exception):
-                await context.close()
+        # Close contexts concurrently (one driver round-trip instead of N)
+        await asyncio.gather(
+            *(context.close() for context, _proxy, _meta in self._contexts.values()),
+            return_exceptions=True,
+        )
         self._contexts.clear()
 
         # Close browser
         if self._browser:
-            with contextlib.suppress(Exception):
+            with contextlib.suppress(PlaywrightError):
                 await self._browser.close()
             self._browser = None
 
-        # Stop playwright
-        if self._playwright:
+        # Close the captcha solvers' shared HTTP session
+        if self._captcha_manager:
             with contextlib.suppress(Exception):
-                await self._playwright.stop()
+                await self._captcha_manager.aclose()
+
+        # Release shared playwright driver (stopped by the last engine out)
+        if self._playwright:
+            await _release_playwright()
             self._playwright = None
 
     def stop(self):
-        """Signal engine to stop."""
+        """Signal engine to stop. Safe to call from any thread."""
         self.running = False
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(self._request_stop)
         self._log("Browser engine stop requested")
@@ -2,10 +2,58 @@
 Browser path detection and management for Playwright integration.
 Supports auto-detection of system browsers and manual path configuration.
 """
+import asyncio
+import contextlib
+import ctypes
+import functools
+import glob
+import json
 import logging
 import os
 import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
+
+# One environment snapshot for all Windows path templates; unset variables
+# stay as %VAR% (like os.path.expandvars) so they never match a real file
+_ENV = {
+    key: os.environ.get(key, f"%{key}%")
+    for key in ("PROGRAMFILES", "PROGRAMFILES(X86)", "LOCALAPPDATA", "USERPROFILE")
+}
+
+
+def _expand_paths(templates: list[str]) -> list[str]:
+    """Expand {VAR} placeholders in browser path templates from _ENV."""
+    return [template.format_map(_ENV) for template in templates]
+
+
+def _chromium_revision(exe_path: str) -> int:
+    """Revision number of a .../chromium-<revision>/chrome-win/chrome.exe path."""
+    folder = os.path.basename(os.path.dirname(os.path.dirname(exe_path)))
+    revision = folder.removeprefix("chromium-")
+    return int(revision) if revision.isdigit() else -1
+
+
+class _VSFixedFileInfo(ctypes.Structure):
+    """VS_FIXEDFILEINFO from a Windows executable's version resource."""
+    _fields_ = [
+        ("dwSignature", ctypes.c_uint32),
+        ("dwStrucVersion", ctypes.c_uint32),
+        ("dwFileVersionMS", ctypes.c_uint32),
+        ("dwFileVersionLS", ctypes.c_uint32),
+        ("dwProductVersionMS", ctypes.c_uint32),
+        ("dwProductVersionLS", ctypes.c_uint32),
+        ("dwFileFlagsMask", ctypes.c_uint32),
+        ("dwFileFlags", ctypes.c_uint32),
+        ("dwFileOS", ctypes.c_uint32),
+        ("dwFileType", ctypes.c_uint32),
+        ("dwFileSubtype", ctypes.c_uint32),
+        ("dwFileDateMS", ctypes.c_uint32),
+        ("dwFileDateLS", ctypes.c_uint32),
+    ]
 
 
 @dataclass
@@ -24,99 +72,99 @@ class BrowserManager:
     # Comprehensive Windows browser paths for all 4 supported browsers
     # Each list covers: Program Files, Program Files (x86), LocalAppData, and user-specific locations
 
-    WINDOWS_CHROME_PATHS = [
+    WINDOWS_CHROME_PATHS = _expand_paths([
         # Standard installations
-        os.path.expandvars(r"%PROGRAMFILES%\Google\Chrome\Application\chrome.exe"),
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\Google\Chrome\Application\chrome.exe"),
+        r"{PROGRAMFILES}\Google\Chrome\Application\chrome.exe",
+        r"{PROGRAMFILES(X86)}\Google\Chrome\Application\chrome.exe",
         # User-specific installation
-        os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"),
+        r"{LOCALAPPDATA}\Google\Chrome\Application\chrome.exe",
         # Per-user installation (newer Chrome versions)
-        os.path.expandvars(r"%USERPROFILE%\AppData\Local\Google\Chrome\Application\chrome.exe"),
+        r"{USERPROFILE}\AppData\Local\Google\Chrome\Application\chrome.exe",
         # Canary/Dev/Beta channels
-        os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome SxS\Application\chrome.exe"),
-        os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome Dev\Application\chrome.exe"),
-        os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome Beta\Application\chrome.exe"),
+        r"{LOCALAPPDATA}\Google\Chrome SxS\Application\chrome.exe",
+        r"{LOCALAPPDATA}\Google\Chrome Dev\Application\chrome.exe",
+        r"{LOCALAPPDATA}\Google\Chrome Beta\Application\chrome.exe",
         # Portable installations (common locations)
         r"C:\Google\Chrome\Application\chrome.exe",
         r"D:\Google\Chrome\Application\chrome.exe",
-    ]
+    ])
 
-    WINDOWS_CHROMIUM_PATHS = [
+    WINDOWS_CHROMIUM_PATHS = _expand_paths([
         # Standard Chromium installations
-        os.path.expandvars(r"%LOCALAPPDATA%\Chromium\Application\chrome.exe"),
-        os.path.expandvars(r"%PROGRAMFILES%\Chromium\Application\chrome.exe"),
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\Chromium\Application\chrome.exe"),
+        r"{LOCALAPPDATA}\Chromium\Application\chrome.exe",
+        r"{PROGRAMFILES}\Chromium\Application\chrome.exe",
+        r"{PROGRAMFILES(X86)}\Chromium\Application\chrome.exe",
         # User profile installation
-        os.path.expandvars(r"%USERPROFILE%\AppData\Local\Chromium\Application\chrome.exe"),
+        r"{USERPROFILE}\AppData\Local\Chromium\Application\chrome.exe",
         # Alternative executable names
-        os.path.expandvars(r"%LOCALAPPDATA%\Chromium\Application\chromium.exe"),
-        os.path.expandvars(r"%PROGRAMFILES%\Chromium\Application\chromium.exe"),
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\Chromium\Application\chromium.exe"),
+        r"{LOCALAPPDATA}\Chromium\Application\chromium.exe",
+        r"{PROGRAMFILES}\Chromium\Application\chromium.exe",
+        r"{PROGRAMFILES(X86)}\Chromium\Application\chromium.exe",
         # Portable/standalone installations
         r"C:\Chromium\chrome.exe",
         r"D:\Chromium\chrome.exe",
         r"C:\Chromium\chromium.exe",
         r"D:\Chromium\chromium.exe",
         # Playwright bundled Chromium (common location)
-        os.path.expandvars(r"%LOCALAPPDATA%\ms-playwright\chromium-*\chrome-win\chrome.exe"),
+        r"{LOCALAPPDATA}\ms-playwright\chromium-*\chrome-win\chrome.exe",
         # Ungoogled Chromium (popular fork)
-        os.path.expandvars(r"%LOCALAPPDATA%\ungoogled-chromium\chrome.exe"),
-        os.path.expandvars(r"%PROGRAMFILES%\ungoogled-chromium\chrome.exe"),
-    ]
+        r"{LOCALAPPDATA}\ungoogled-chromium\chrome.exe",
+        r"{PROGRAMFILES}\ungoogled-chromium\chrome.exe",
+    ])
 
-    WINDOWS_EDGE_PATHS = [
+    WINDOWS_EDGE_PATHS = _expand_paths([
         # Standard installations
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\Microsoft\Edge\Application\msedge.exe"),
-        os.path.expandvars(r"%PROGRAMFILES%\Microsoft\Edge\Application\msedge.exe"),
+        r"{PROGRAMFILES(X86)}\Microsoft\Edge\Application\msedge.exe",
+        r"{PROGRAMFILES}\Microsoft\Edge\Application\msedge.exe",
         # User-specific installation
-        os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\Edge\Application\msedge.exe"),
+        r"{LOCALAPPDATA}\Microsoft\Edge\Application\msedge.exe",
         # Per-user installation
-        os.path.expandvars(r"%USERPROFILE%\AppData\Local\Microsoft\Edge\Application\msedge.exe"),
+        r"{USERPROFILE}\AppData\Local\Microsoft\Edge\Application\msedge.exe",
         # Dev/Beta/Canary channels
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\Microsoft\Edge Dev\Application\msedge.exe"),
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\Microsoft\Edge Beta\Application\msedge.exe"),
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\Microsoft\Edge SxS\Application\msedge.exe"),
-        os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\Edge Dev\Application\msedge.exe"),
-        os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\Edge Beta\Application\msedge.exe"),
-        os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\Edge SxS\Application\msedge.exe"),
-    ]
-
-    WINDOWS_BRAVE_PATHS = [
+        r"{PROGRAMFILES(X86)}\Microsoft\Edge Dev\Application\msedge.exe",
+        r"{PROGRAMFILES(X86)}\Microsoft\Edge Beta\Application\msedge.exe",
+        r"{PROGRAMFILES(X86)}\Microsoft\Edge SxS\Application\msedge.exe",
+        r"{LOCALAPPDATA}\Microsoft\Edge Dev\Application\msedge.exe",
+        r"{LOCALAPPDATA}\Microsoft\Edge Beta\Application\msedge.exe",
+        r"{LOCALAPPDATA}\Microsoft\Edge SxS\Application\msedge.exe",
+    ])
+
+    WINDOWS_BRAVE_PATHS = _expand_paths([
         # Standard installations
-        os.path.expandvars(r"%PROGRAMFILES%\BraveSoftware\Brave-Browser\Application\brave.exe"),
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\BraveSoftware\Brave-Browser\Application\brave.exe"),
+        r"{PROGRAMFILES}\BraveSoftware\Brave-Browser\Application\brave.exe",
+        r"{PROGRAMFILES(X86)}\BraveSoftware\Brave-Browser\Application\brave.exe",
         # User-specific installation (most common for Brave)
-        os.path.expandvars(r"%LOCALAPPDATA%\BraveSoftware\Brave-Browser\Application\brave.exe"),
-        os.path.expandvars(r"%USERPROFILE%\AppData\Local\BraveSoftware\Brave-Browser\Application\brave.exe"),
+        r"{LOCALAPPDATA}\BraveSoftware\Brave-Browser\Application\brave.exe",
+        r"{USERPROFILE}\AppData\Local\BraveSoftware\Brave-Browser\Application\brave.exe",
         # Beta/Nightly channels
-        os.path.expandvars(r"%LOCALAPPDATA%\BraveSoftware\Brave-Browser-Beta\Application\brave.exe"),
-        os.path.expandvars(r"%LOCALAPPDATA%\BraveSoftware\Brave-Browser-Nightly\Application\brave.exe"),
-        os.path.expandvars(r"%PROGRAMFILES%\BraveSoftware\Brave-Browser-Beta\Application\brave.exe"),
-        os.path.expandvars(r"%PROGRAMFILES%\BraveSoftware\Brave-Browser-Nightly\Application\brave.exe"),
-    ]
+        r"{LOCALAPPDATA}\BraveSoftware\Brave-Browser-Beta\Application\brave.exe",
+        r"{LOCALAPPDATA}\BraveSoftware\Brave-Browser-Nightly\Application\brave.exe",
+        r"{PROGRAMFILES}\BraveSoftware\Brave-Browser-Beta\Application\brave.exe",
+        r"{PROGRAMFILES}\BraveSoftware\Brave-Browser-Nightly\Application\brave.exe",
+    ])
 
-    WINDOWS_FIREFOX_PATHS = [
+    WINDOWS_FIREFOX_PATHS = _expand_paths([
         # Standard installations
-        os.path.expandvars(r"%PROGRAMFILES%\Mozilla Firefox\firefox.exe"),
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\Mozilla Firefox\firefox.exe"),
+        r"{PROGRAMFILES}\Mozilla Firefox\firefox.exe",
+        r"{PROGRAMFILES(X86)}\Mozilla Firefox\firefox.exe",
         # User-specific installation
-        os.path.expandvars(r"%LOCALAPPDATA%\Mozilla Firefox\firefox.exe"),
-        os.path.expandvars(r"%USERPROFILE%\AppData\Local\Mozilla Firefox\firefox.exe"),
+        r"{LOCALAPPDATA}\Mozilla Firefox\firefox.exe",
+        r"{USERPROFILE}\AppData\Local\Mozilla Firefox\firefox.exe",
         # Developer Edition
-        os.path.expandvars(r"%PROGRAMFILES%\Firefox Developer Edition\firefox.exe"),
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\Firefox Developer Edition\firefox.exe"),
+        r"{PROGRAMFILES}\Firefox Developer Edition\firefox.exe",
+        r"{PROGRAMFILES(X86)}\Firefox Developer Edition\firefox.exe",
         # Nightly
-        os.path.expandvars(r"%PROGRAMFILES%\Firefox Nightly\firefox.exe"),
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\Firefox Nightly\firefox.exe"),
+        r"{PROGRAMFILES}\Firefox Nightly\firefox.exe",
+        r"{PROGRAMFILES(X86)}\Firefox Nightly\firefox.exe",
         # ESR (Extended Support Release)
-        os.path.expandvars(r"%PROGRAMFILES%\Mozilla Firefox ESR\firefox.exe"),
-        os.path.expandvars(r"%PROGRAMFILES(X86)%\Mozilla Firefox ESR\firefox.exe"),
+        r"{PROGRAMFILES}\Mozilla Firefox ESR\firefox.exe",
+        r"{PROGRAMFILES(X86)}\Mozilla Firefox ESR\firefox.exe",
         # Portable installations (common locations)
         r"C:\Firefox\firefox.exe",
         r"D:\Firefox\firefox.exe",
         r"C:\Mozilla Firefox\firefox.exe",
         r"D:\Mozilla Firefox\firefox.exe",
-    ]
+    ])
 
     # Map browser names to Playwright browser types
     BROWSER_TYPES = {
@@ -127,13 +175,114 @@ class BrowserManager:
         "Firefox": "firefox",
     }
 
+    # Executable names accepted without a warning by validate_browser_path
+    _KNOWN_BROWSERS = frozenset(
+        {"chrome.exe", "msedge.exe", "brave.exe", "firefox.exe", "chromium.exe"}
+    )
+
+    # Ordered browser-name rules for get_browser_info_from_path: the first
+    # rule whose (field, substring) conditions all hold wins. Fields are the
+    # lower-cased "file" name, "near" (file + parent + grandparent dirs) and
+    # the whole "path". Chromium is checked before the more general Chrome.
+    _NAME_RULES = (
+        ((("near", "chromium"),), "Chromium"),
+        ((("path", "ungoogled"),), "Chromium"),  # Ungoogled Chromium
+        ((("path", "ms-playwright"),), "Chromium"),  # Playwright bundled Chromium
+        ((("file", "chrome"), ("path", "google")), "Chrome"),  # Google Chrome
+        ((("file", "chrome"), ("path", "chromium")), "Chromium"),  # Generic chrome.exe
+        ((("file", "chrome"),), "Chrome"),
+        ((("file", "edge"),), "Edge"),  # msedge.exe
+        ((("file", "brave"),), "Brave"),
+        ((("file", "firefox"),), "Firefox"),
+    )
+
+    # Memoized detect_browsers() result (None = not scanned yet)
+    _detect_cache: list[BrowserInfo] | None = None
+
+    # Last scan result persisted across runs; only its paths are re-checked
+    # on startup instead of scanning every candidate location (git-ignored)
+    _DISK_CACHE_PATH = Path(__file__).parent.parent / "resources" / "browsers.json"
+    # Rescan at least this often so newly installed browsers get picked up
+    _DISK_CACHE_TTL = 24 * 60 * 60
+
+    @classmethod
+    def refresh(cls):
+        """Drop cached detection results so the next lookup rescans the system."""
+        cls._detect_cache = None
+        cls._get_browser_version.cache_clear()
+        cls._browser_info_for_path.cache_clear()
+        with contextlib.suppress(OSError):
+            cls._DISK_CACHE_PATH.unlink(missing_ok=True)
+
+    @classmethod
+    def _load_disk_cache(cls) -> list[BrowserInfo]:
+        """
+        Browsers from the last scan, if it is younger than _DISK_CACHE_TTL and
+        every cached executable still exists unchanged since then.
+        Returns an empty list when the cache is missing, unreadable or stale.
+        """
+        try:
+            cache_mtime = cls._DISK_CACHE_PATH.stat().st_mtime
+            if time.time() - cache_mtime > cls._DISK_CACHE_TTL:
+                return []
+            with open(cls._DISK_CACHE_PATH, encoding="utf-8") as f:
+                entries = json.load(f).get("browsers", {})
+            browsers = [
+                BrowserInfo(
+                    name=name,
+                    path=entry["path"],
+                    browser_type=cls.BROWSER_TYPES.get(name, "chromium"),
+                    version=entry.get("version"),
+                    is_valid=True,
+                )
+                for name, entry in entries.items()
+            ]
+        except (OSError, ValueError, KeyError, AttributeError, TypeError):
+            return []
+
+        # A missing or updated executable (new version) invalidates the cache
+        try:
+            if any(
+                not os.path.isfile(b.path) or os.path.getmtime(b.path) > cache_mtime
+                for b in browsers
+            ):
+                return []
+        except OSError:
+            return []
+        return browsers
+
+    @classmethod
+    def _save_disk_cache(cls, browsers: list[BrowserInfo]):
+        """Persist a scan result for the next startup (best effort)."""
+        output = {
+            "browsers": {b.name: {"path": b.path, "version": b.version} for b in browsers},
+            "version": 1,
+        }
+        try:
+            cls._DISK_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            # Write to temp file then rename for atomic write
+            temp_path = cls._DISK_CACHE_PATH.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(output, f, indent=2)
+            temp_path.replace(cls._DISK_CACHE_PATH)
+        except OSError as e:
+            logging.debug(f"Could not save browser cache: {e}")
+
     @classmethod
     def detect_browsers(cls) -> list[BrowserInfo]:
         """
         Detect all installed browsers on Windows (Chrome, Chromium, Edge, Brave, Firefox).
         Returns list of BrowserInfo objects for each found browser.
+        The scan runs once per process and its result is reused across runs
+        while all cached paths still exist; call refresh() to rescan.
         """
-        found = []
+        if cls._detect_cache is not None:
+            return list(cls._detect_cache)
+
+        cached = cls._load_disk_cache()
+        if cached:
+            cls._detect_cache = cached
+            return list(cached)
 
         browser_configs = [
             ("Chrome", cls.WINDOWS_CHROME_PATHS),
@@ -142,24 +291,83 @@ class BrowserManager:
             ("Brave", cls.WINDOWS_BRAVE_PATHS),
             ("Firefox", cls.WINDOWS_FIREFOX_PATHS),
         ]
+        candidates = [(name, path) for name, paths in browser_configs for path in paths]
 
-        for name, paths in browser_configs:
-            for path in paths:
-                if os.path.isfile(path):
-                    version = cls._get_browser_version(path)
-                    browser_type = cls.BROWSER_TYPES.get(name, "chromium")
-                    found.append(BrowserInfo(
-                        name=name,
-                        path=path,
-                        browser_type=browser_type,
-                        version=version,
-                        is_valid=True
-                    ))
-                    break  # Found this browser, skip other paths
-
-        return found
+        # Many candidates share a directory: list each parent once instead
+        # of stat-ing every path, with the listings done concurrently
+        parents = list(
+            {os.path.dirname(path) for _, path in candidates if "*" not in path}
+        )
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            listings = dict(
+                zip(parents, pool.map(cls._list_dir_files, parents), strict=True)
+            )
+            wildcards = {
+                path: pool.submit(cls._resolve_browser_path, path)
+                for _, path in candidates
+                if "*" in path
+            }
+
+            # First existing path per browser, in priority order
+            hits: dict[str, str] = {}
+            for name, path in candidates:
+                if name in hits:
+                    continue
+                if "*" in path:
+                    resolved = wildcards[path].result()
+                elif os.path.basename(path).lower() in listings[os.path.dirname(path)]:
+                    resolved = path
+                else:
+                    resolved = None
+                if resolved:
+                    hits[name] = resolved
+
+            versions = {
+                name: pool.submit(cls._get_browser_version, path)
+                for name, path in hits.items()
+            }
+            found = [
+                BrowserInfo(
+                    name=name,
+                    path=path,
+                    browser_type=cls.BROWSER_TYPES.get(name, "chromium"),
+                    version=versions[name].result(),
+                    is_valid=True,
+                )
+                for name, path in hits.items()
+            ]
+
+        cls._detect_cache = found
+        if found:
+            cls._save_disk_cache(found)
+        return list(found)
 
     @classmethod
+    async def detect_browsers_async(cls) -> list[BrowserInfo]:
+        """detect_browsers() for coroutines: scans in a worker thread."""
+        return await asyncio.to_thread(cls.detect_browsers)
+
+    @staticmethod
+    def _list_dir_files(directory: str) -> frozenset[str]:
+        """Lower-cased names of the files in a directory (empty if unreadable)."""
+        try:
+            with os.scandir(directory) as entries:
+                return frozenset(e.name.lower() for e in entries if e.is_file())
+        except OSError:
+            return frozenset()
+
+    @staticmethod
+    def _resolve_browser_path(path: str) -> str | None:
+        """Return the path if it is an existing file (wildcards: first match)."""
+        if "*" in path:
+            # Wildcard entry (e.g. versioned Playwright dir)
+            path = next(glob.iglob(path), None)
+            if path is None:
+                return None
+        return path if os.path.isfile(path) else None
+
+    @classmethod
+    @functools.lru_cache(maxsize=32)
     def _get_browser_version(cls, path: str) -> str | None:
         """
         Attempt to get browser version from executable.
@@ -173,6 +381,10 @@ class BrowserManager:
                 if part and part[0].isdigit() and "." in part:
                     return part
 
+            # On Windows, read the PE version resource (no process spawn)
+            if sys.platform == "win32":
+                return cls._get_pe_file_version(path)
+
             # Try running with --version flag (works for some browsers)
             result = subprocess.run(
                 [path, "--version"],
@@ -187,6 +399,32 @@ class BrowserManager:
 
         return None
 
+    @staticmethod
+    def _get_pe_file_version(path: str) -> str | None:
+        """
+        Read the file version of a Windows executable via the version API.
+        Returns "major.minor.build.patch" or None if no version resource.
+        """
+        version_dll = ctypes.windll.version
+        size = version_dll.GetFileVersionInfoSizeW(path, None)
+        if not size:
+            return None
+
+        buffer = ctypes.create_string_buffer(size)
+        if not version_dll.GetFileVersionInfoW(path, 0, size, buffer):
+            return None
+
+        info_ptr = ctypes.c_void_p()
+        info_len = ctypes.c_uint()
+        if not version_dll.VerQueryValueW(
+            buffer, "\\", ctypes.byref(info_ptr), ctypes.byref(info_len)
+        ):
+            return None
+
+        info = ctypes.cast(info_ptr, ctypes.POINTER(_VSFixedFileInfo)).contents
+        ms, ls = info.dwFileVersionMS, info.dwFileVersionLS
+        return f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
+
     @classmethod
     def validate_browser_path(cls, path: str) -> tuple[bool, str]:
         """
@@ -210,9 +448,8 @@ class BrowserManager:
 
         # Check if it's a known browser executable name
         filename = os.path.basename(path).lower()
-        known_browsers = ['chrome.exe', 'msedge.exe', 'brave.exe', 'firefox.exe', 'chromium.exe']
 
-        if filename not in known_browsers:
+        if filename not in cls._KNOWN_BROWSERS:
             # Allow but warn
             logging.warning(f"Unknown browser executable: {filename}")
 
@@ -230,6 +467,7 @@ class BrowserManager:
         return None
 
     @classmethod
+    @functools.lru_cache(maxsize=32)
     def get_browser_type_from_path(cls, path: str) -> str:
         """
         Determine Playwright browser type from executable path.
@@ -249,12 +487,16 @@ class BrowserManager:
         return "chromium"
 
     @classmethod
-    def get_browser_info_from_path(cls, path: str) -> BrowserInfo | None:
+    def get_browser_info_from_path(
+        cls, path: str, *, fetch_version: bool = True
+    ) -> BrowserInfo | None:
         """
         Get BrowserInfo for a specific path.
 
         Args:
             path: Path to browser executable
+            fetch_version: Resolve the version (may spawn the browser);
+                pass False when only name/type are needed
 
         Returns:
             BrowserInfo object or None if path invalid
@@ -262,38 +504,36 @@ class BrowserManager:
         if not path or not os.path.isfile(path):
             return None
 
-        filename = os.path.basename(path).lower()
+        return cls._browser_info_for_path(path, fetch_version)
+
+    @classmethod
+    @functools.lru_cache(maxsize=32)
+    def _browser_info_for_path(cls, path: str, fetch_version: bool) -> BrowserInfo:
+        """Build BrowserInfo for an existing path (cached per path)."""
+        low = path.lower()
+        filename = os.path.basename(low)
         # Also check parent directory for context
-        parent_dir = os.path.basename(os.path.dirname(path)).lower() if path else ""
-        grandparent = os.path.basename(os.path.dirname(os.path.dirname(path))).lower() if path else ""
-
-        # Determine browser name from filename and path context
-        # Check for Chromium first (more specific) before Chrome (more general)
-        if "chromium" in filename or "chromium" in parent_dir or "chromium" in grandparent:
-            name = "Chromium"
-        elif "ungoogled" in path.lower():
-            name = "Chromium"  # Ungoogled Chromium
-        elif "ms-playwright" in path.lower():
-            name = "Chromium"  # Playwright bundled Chromium
-        elif "chrome" in filename and "google" in path.lower():
-            name = "Chrome"  # Google Chrome specifically
-        elif "chrome" in filename:
-            # Generic chrome.exe - could be Chrome or Chromium, check path
-            if "chromium" in path.lower():
-                name = "Chromium"
-            else:
-                name = "Chrome"
-        elif "msedge" in filename or "edge" in filename:
-            name = "Edge"
-        elif "brave" in filename:
-            name = "Brave"
-        elif "firefox" in filename:
-            name = "Firefox"
-        else:
-            name = "Unknown"
+        parent_dir = os.path.dirname(low)
+        parent = os.path.basename(parent_dir)
+        grandparent = os.path.basename(os.path.dirname(parent_dir))
+
+        # Determine browser name from the first matching rule
+        fields = {
+            "file": filename,
+            "near": f"{grandparent}/{parent}/{filename}",
+            "path": low,
+        }
+        name = next(
+            (
+                rule_name
+                for conditions, rule_name in cls._NAME_RULES
+                if all(needle in fields[field] for field, needle in conditions)
+            ),
+            "Unknown",
+        )
 
         browser_type = cls.get_browser_type_from_path(path)
-        version = cls._get_browser_version(path)
+        version = cls._get_browser_version(path) if fetch_version else None
 
         return BrowserInfo(
             name=name,
@@ -310,18 +550,16 @@ class BrowserManager:
         Returns None if not installed.
         """
         try:
-            # Playwright stores browsers in a specific location
-
-            # This is a heuristic - actual path varies by installation
-            playwright_cache = os.path.expandvars(r"%LOCALAPPDATA%\ms-playwright")
-            if os.path.isdir(playwright_cache):
-                # Look for chromium executable
-                for root, _dirs, files in os.walk(playwright_cache):
-                    for f in files:
-                        if f == "chrome.exe" or f == "chromium.exe":
-                            full_path = os.path.join(root, f)
-                            if os.path.isfile(full_path):
-                                return full_path
+            # Playwright stores browsers in versioned chromium-<revision> dirs
+            playwright_cache = os.path.join(_ENV["LOCALAPPDATA"], "ms-playwright")
+            pattern = os.path.join(
+                playwright_cache, "chromium-*", "chrome-win", "chrome.exe"
+            )
+            # Newest revision first (numerically: chromium-1000 > chromium-999)
+            paths = sorted(glob.glob(pattern), key=_chromium_revision, reverse=True)
+            for path in paths:
+                if os.path.isfile(path):
+                    return path
         except Exception as e:
             logging.debug(f"Could not find Playwright Chromium: {e}")
 
@@ -380,12 +618,17 @@ class BrowserManager:
                 stderr=subprocess.DEVNULL
             )
 
-            # Wait briefly then terminate
-            import time
-            time.sleep(1)
-            proc.terminate()
-            proc.wait(timeout=5)
-
+            # A browser that exits on its own within the grace period failed
+            # to start; one still running is healthy and gets terminated
+            try:
+                returncode = proc.wait(timeout=0.5)
+            except subprocess.TimeoutExpired:
+                proc.terminate()
+                proc.wait(timeout=5)
+                return True, "Browser launched successfully"
+
+            if returncode != 0:
+                return False, f"Browser exited immediately (code {returncode})"
             return True, "Browser launched successfully"
 
         except FileNotFoundError:
@@ -395,3 +638,10 @@ class BrowserManager:
             return True, "Browser launched (killed after timeout)"
         except Exception as e:
             return False, f"Failed to launch browser: {e}"
+
+    @classmethod
+    async def test_browser_launch_async(
+        cls, path: str, headless: bool = True
+    ) -> tuple[bool, str]:
+        """test_browser_launch() for coroutines: launches in a worker thread."""
+        return await asyncio.to_thread(cls.test_browser_launch, path, headless)
@@ -3,7 +3,17 @@ Intelligent captcha solving manager with multi-provider support and fallback.
 Handles provider selection based on captcha type and automatic fallback on failure.
 """
 
+import asyncio
+import contextlib
 import logging
+import time
+from collections import OrderedDict
+from functools import partialmethod
+from types import MappingProxyType
+
+# aiohttp is optional; CaptchaManager refuses to start without it
+with contextlib.suppress(ImportError):
+    import aiohttp
 
 from .captcha_solver import (
     AntiCaptchaSolver,
@@ -14,14 +24,77 @@ from .captcha_solver import (
 )
 from .models import CaptchaConfig, CaptchaProvider, CaptchaType
 
+# Messages are %-formatted by logging only when a handler will emit them
+logger = logging.getLogger(__name__)
+
+_TWO, _ANTI = CaptchaProvider.TWOCAPTCHA, CaptchaProvider.ANTICAPTCHA
+
 # Provider strengths/preferences by captcha type
 # Based on general reliability and speed for each captcha type
-PROVIDER_PREFERENCES: dict[CaptchaType, list] = {
-    CaptchaType.TURNSTILE: [CaptchaProvider.TWOCAPTCHA, CaptchaProvider.ANTICAPTCHA],
-    CaptchaType.RECAPTCHA_V2: [CaptchaProvider.ANTICAPTCHA, CaptchaProvider.TWOCAPTCHA],
-    CaptchaType.RECAPTCHA_V3: [CaptchaProvider.TWOCAPTCHA, CaptchaProvider.ANTICAPTCHA],
-    CaptchaType.HCAPTCHA: [CaptchaProvider.ANTICAPTCHA, CaptchaProvider.TWOCAPTCHA],
-}
+PROVIDER_PREFERENCES: MappingProxyType[CaptchaType, tuple[CaptchaProvider, ...]] = (
+    MappingProxyType({
+        CaptchaType.TURNSTILE: (_TWO, _ANTI),
+        CaptchaType.RECAPTCHA_V2: (_ANTI, _TWO),
+        CaptchaType.RECAPTCHA_V3: (_TWO, _ANTI),
+        CaptchaType.HCAPTCHA: (_ANTI, _TWO),
+    })
+)
+# Order for captcha types without an entry above
+_DEFAULT_PREFERENCE: tuple[CaptchaProvider, ...] = (_TWO, _ANTI)
+
+# primary_provider values that mean "no fixed primary" (type-based order)
+_NO_PRIMARY: frozenset[CaptchaProvider] = frozenset(
+    {CaptchaProvider.AUTO, CaptchaProvider.NONE}
+)
+
+# Shared failure results (CaptchaSolution is frozen)
+_NO_SOLVER_SOLUTION = CaptchaSolution(success=False, error="No captcha solver configured")
+_ALL_COOLING_DOWN_SOLUTION = CaptchaSolution(
+    success=False, error="All captcha providers are cooling down"
+)
+
+# Transient provider errors that take a solver out of rotation for a while:
+# (error code substring, cooldown seconds)
+COOLDOWN_RULES: tuple[tuple[str, float], ...] = (
+    ("NO_SLOT", 5.0),  # ERROR_NO_SLOT_AVAILABLE: provider busy, retry shortly
+    ("ZERO_BALANCE", 60.0),  # ERROR_ZERO_BALANCE: account needs a top-up
+)
+# Cooldown after a solver raised instead of returning a result
+EXCEPTION_COOLDOWN_SECONDS = 5.0
+
+# How long a solved token is reused (config.reuse_tokens): provider token
+# lifetime (~2 min) minus a safety margin
+TOKEN_TTL_SECONDS: MappingProxyType[CaptchaType, float] = MappingProxyType({
+    CaptchaType.TURNSTILE: 110.0,
+    CaptchaType.RECAPTCHA_V2: 60.0,
+    CaptchaType.RECAPTCHA_V3: 60.0,
+    CaptchaType.HCAPTCHA: 110.0,
+})
+# Max cached tokens (least recently used are dropped first)
+TOKEN_CACHE_SIZE = 128
+
+# Provider -> (get_balances() key, display name)
+BALANCE_NAMES: MappingProxyType[CaptchaProvider, tuple[str, str]] = MappingProxyType({
+    _TWO: ("2captcha", "2captcha"),
+    _ANTI: ("anticaptcha", "AntiCaptcha"),
+})
+
+# Display names used in solve log messages
+CAPTCHA_LABELS: MappingProxyType[CaptchaType, str] = MappingProxyType({
+    CaptchaType.TURNSTILE: "Turnstile",
+    CaptchaType.RECAPTCHA_V2: "reCAPTCHA v2",
+    CaptchaType.RECAPTCHA_V3: "reCAPTCHA v3",
+    CaptchaType.HCAPTCHA: "hCaptcha",
+})
+
+
+class _SolveMethod(partialmethod):
+    """partialmethod whose __doc__ is carried over to the bound method (help())."""
+
+    def __get__(self, obj, cls=None):
+        bound = super().__get__(obj, cls)
+        bound.__doc__ = self.__doc__
+        return bound
 
 
 class CaptchaManager:
@@ -35,6 +108,16 @@ class CaptchaManager:
     - Balance checking for both providers
     """
 
+    __slots__ = (
+        "config",
+        "_solvers",
+        "_solver_order",
+        "_cooldown",
+        "_token_cache",
+        "_session",
+        "_session_loop",
+    )
+
     def __init__(self, config: CaptchaConfig):
         """
         Initialize captcha manager with configuration.
@@ -49,19 +132,84 @@ class CaptchaManager:
 
         self.config = config
         self._solvers: dict[CaptchaProvider, CaptchaSolverBase] = {}
-
-        # Initialize available solvers
+        # Solver -> time.monotonic() deadline before which it is skipped
+        self._cooldown: dict[CaptchaSolverBase, float] = {}
+        # HTTP session shared by all solvers, created on first use in the
+        # running event loop (see _ensure_session)
+        self._session = None
+        self._session_loop = None
+        # (captcha_type, args, kwargs) -> (expires_at, solution), LRU ordered
+        self._token_cache: OrderedDict[tuple, tuple[float, CaptchaSolution]] = (
+            OrderedDict()
+        )
+
+        # Initialize available solvers. Registration order (2captcha, then
+        # AntiCaptcha) is the fallback order behind a fixed primary provider.
         if config.twocaptcha_key:
-            self._solvers[CaptchaProvider.TWOCAPTCHA] = TwoCaptchaSolver(
+            self._solvers[_TWO] = TwoCaptchaSolver(
                 config.twocaptcha_key, config.timeout_seconds
             )
-            logging.info("2captcha solver initialized")
+            logger.info("2captcha solver initialized")
 
         if config.anticaptcha_key:
-            self._solvers[CaptchaProvider.ANTICAPTCHA] = AntiCaptchaSolver(
+            self._solvers[_ANTI] = AntiCaptchaSolver(
                 config.anticaptcha_key, config.timeout_seconds
             )
-            logging.info("AntiCaptcha solver initialized")
+            logger.info("AntiCaptcha solver initialized")
+
+        self.reconfigure()
+
+    def reconfigure(self):
+        """
+        Rebuild the per-type solver order. Call after changing config
+        provider settings or the set of solvers.
+        """
+        self._solver_order: dict[CaptchaType, tuple[CaptchaSolverBase, ...]] = {
+            captcha_type: tuple(self._compute_solver_order(captcha_type))
+            for captcha_type in CaptchaType
+        }
+
+    def _ensure_session(self):
+        """
+        Share one keep-alive HTTP session between all solvers so solves and
+        balance checks reuse connections instead of a new TLS handshake each.
+
+        Returns:
+            The session for the running event loop, passed to solver calls
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._release_session()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, ttl_dns_cache=300, keepalive_timeout=75
+                )
+            )
+            self._session_loop = loop
+        return self._session
+
+    def _release_session(self):
+        """
+        Drop a session left over from another event loop. It is closed on its
+        own loop if that loop still runs, otherwise detached from its
+        connector (a stopped loop can no longer await close()).
+        """
+        old, old_loop = self._session, self._session_loop
+        self._session = None
+        self._session_loop = None
+        if old is None or old.closed:
+            return
+        if old_loop is not None and old_loop.is_running():
+            asyncio.run_coroutine_threadsafe(old.close(), old_loop)
+        else:
+            old.detach()
+
+    async def aclose(self):
+        """Close the shared HTTP session (a later call opens a new one)."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._session_loop = None
 
     def has_solver(self) -> bool:
         """Check if any solver is available."""
@@ -71,7 +219,19 @@ class CaptchaManager:
         """Get list of available provider names."""
         return [p.value for p in self._solvers]
 
-    def _get_solver_order(self, captcha_type: CaptchaType) -> list:
+    def _get_solver_order(self, captcha_type: CaptchaType) -> tuple:
+        """
+        Get solvers to try for a captcha type, in priority order.
+
+        Args:
+            captcha_type: Type of captcha being solved
+
+        Returns:
+            Tuple of CaptchaSolverBase instances (precomputed by reconfigure())
+        """
+        return self._solver_order[captcha_type]
+
+    def _compute_solver_order(self, captcha_type: CaptchaType) -> list:
         """
         Get ordered list of solvers to try based on captcha type and config.
 
@@ -81,167 +241,153 @@ class CaptchaManager:
         Returns:
             List of CaptchaSolverBase instances in priority order
         """
-        solvers = []
+        primary = self.config.primary_provider
 
         # If specific primary provider is set (not AUTO)
-        if self.config.primary_provider not in (
-            CaptchaProvider.AUTO,
-            CaptchaProvider.NONE,
-        ):
-            if self.config.primary_provider in self._solvers:
-                solvers.append(self._solvers[self.config.primary_provider])
+        if primary not in _NO_PRIMARY:
+            solvers = [self._solvers[primary]] if primary in self._solvers else []
 
-            # Add fallback if enabled
+            # Add fallback if enabled (remaining providers in registration order)
             if self.config.fallback_enabled:
-                for provider, solver in self._solvers.items():
-                    if provider != self.config.primary_provider:
-                        solvers.append(solver)
-        else:
-            # AUTO mode - use type-based preferences
-            preferred_order = PROVIDER_PREFERENCES.get(
-                captcha_type, [CaptchaProvider.TWOCAPTCHA, CaptchaProvider.ANTICAPTCHA]
-            )
-
-            for provider in preferred_order:
-                if provider in self._solvers:
-                    solvers.append(self._solvers[provider])
+                solvers += [s for p, s in self._solvers.items() if p != primary]
+            return solvers
 
-        return solvers
+        # AUTO mode - use type-based preferences
+        preferred_order = PROVIDER_PREFERENCES.get(captcha_type, _DEFAULT_PREFERENCE)
+        return [self._solvers[p] for p in preferred_order if p in self._solvers]
 
-    async def solve_turnstile(self, site_key: str, page_url: str) -> CaptchaSolution:
+    async def _solve(
+        self, captcha_type: CaptchaType, method: str, *args, **kwargs
+    ) -> CaptchaSolution:
         """
-        Solve Cloudflare Turnstile with automatic provider selection and fallback.
+        Solve a captcha with automatic provider selection and fallback.
 
         Args:
-            site_key: Turnstile site key
-            page_url: URL where captcha appears
+            captcha_type: Type of captcha being solved
+            method: Name of the CaptchaSolverBase method to call
+            *args, **kwargs: Arguments passed to that method
 
         Returns:
             CaptchaSolution with result
         """
-        solvers = self._get_solver_order(CaptchaType.TURNSTILE)
+        solvers = self._get_solver_order(captcha_type)
 
         if not solvers:
-            return CaptchaSolution(success=False, error="No captcha solver configured")
+            return _NO_SOLVER_SOLUTION
+
+        now = time.monotonic()
+        cache_key = None
+        if self.config.reuse_tokens:
+            cache_key = (captcha_type, args, tuple(sorted(kwargs.items())))
+            cached = self._token_cache.get(cache_key)
+            if cached is not None:
+                expires_at, solution = cached
+                if expires_at > now:
+                    self._token_cache.move_to_end(cache_key)
+                    return solution
+                del self._token_cache[cache_key]
+
+        # Skip providers that recently reported a transient failure
+        solvers = [s for s in solvers if self._cooldown.get(s, 0.0) <= now]
+        if not solvers:
+            return _ALL_COOLING_DOWN_SOLUTION
 
+        session = self._ensure_session()
+        label = CAPTCHA_LABELS[captcha_type]
         last_error = None
         for solver in solvers:
             try:
-                provider_name = type(solver).__name__
-                logging.info(f"Attempting Turnstile solve with {provider_name}")
+                provider_name = solver.PROVIDER_NAME
+                logger.info("Attempting %s solve with %s", label, provider_name)
 
-                result = await solver.solve_turnstile(site_key, page_url)
+                result = await getattr(solver, method)(
+                    *args, session=session, **kwargs
+                )
 
                 if result.success:
-                    logging.info(f"Turnstile solved successfully by {provider_name}")
+                    logger.info("%s solved successfully by %s", label, provider_name)
+                    if cache_key is not None:
+                        self._cache_token(cache_key, captcha_type, result)
                     return result
                 else:
                     last_error = result.error
-                    logging.warning(f"{provider_name} failed: {result.error}")
+                    logger.warning("%s failed: %s", provider_name, result.error)
+                    self._start_cooldown(solver, result.error)
 
                     if not self.config.fallback_enabled:
                         break
 
             except Exception as e:
                 last_error = str(e)
-                logging.warning(f"Solver exception: {e}")
+                logger.warning("Solver exception: %s", e)
+                self._cooldown[solver] = time.monotonic() + EXCEPTION_COOLDOWN_SECONDS
 
                 if not self.config.fallback_enabled:
                     break
 
         return CaptchaSolution(success=False, error=f"All solvers failed: {last_error}")
 
-    async def solve_recaptcha_v2(self, site_key: str, page_url: str) -> CaptchaSolution:
-        """
-        Solve reCAPTCHA v2 with automatic provider selection and fallback.
+    def _cache_token(self, key: tuple, captcha_type: CaptchaType, solution: CaptchaSolution):
+        """Store a solved token for reuse until its TTL runs out."""
+        expires_at = time.monotonic() + TOKEN_TTL_SECONDS[captcha_type]
+        self._token_cache[key] = (expires_at, solution)
+        self._token_cache.move_to_end(key)
+        if len(self._token_cache) > TOKEN_CACHE_SIZE:
+            self._token_cache.popitem(last=False)
+
+    def _start_cooldown(self, solver: CaptchaSolverBase, error: str | None):
+        """Put a solver on cooldown if its error matches a COOLDOWN_RULES code."""
+        for code, seconds in COOLDOWN_RULES:
+            if code in (error or ""):
+                self._cooldown[solver] = time.monotonic() + seconds
+                logger.info("%s cooling down for %.0fs", solver.PROVIDER_NAME, seconds)
+                return
+
+    # Public entry points, each bound to _solve with its captcha type and
+    # solver method
+    solve_turnstile = _SolveMethod(_solve, CaptchaType.TURNSTILE, "solve_turnstile")
+    solve_turnstile.__doc__ = """
+        Solve Cloudflare Turnstile with automatic provider selection and fallback.
 
         Args:
-            site_key: reCAPTCHA site key
+            site_key: Turnstile site key
             page_url: URL where captcha appears
 
         Returns:
             CaptchaSolution with result
         """
-        solvers = self._get_solver_order(CaptchaType.RECAPTCHA_V2)
-
-        if not solvers:
-            return CaptchaSolution(success=False, error="No captcha solver configured")
-
-        last_error = None
-        for solver in solvers:
-            try:
-                provider_name = type(solver).__name__
-                logging.info(f"Attempting reCAPTCHA v2 solve with {provider_name}")
-
-                result = await solver.solve_recaptcha_v2(site_key, page_url)
-
-                if result.success:
-                    logging.info(f"reCAPTCHA v2 solved successfully by {provider_name}")
-                    return result
-                else:
-                    last_error = result.error
-                    logging.warning(f"{provider_name} failed: {result.error}")
-
-                    if not self.config.fallback_enabled:
-                        break
-
-            except Exception as e:
-                last_error = str(e)
-                logging.warning(f"Solver exception: {e}")
 
-                if not self.config.fallback_enabled:
-                    break
+    solve_recaptcha_v2 = _SolveMethod(
+        _solve, CaptchaType.RECAPTCHA_V2, "solve_recaptcha_v2"
+    )
+    solve_recaptcha_v2.__doc__ = """
+        Solve reCAPTCHA v2 with automatic provider selection and fallback.
 
-        return CaptchaSolution(success=False, error=f"All solvers failed: {last_error}")
+        Args:
+            site_key: reCAPTCHA site key
+            page_url: URL where captcha appears
 
-    async def solve_recaptcha_v3(
-        self, site_key: str, page_url: str, action: str = "verify"
-    ) -> CaptchaSolution:
+        Returns:
+            CaptchaSolution with result
         """
+
+    solve_recaptcha_v3 = _SolveMethod(
+        _solve, CaptchaType.RECAPTCHA_V3, "solve_recaptcha_v3"
+    )
+    solve_recaptcha_v3.__doc__ = """
         Solve reCAPTCHA v3 with automatic provider selection and fallback.
 
         Args:
             site_key: reCAPTCHA site key
             page_url: URL where captcha appears
-            action: reCAPTCHA action parameter
+            action: reCAPTCHA action parameter (solver default "verify")
 
         Returns:
             CaptchaSolution with result
         """
-        solvers = self._get_solver_order(CaptchaType.RECAPTCHA_V3)
-
-        if not solvers:
-            return CaptchaSolution(success=False, error="No captcha solver configured")
-
-        last_error = None
-        for solver in solvers:
-            try:
-                provider_name = type(solver).__name__
-                logging.info(f"Attempting reCAPTCHA v3 solve with {provider_name}")
-
-                result = await solver.solve_recaptcha_v3(site_key, page_url, action)
 
-                if result.success:
-                    logging.info(f"reCAPTCHA v3 solved successfully by {provider_name}")
-                    return result
-                else:
-                    last_error = result.error
-                    logging.warning(f"{provider_name} failed: {result.error}")
-
-                    if not self.config.fallback_enabled:
-                        break
-
-            except Exception as e:
-                last_error = str(e)
-                logging.warning(f"Solver exception: {e}")
-
-                if not self.config.fallback_enabled:
-                    break
-
-        return CaptchaSolution(success=False, error=f"All solvers failed: {last_error}")
-
-    async def solve_hcaptcha(self, site_key: str, page_url: str) -> CaptchaSolution:
-        """
+    solve_hcaptcha = _SolveMethod(_solve, CaptchaType.HCAPTCHA, "solve_hcaptcha")
+    solve_hcaptcha.__doc__ = """
         Solve hCaptcha with automatic provider selection and fallback.
 
         Args:
@@ -251,37 +397,6 @@ class CaptchaManager:
         Returns:
             CaptchaSolution with result
         """
-        solvers = self._get_solver_order(CaptchaType.HCAPTCHA)
-
-        if not solvers:
-            return CaptchaSolution(success=False, error="No captcha solver configured")
-
-        last_error = None
-        for solver in solvers:
-            try:
-                provider_name = type(solver).__name__
-                logging.info(f"Attempting hCaptcha solve with {provider_name}")
-
-                result = await solver.solve_hcaptcha(site_key, page_url)
-
-                if result.success:
-                    logging.info(f"hCaptcha solved successfully by {provider_name}")
-                    return result
-                else:
-                    last_error = result.error
-                    logging.warning(f"{provider_name} failed: {result.error}")
-
-                    if not self.config.fallback_enabled:
-                        break
-
-            except Exception as e:
-                last_error = str(e)
-                logging.warning(f"Solver exception: {e}")
-
-                if not self.config.fallback_enabled:
-                    break
-
-        return CaptchaSolution(success=False, error=f"All solvers failed: {last_error}")
 
     async def get_balances(self) -> dict[str, float]:
         """
@@ -290,23 +405,29 @@ class CaptchaManager:
         Returns:
             Dict mapping provider name to balance
         """
-        balances = {}
-
-        if CaptchaProvider.TWOCAPTCHA in self._solvers:
-            try:
-                balance = await self._solvers[CaptchaProvider.TWOCAPTCHA].get_balance()
-                balances["2captcha"] = balance
-            except Exception as e:
-                logging.warning(f"Failed to get 2captcha balance: {e}")
-                balances["2captcha"] = -1
+        session = self._ensure_session()
+
+        # Query all providers concurrently (wall time = slowest provider)
+        providers = [
+            (key, label, self._solvers[provider])
+            for provider, (key, label) in BALANCE_NAMES.items()
+            if provider in self._solvers
+        ]
+        results = await asyncio.gather(
+            *(
+                solver.get_balance(session=session)
+                for _key, _label, solver in providers
+            ),
+            return_exceptions=True,
+        )
 
-        if CaptchaProvider.ANTICAPTCHA in self._solvers:
-            try:
-                balance = await self._solvers[CaptchaProvider.ANTICAPTCHA].get_balance()
-                balances["anticaptcha"] = balance
-            except Exception as e:
-                logging.warning(f"Failed to get AntiCaptcha balance: {e}")
-                balances["anticaptcha"] = -1
+        balances = {}
+        for (key, label, _solver), result in zip(providers, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning("Failed to get %s balance: %s", label, result)
+                balances[key] = -1
+            else:
+                balances[key] = result
 
         return balances
 
@@ -330,10 +451,11 @@ class CaptchaManager:
                 return 0.0
 
         if provider in self._solvers:
+            session = self._ensure_session()
             try:
-                return await self._solvers[provider].get_balance()
+                return await self._solvers[provider].get_balance(session=session)
             except Exception as e:
-                logging.warning(f"Failed to get balance: {e}")
+                logger.warning("Failed to get balance: %s", e)
 
         return 0.0
 
@@ -354,5 +476,5 @@ def create_captcha_manager(config: CaptchaConfig) -> CaptchaManager | None:
     try:
         return CaptchaManager(config)
     except ImportError as e:
-        logging.warning(f"Could not create captcha manager: {e}")
+        logger.warning("Could not create captcha manager: %s", e)
         return None
@@ -3,6 +3,7 @@ Captcha solving integration for 2captcha and AntiCaptcha services.
 Supports Cloudflare Turnstile, reCAPTCHA v2/v3, and hCaptcha.
 """
 import asyncio
+import contextlib
 import logging
 import time
 from abc import ABC, abstractmethod
@@ -17,9 +18,9 @@ except ImportError:
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CaptchaSolution:
-    """Result of a captcha solve attempt."""
+    """Result of a captcha solve attempt (immutable, safe to share)."""
     success: bool
     token: str | None = None
     error: str | None = None
@@ -29,6 +30,9 @@ class CaptchaSolution:
 class CaptchaSolverBase(ABC):
     """Abstract base class for captcha solving providers."""
 
+    # Display name used in log messages
+    PROVIDER_NAME = "captcha solver"
+
     def __init__(self, api_key: str, timeout: int = 120):
         """
         Initialize solver.
@@ -43,28 +47,49 @@ class CaptchaSolverBase(ABC):
         self.api_key = api_key
         self.timeout = timeout
 
+    @staticmethod
+    @contextlib.asynccontextmanager
+    async def _session(session: "aiohttp.ClientSession | None"):
+        """Yield the caller's HTTP session, or a temporary one if none is open."""
+        if session is not None and not session.closed:
+            yield session
+        else:
+            async with aiohttp.ClientSession() as session:
+                yield session
+
+    # Solve/balance methods take an optional keyword-only session: a shared
+    # keep-alive HTTP session owned by the caller (see _session)
+
     @abstractmethod
-    async def solve_turnstile(self, site_key: str, page_url: str) -> CaptchaSolution:
+    async def solve_turnstile(
+        self, site_key: str, page_url: str, *, session=None
+    ) -> CaptchaSolution:
         """Solve Cloudflare Turnstile challenge."""
         pass
 
     @abstractmethod
-    async def solve_recaptcha_v2(self, site_key: str, page_url: str) -> CaptchaSolution:
+    async def solve_recaptcha_v2(
+        self, site_key: str, page_url: str, *, session=None
+    ) -> CaptchaSolution:
         """Solve Google reCAPTCHA v2 challenge."""
         pass
 
     @abstractmethod
-    async def solve_recaptcha_v3(self, site_key: str, page_url: str, action: str = "verify") -> CaptchaSolution:
+    async def solve_recaptcha_v3(
+        self, site_key: str, page_url: str, action: str = "verify", *, session=None
+    ) -> CaptchaSolution:
         """Solve Google reCAPTCHA v3 challenge."""
         pass
 
     @abstractmethod
-    async def solve_hcaptcha(self, site_key: str, page_url: str) -> CaptchaSolution:
+    async def solve_hcaptcha(
+        self, site_key: str, page_url: str, *, session=None
+    ) -> CaptchaSolution:
         """Solve hCaptcha challenge."""
         pass
 
     @abstractmethod
-    async def get_balance(self) -> float:
+    async def get_balance(self, *, session=None) -> float:
         """Get account balance."""
         pass
 
@@ -73,19 +98,29 @@ class TwoCaptchaSolver(CaptchaSolverBase):
     """2captcha.com API implementation."""
 
     BASE_URL = "https://2captcha.com"
+    PROVIDER_NAME = "2captcha"
 
-    async def _submit_task(self, session: aiohttp.ClientSession, params: dict) -> str | None:
-        """Submit a captcha task and return task ID."""
+    async def _submit_task(
+        self, session: aiohttp.ClientSession, params: dict
+    ) -> tuple[str | None, str | None]:
+        """
+        Submit a captcha task.
+
+        Returns:
+            (task ID, None) on success, or (None, provider error code such as
+            ERROR_NO_SLOT_AVAILABLE) when the submission is rejected
+        """
         params["key"] = self.api_key
         params["json"] = 1
 
         async with session.get(f"{self.BASE_URL}/in.php", params=params) as resp:
             data = await resp.json()
             if data.get("status") == 1:
-                return data.get("request")
+                return data.get("request"), None
             else:
-                logging.warning(f"2captcha submit error: {data.get('request')}")
-                return None
+                error = data.get("request")
+                logging.warning(f"2captcha submit error: {error}")
+                return None, error
 
     async def _poll_result(self, session: aiohttp.ClientSession, task_id: str) -> CaptchaSolution:
         """Poll for task result."""
@@ -110,46 +145,56 @@ class TwoCaptchaSolver(CaptchaSolverBase):
 
         return CaptchaSolution(success=False, error="Timeout waiting for solution")
 
-    async def solve_turnstile(self, site_key: str, page_url: str) -> CaptchaSolution:
+    async def solve_turnstile(
+        self, site_key: str, page_url: str, *, session=None
+    ) -> CaptchaSolution:
         """Solve Cloudflare Turnstile."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._session(session) as session:
                 params = {
                     "method": "turnstile",
                     "sitekey": site_key,
                     "pageurl": page_url,
                 }
-                task_id = await self._submit_task(session, params)
+                task_id, error = await self._submit_task(session, params)
                 if not task_id:
-                    return CaptchaSolution(success=False, error="Failed to submit task")
+                    return CaptchaSolution(
+                        success=False, error=f"Failed to submit task: {error}"
+                    )
 
                 return await self._poll_result(session, task_id)
 
         except Exception as e:
             return CaptchaSolution(success=False, error=str(e))
 
-    async def solve_recaptcha_v2(self, site_key: str, page_url: str) -> CaptchaSolution:
+    async def solve_recaptcha_v2(
+        self, site_key: str, page_url: str, *, session=None
+    ) -> CaptchaSolution:
         """Solve reCAPTCHA v2."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._session(session) as session:
                 params = {
                     "method": "userrecaptcha",
                     "googlekey": site_key,
                     "pageurl": page_url,
                 }
-                task_id = await self._submit_task(session, params)
+                task_id, error = await self._submit_task(session, params)
                 if not task_id:
-                    return CaptchaSolution(success=False, error="Failed to submit task")
+                    return CaptchaSolution(
+                        success=False, error=f"Failed to submit task: {error}"
+                    )
 
                 return await self._poll_result(session, task_id)
 
         except Exception as e:
             return CaptchaSolution(success=False, error=str(e))
 
-    async def solve_recaptcha_v3(self, site_key: str, page_url: str, action: str = "verify") -> CaptchaSolution:
+    async def solve_recaptcha_v3(
+        self, site_key: str, page_url: str, action: str = "verify", *, session=None
+    ) -> CaptchaSolution:
         """Solve reCAPTCHA v3."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._session(session) as session:
                 params = {
                     "method": "userrecaptcha",
                     "googlekey": site_key,
@@ -158,37 +203,43 @@ class TwoCaptchaSolver(CaptchaSolverBase):
                     "action": action,
                     "min_score": 0.3,
                 }
-                task_id = await self._submit_task(session, params)
+                task_id, error = await self._submit_task(session, params)
                 if not task_id:
-                    return CaptchaSolution(success=False, error="Failed to submit task")
+                    return CaptchaSolution(
+                        success=False, error=f"Failed to submit task: {error}"
+                    )
 
                 return await self._poll_result(session, task_id)
 
         except Exception as e:
             return CaptchaSolution(success=False, error=str(e))
 
-    async def solve_hcaptcha(self, site_key: str, page_url: str) -> CaptchaSolution:
+    async def solve_hcaptcha(
+        self, site_key: str, page_url: str, *, session=None
+    ) -> CaptchaSolution:
         """Solve hCaptcha."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._session(session) as session:
                 params = {
                     "method": "hcaptcha",
                     "sitekey": site_key,
                     "pageurl": page_url,
                 }
-                task_id = await self._submit_task(session, params)
+                task_id, error = await self._submit_task(session, params)
                 if not task_id:
-                    return CaptchaSolution(success=False, error="Failed to submit task")
+                    return CaptchaSolution(
+                        success=False, error=f"Failed to submit task: {error}"
+                    )
 
                 return await self._poll_result(session, task_id)
 
         except Exception as e:
             return CaptchaSolution(success=False, error=str(e))
 
-    async def get_balance(self) -> float:
+    async def get_balance(self, *, session=None) -> float:
         """Get account balance."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._session(session) as session:
                 params = {"key": self.api_key, "action": "getbalance", "json": 1}
                 async with session.get(f"{self.BASE_URL}/res.php", params=params) as resp:
                     data = await resp.json()
@@ -204,9 +255,18 @@ class AntiCaptchaSolver(CaptchaSolverBase):
     """anti-captcha.com API implementation."""
 
     BASE_URL = "https://api.anti-captcha.com"
+    PROVIDER_NAME = "AntiCaptcha"
 
-    async def _create_task(self, session: aiohttp.ClientSession, task: dict) -> int | None:
-        """Create a task and return task ID."""
+    async def _create_task(
+        self, session: aiohttp.ClientSession, task: dict
+    ) -> tuple[int | None, str | None]:
+        """
+        Create a task.
+
+        Returns:
+            (task ID, None) on success, or (None, provider error code such as
+            ERROR_NO_SLOT_AVAILABLE) when the task is rejected
+        """
         payload = {
             "clientKey": self.api_key,
             "task": task,
@@ -215,10 +275,10 @@ class AntiCaptchaSolver(CaptchaSolverBase):
         async with session.post(f"{self.BASE_URL}/createTask", json=payload) as resp:
             data = await resp.json()
             if data.get("errorId") == 0:
-                return data.get("taskId")
+                return data.get("taskId"), None
             else:
                 logging.warning(f"AntiCaptcha create error: {data.get('errorDescription')}")
-                return None
+                return None, data.get("errorCode")
 
     async def _get_result(self, session: aiohttp.ClientSession, task_id: int) -> CaptchaSolution:
         """Poll for task result."""
@@ -245,46 +305,56 @@ class AntiCaptchaSolver(CaptchaSolverBase):
 
         return CaptchaSolution(success=False, error="Timeout waiting for solution")
 
-    async def solve_turnstile(self, site_key: str, page_url: str) -> CaptchaSolution:
+    async def solve_turnstile(
+        self, site_key: str, page_url: str, *, session=None
+    ) -> CaptchaSolution:
         """Solve Cloudflare Turnstile."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._session(session) as session:
                 task = {
                     "type": "TurnstileTaskProxyless",
                     "websiteURL": page_url,
                     "websiteKey": site_key,
                 }
-                task_id = await self._create_task(session, task)
+                task_id, error = await self._create_task(session, task)
                 if not task_id:
-                    return CaptchaSolution(success=False, error="Failed to create task")
+                    return CaptchaSolution(
+                        success=False, error=f"Failed to create task: {error}"
+                    )
 
                 return await self._get_result(session, task_id)
 
         except Exception as e:
             return CaptchaSolution(success=False, error=str(e))
 
-    async def solve_recaptcha_v2(self, site_key: str, page_url: str) -> CaptchaSolution:
+    async def solve_recaptcha_v2(
+        self, site_key: str, page_url: str, *, session=None
+    ) -> CaptchaSolution:
         """Solve reCAPTCHA v2."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._session(session) as session:
                 task = {
                     "type": "RecaptchaV2TaskProxyless",
                     "websiteURL": page_url,
                     "websiteKey": site_key,
                 }
-                task_id = await self._create_task(session, task)
+                task_id, error = await self._create_task(session, task)
                 if not task_id:
-                    return CaptchaSolution(success=False, error="Failed to create task")
+                    return CaptchaSolution(
+                        success=False, error=f"Failed to create task: {error}"
+                    )
 
                 return await self._get_result(session, task_id)
 
         except Exception as e:
             return CaptchaSolution(success=False, error=str(e))
 
-    async def solve_recaptcha_v3(self, site_key: str, page_url: str, action: str = "verify") -> CaptchaSolution:
+    async def solve_recaptcha_v3(
+        self, site_key: str, page_url: str, action: str = "verify", *, session=None
+    ) -> CaptchaSolution:
         """Solve reCAPTCHA v3."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._session(session) as session:
                 task = {
                     "type": "RecaptchaV3TaskProxyless",
                     "websiteURL": page_url,
@@ -292,37 +362,43 @@ class AntiCaptchaSolver(CaptchaSolverBase):
                     "pageAction": action,
                     "minScore": 0.3,
                 }
-                task_id = await self._create_task(session, task)
+                task_id, error = await self._create_task(session, task)
                 if not task_id:
-                    return CaptchaSolution(success=False, error="Failed to create task")
+                    return CaptchaSolution(
+                        success=False, error=f"Failed to create task: {error}"
+                    )
 
                 return await self._get_result(session, task_id)
 
         except Exception as e:
             return CaptchaSolution(success=False, error=str(e))
 
-    async def solve_hcaptcha(self, site_key: str, page_url: str) -> CaptchaSolution:
+    async def solve_hcaptcha(
+        self, site_key: str, page_url: str, *, session=None
+    ) -> CaptchaSolution:
         """Solve hCaptcha."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._session(session) as session:
                 task = {
                     "type": "HCaptchaTaskProxyless",
                     "websiteURL": page_url,
                     "websiteKey": site_key,
                 }
-                task_id = await self._create_task(session, task)
+                task_id, error = await self._create_task(session, task)
                 if not task_id:
-                    return CaptchaSolution(success=False, error="Failed to create task")
+                    return CaptchaSolution(
+                        success=False, error=f"Failed to create task: {error}"
+                    )
 
                 return await self._get_result(session, task_id)
 
         except Exception as e:
             return CaptchaSolution(success=False, error=str(e))
 
-    async def get_balance(self) -> float:
+    async def get_balance(self, *, session=None) -> float:
         """Get account balance."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._session(session) as session:
                 payload = {"clientKey": self.api_key}
                 async with session.post(f"{self.BASE_URL}/getBalance", json=payload) as resp:
                     data = await resp.json()
@@ -5,6 +5,9 @@ This module provides a builder pattern for assembling TrafficConfig objects
 from settings dictionaries, centralizing all the mapping and conversion logic.
 """
 
+import dataclasses
+from collections.abc import Callable
+from types import MappingProxyType
 from typing import Any
 
 from core.models import (
@@ -18,6 +21,9 @@ from core.models import (
 )
 from core.settings_keys import Defaults, SettingsKeys
 
+# Marks settings keys absent from the dict in the from_settings() cache key
+_UNSET = object()
+
 
 class TrafficConfigBuilder:
     """
@@ -25,7 +31,9 @@ class TrafficConfigBuilder:
     Handles type conversions, enum mappings, and default value application.
     """
 
-    BROWSER_SELECTION_MAP = {
+    # Settings value -> enum. Keys are literal constants, so already interned;
+    # lookups only run when from_settings() misses its cache.
+    BROWSER_SELECTION_MAP = MappingProxyType({
         "auto": BrowserSelection.AUTO,
         "chrome": BrowserSelection.CHROME,
         "chromium": BrowserSelection.CHROMIUM,
@@ -33,20 +41,63 @@ class TrafficConfigBuilder:
         "brave": BrowserSelection.BRAVE,
         "firefox": BrowserSelection.FIREFOX,
         "other": BrowserSelection.OTHER,
-    }
+    })
 
-    CAPTCHA_PROVIDER_MAP = {
+    CAPTCHA_PROVIDER_MAP = MappingProxyType({
         "auto": CaptchaProvider.AUTO,
         "2captcha": CaptchaProvider.TWOCAPTCHA,
         "anticaptcha": CaptchaProvider.ANTICAPTCHA,
         "none": CaptchaProvider.NONE,
-    }
-
-    @staticmethod
-    def from_settings(settings: dict[str, Any], target_url: str) -> TrafficConfig:
+    })
+
+    # Every settings key the builder reads; their values key the cache of
+    # the last built config (repeat Start clicks mostly reuse it)
+    CONFIG_KEYS = (
+        SettingsKeys.ENGINE_MODE,
+        SettingsKeys.THREADS,
+        SettingsKeys.VIEWTIME_MIN,
+        SettingsKeys.VIEWTIME_MAX,
+        SettingsKeys.HEADLESS,
+        SettingsKeys.VERIFY_SSL,
+        SettingsKeys.BURST_MODE,
+        SettingsKeys.BURST_REQUESTS,
+        SettingsKeys.BURST_SLEEP_MIN,
+        SettingsKeys.BURST_SLEEP_MAX,
+        SettingsKeys.BROWSER_SELECTED,
+        SettingsKeys.BROWSER_CHROME_PATH,
+        SettingsKeys.BROWSER_CHROMIUM_PATH,
+        SettingsKeys.BROWSER_EDGE_PATH,
+        SettingsKeys.BROWSER_BRAVE_PATH,
+        SettingsKeys.BROWSER_FIREFOX_PATH,
+        SettingsKeys.BROWSER_OTHER_PATH,
+        SettingsKeys.BROWSER_CONTEXTS,
+        SettingsKeys.BROWSER_LOCALE,
+        SettingsKeys.BROWSER_TIMEZONE,
+        SettingsKeys.BROWSER_STEALTH,
+        SettingsKeys.CAPTCHA_PRIMARY,
+        SettingsKeys.CAPTCHA_2CAPTCHA_KEY,
+        SettingsKeys.CAPTCHA_ANTICAPTCHA_KEY,
+        SettingsKeys.CAPTCHA_FALLBACK_ENABLED,
+        SettingsKeys.CAPTCHA_TIMEOUT,
+        SettingsKeys.CAPTCHA_REUSE_TOKENS,
+        SettingsKeys.CLOUDFLARE_BYPASS,
+        SettingsKeys.CLOUDFLARE_WAIT,
+        SettingsKeys.AKAMAI_BYPASS,
+        SettingsKeys.AUTO_SOLVE_CAPTCHA,
+    )
+
+    # (settings values key, config) of the last from_settings() build
+    _last_build: tuple[tuple, TrafficConfig] | None = None
+
+    @classmethod
+    def from_settings(cls, settings: dict[str, Any], target_url: str) -> TrafficConfig:
         """
         Creates a fully populated TrafficConfig object from a settings dictionary.
 
+        Repeated calls with the same relevant settings return the previous
+        config (with target_url swapped in if only the URL changed), so
+        callers must not mutate the result; use dataclasses.replace().
+
         Args:
             settings: Dictionary containing application settings (keys from SettingsKeys).
             target_url: The target URL for traffic generation.
@@ -54,34 +105,58 @@ class TrafficConfigBuilder:
         Returns:
             A TrafficConfig object ready for use by the traffic engine.
         """
+        key = tuple(settings.get(k, _UNSET) for k in cls.CONFIG_KEYS)
+        try:
+            hash(key)
+        except TypeError:
+            key = None  # unhashable setting value: build without caching
+
+        last = cls._last_build
+        if key is not None and last is not None and last[0] == key:
+            config = last[1]
+            if config.target_url != target_url:
+                config = dataclasses.replace(config, target_url=target_url)
+                cls._last_build = (key, config)
+            return config
+
+        config = cls._build(settings, target_url)
+        if key is not None:
+            cls._last_build = (key, config)
+        return config
+
+    @staticmethod
+    def _build(settings: dict[str, Any], target_url: str) -> TrafficConfig:
+        """Build a TrafficConfig from settings (uncached)."""
+        get = settings.get  # bound once and shared with the _build_* helpers
+
         # Determine engine mode
-        mode_str = settings.get(SettingsKeys.ENGINE_MODE, Defaults.ENGINE_MODE)
+        mode_str = get(SettingsKeys.ENGINE_MODE, Defaults.ENGINE_MODE)
         engine_mode = (
             EngineMode.BROWSER if mode_str == "browser" else EngineMode.CURL
         )
 
         return TrafficConfig(
             target_url=target_url,
-            max_threads=int(settings.get(SettingsKeys.THREADS, Defaults.THREADS)),
+            max_threads=int(get(SettingsKeys.THREADS, Defaults.THREADS)),
             total_visits=0,  # Infinite run until stopped usually
-            min_duration=int(settings.get(SettingsKeys.VIEWTIME_MIN, Defaults.VIEWTIME_MIN)),
-            max_duration=int(settings.get(SettingsKeys.VIEWTIME_MAX, Defaults.VIEWTIME_MAX)),
-            headless=settings.get(SettingsKeys.HEADLESS, Defaults.HEADLESS),
-            verify_ssl=settings.get(SettingsKeys.VERIFY_SSL, Defaults.VERIFY_SSL),
+            min_duration=int(get(SettingsKeys.VIEWTIME_MIN, Defaults.VIEWTIME_MIN)),
+            max_duration=int(get(SettingsKeys.VIEWTIME_MAX, Defaults.VIEWTIME_MAX)),
+            headless=get(SettingsKeys.HEADLESS, Defaults.HEADLESS),
+            verify_ssl=get(SettingsKeys.VERIFY_SSL, Defaults.VERIFY_SSL),
             engine_mode=engine_mode,
-            browser=TrafficConfigBuilder._build_browser_config(settings),
-            captcha=TrafficConfigBuilder._build_captcha_config(settings),
-            protection=TrafficConfigBuilder._build_protection_config(settings),
-            burst_mode=settings.get(SettingsKeys.BURST_MODE, Defaults.BURST_MODE),
-            burst_requests=int(settings.get(SettingsKeys.BURST_REQUESTS, Defaults.BURST_REQUESTS)),
-            burst_sleep_min=float(settings.get(SettingsKeys.BURST_SLEEP_MIN, Defaults.BURST_SLEEP_MIN)),
-            burst_sleep_max=float(settings.get(SettingsKeys.BURST_SLEEP_MAX, Defaults.BURST_SLEEP_MAX)),
+            browser=TrafficConfigBuilder._build_browser_config(get),
+            captcha=TrafficConfigBuilder._build_captcha_config(get),
+            protection=TrafficConfigBuilder._build_protection_config(get),
+            burst_mode=get(SettingsKeys.BURST_MODE, Defaults.BURST_MODE),
+            burst_requests=int(get(SettingsKeys.BURST_REQUESTS, Defaults.BURST_REQUESTS)),
+            burst_sleep_min=float(get(SettingsKeys.BURST_SLEEP_MIN, Defaults.BURST_SLEEP_MIN)),
+            burst_sleep_max=float(get(SettingsKeys.BURST_SLEEP_MAX, Defaults.BURST_SLEEP_MAX)),
         )
 
     @staticmethod
-    def _build_browser_config(settings: dict[str, Any]) -> BrowserConfig:
-        """Helper to build BrowserConfig from settings."""
-        selected_str = settings.get(
+    def _build_browser_config(get: Callable[[str, Any], Any]) -> BrowserConfig:
+        """Helper to build BrowserConfig from a bound settings.get."""
+        selected_str = get(
             SettingsKeys.BROWSER_SELECTED, Defaults.BROWSER_SELECTED
         )
         selected_enum = TrafficConfigBuilder.BROWSER_SELECTION_MAP.get(
@@ -90,41 +165,41 @@ class TrafficConfigBuilder:
 
         return BrowserConfig(
             selected_browser=selected_enum,
-            chrome_path=settings.get(
+            chrome_path=get(
                 SettingsKeys.BROWSER_CHROME_PATH, Defaults.BROWSER_CHROME_PATH
             ),
-            chromium_path=settings.get(
+            chromium_path=get(
                 SettingsKeys.BROWSER_CHROMIUM_PATH, Defaults.BROWSER_CHROMIUM_PATH
             ),
-            edge_path=settings.get(
+            edge_path=get(
                 SettingsKeys.BROWSER_EDGE_PATH, Defaults.BROWSER_EDGE_PATH
             ),
-            brave_path=settings.get(
+            brave_path=get(
                 SettingsKeys.BROWSER_BRAVE_PATH, Defaults.BROWSER_BRAVE_PATH
             ),
-            firefox_path=settings.get(
+            firefox_path=get(
                 SettingsKeys.BROWSER_FIREFOX_PATH, Defaults.BROWSER_FIREFOX_PATH
             ),
-            other_path=settings.get(
+            other_path=get(
                 SettingsKeys.BROWSER_OTHER_PATH, Defaults.BROWSER_OTHER_PATH
             ),
-            headless=settings.get(SettingsKeys.HEADLESS, Defaults.HEADLESS),
-            max_contexts=int(settings.get(
+            headless=get(SettingsKeys.HEADLESS, Defaults.HEADLESS),
+            max_contexts=int(get(
                 SettingsKeys.BROWSER_CONTEXTS, Defaults.BROWSER_CONTEXTS
             )),
-            locale=settings.get(SettingsKeys.BROWSER_LOCALE, Defaults.BROWSER_LOCALE),
-            timezone=settings.get(
+            locale=get(SettingsKeys.BROWSER_LOCALE, Defaults.BROWSER_LOCALE),
+            timezone=get(
                 SettingsKeys.BROWSER_TIMEZONE, Defaults.BROWSER_TIMEZONE
             ),
-            stealth_enabled=settings.get(
+            stealth_enabled=get(
                 SettingsKeys.BROWSER_STEALTH, Defaults.BROWSER_STEALTH
             ),
         )
 
     @staticmethod
-    def _build_captcha_config(settings: dict[str, Any]) -> CaptchaConfig:
-        """Helper to build CaptchaConfig from settings."""
-        provider_str = settings.get(
+    def _build_captcha_config(get: Callable[[str, Any], Any]) -> CaptchaConfig:
+        """Helper to build CaptchaConfig from a bound settings.get."""
+        provider_str = get(
             SettingsKeys.CAPTCHA_PRIMARY, Defaults.CAPTCHA_PRIMARY
         )
         provider_enum = TrafficConfigBuilder.CAPTCHA_PROVIDER_MAP.get(
@@ -132,35 +207,38 @@ class TrafficConfigBuilder:
         )
 
         return CaptchaConfig(
-            twocaptcha_key=settings.get(
+            twocaptcha_key=get(
                 SettingsKeys.CAPTCHA_2CAPTCHA_KEY, Defaults.CAPTCHA_2CAPTCHA_KEY
             ),
-            anticaptcha_key=settings.get(
+            anticaptcha_key=get(
                 SettingsKeys.CAPTCHA_ANTICAPTCHA_KEY, Defaults.CAPTCHA_ANTICAPTCHA_KEY
             ),
             primary_provider=provider_enum,
-            fallback_enabled=settings.get(
+            fallback_enabled=get(
                 SettingsKeys.CAPTCHA_FALLBACK_ENABLED, Defaults.CAPTCHA_FALLBACK_ENABLED
             ),
-            timeout_seconds=int(settings.get(
+            timeout_seconds=int(get(
                 SettingsKeys.CAPTCHA_TIMEOUT, Defaults.CAPTCHA_TIMEOUT
             )),
+            reuse_tokens=get(
+                SettingsKeys.CAPTCHA_REUSE_TOKENS, Defaults.CAPTCHA_REUSE_TOKENS
+            ),
         )
 
     @staticmethod
-    def _build_protection_config(settings: dict[str, Any]) -> ProtectionBypassConfig:
-        """Helper to build ProtectionBypassConfig from settings."""
+    def _build_protection_config(get: Callable[[str, Any], Any]) -> ProtectionBypassConfig:
+        """Helper to build ProtectionBypassConfig from a bound settings.get."""
         return ProtectionBypassConfig(
-            cloudflare_enabled=settings.get(
+            cloudflare_enabled=get(
                 SettingsKeys.CLOUDFLARE_BYPASS, Defaults.CLOUDFLARE_BYPASS
             ),
-            cloudflare_wait_seconds=int(settings.get(
+            cloudflare_wait_seconds=int(get(
                 SettingsKeys.CLOUDFLARE_WAIT, Defaults.CLOUDFLARE_WAIT
             )),
-            akamai_enabled=settings.get(
+            akamai_enabled=get(
                 SettingsKeys.AKAMAI_BYPASS, Defaults.AKAMAI_BYPASS
             ),
-            auto_solve_captcha=settings.get(
+            auto_solve_captcha=get(
                 SettingsKeys.AUTO_SOLVE_CAPTCHA, Defaults.AUTO_SOLVE_CAPTCHA
             ),
         )
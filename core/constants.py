@@ -1,7 +1,20 @@
 """
 Application-wide constants and configuration defaults.
+
+Marker lists below come with a precompiled *_RE union: prefer it for
+"does any marker occur" checks (one C-level pass over the page instead of
+one substring scan per marker). Keep iterating the list when the number
+of distinct markers matters.
 """
 
+import re
+
+
+def _marker_re(markers: list[str], flags: int = 0) -> re.Pattern[str]:
+    """Compile a list of literal markers into one alternation pattern."""
+    return re.compile("|".join(map(re.escape, markers)), flags)
+
+
 # Browser impersonation options for TLS fingerprinting
 BROWSER_IMPERSONATIONS = ["chrome120", "chrome124", "safari15_5"]
 
@@ -31,6 +44,11 @@ MAX_VIEW_TIME = 300
 # Request defaults
 REQUEST_TIMEOUT_SECONDS = 30
 SCRAPE_TIMEOUT_SECONDS = 15
+# Max idle keep-alive sessions kept by the fast engine across all
+# (impersonation, proxy) pairs; least recently used are closed first
+SESSION_POOL_SIZE = 64
+# Idle proxies the fast engine weighs against each other per acquisition
+PROXY_SAMPLE_SIZE = 4
 
 # Proxy checker batch size (for staggered launch)
 PROXY_CHECK_BATCH_SIZE = 50
@@ -49,9 +67,10 @@ PROXY_ERROR_CODES = [
     "curl: (7)",
     "curl: (35)",
 ]
+PROXY_ERROR_RE = _marker_re(PROXY_ERROR_CODES)
 
 # Success status codes
-SUCCESS_STATUS_CODES = [200, 201, 301, 302]
+SUCCESS_STATUS_CODES = frozenset({200, 201, 301, 302})
 
 # Dead proxy sentinel speed value
 DEAD_PROXY_SPEED_MS = 9999
@@ -187,6 +206,7 @@ CLOUDFLARE_MARKERS = [
     "challenges.cloudflare.com",
     "turnstile.if.js",
 ]
+CLOUDFLARE_RE = _marker_re(CLOUDFLARE_MARKERS)
 
 # Cloudflare title markers - page titles during challenge
 CLOUDFLARE_TITLE_MARKERS = [
@@ -196,6 +216,7 @@ CLOUDFLARE_TITLE_MARKERS = [
     "Checking your browser",
     "Security Check",
 ]
+CLOUDFLARE_TITLE_RE = _marker_re(CLOUDFLARE_TITLE_MARKERS, re.IGNORECASE)
 
 # Cloudflare success indicators - markers that show bypass worked
 CLOUDFLARE_SUCCESS_MARKERS = [
@@ -211,6 +232,7 @@ CAPTCHA_MARKERS = [
     "grecaptcha",
     "challenges.cloudflare.com/turnstile",
 ]
+CAPTCHA_RE = _marker_re(CAPTCHA_MARKERS)
 
 # Turnstile-specific markers (Cloudflare's captcha)
 TURNSTILE_MARKERS = [
@@ -227,6 +249,7 @@ AKAMAI_MARKERS = [
     "ak_bmsc",
     "akamai",
 ]
+AKAMAI_RE = _marker_re(AKAMAI_MARKERS)
 
 # Browser error patterns
 BROWSER_ERROR_PATTERNS = [
@@ -236,6 +259,7 @@ BROWSER_ERROR_PATTERNS = [
     "Target closed",
     "Protocol error",
 ]
+BROWSER_ERROR_RE = _marker_re(BROWSER_ERROR_PATTERNS)
 
 # User agents for browser mode (matched to viewport for consistency)
 BROWSER_USER_AGENTS = [
@@ -2,6 +2,8 @@ import asyncio
 import contextlib
 import logging
 import random
+import time
+from collections import OrderedDict, deque
 from collections.abc import Callable
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
@@ -11,8 +13,11 @@ from curl_cffi import requests
 from .constants import (
     BROWSER_HEADERS,
     BROWSER_IMPERSONATIONS,
-    PROXY_ERROR_CODES,
+    GUI_UPDATE_INTERVAL_MS,
+    PROXY_ERROR_RE,
+    PROXY_SAMPLE_SIZE,
     REQUEST_TIMEOUT_SECONDS,
+    SESSION_POOL_SIZE,
     SUCCESS_STATUS_CODES,
     get_referers,
 )
@@ -21,6 +26,30 @@ from .models import ProxyConfig, TrafficConfig, TrafficStats
 if TYPE_CHECKING:
     from .session_manager import SessionManager
 
+# Bound once: these run several times per request
+_choice = random.choice
+_random = random.random
+_uniform = random.uniform
+
+
+def _weighted_pick(proxies: list[ProxyConfig]) -> ProxyConfig:
+    """Score-weighted random pick in one pass (Efraimidis-Spirakis A-Res).
+
+    Each proxy draws random() ** (1 / weight) and the largest draw wins,
+    which matches random.choices(weights=...) without building a weights
+    list or prefix sums. Scores are floored at 0.1.
+    """
+    rand = _random
+    best = proxies[0]
+    best_key = -1.0
+    for p in proxies:
+        score = p.score
+        key = rand() ** (1.0 / (score if score > 0.1 else 0.1))
+        if key > best_key:
+            best_key = key
+            best = p
+    return best
+
 
 class AsyncTrafficEngine:
     def __init__(
@@ -39,11 +68,31 @@ class AsyncTrafficEngine:
         self.stats = TrafficStats()
         self.running = False
         self._stop_event = asyncio.Event()
+        self._last_update_ts = 0.0  # monotonic time of the last on_update
+        self._loop: asyncio.AbstractEventLoop | None = None
         self._initial_proxy_count = len(proxies)
-        # Proxy pool management - track which proxies are currently in use
-        self._proxies_in_use: set = set()
-        self._proxy_lock = asyncio.Lock()
+        # Proxy pool management. Idle proxies rotate through a deque and
+        # each proxy counts its own users (ProxyConfig.in_use). Nothing here
+        # awaits, so acquire/release are atomic on the event loop without a lock.
+        self._available: deque[ProxyConfig] = deque(proxies)
+        for p in proxies:
+            p.in_use = 0
+        # id(proxy) -> position in self.proxies, for O(1) dead-proxy removal
+        self._proxy_positions = {id(p): i for i, p in enumerate(proxies)}
         self._proxy_index = 0  # For round-robin when all proxies are in use
+        self._all_equal_scores = True  # Set by _mark_scores_dirty()
+        self._mark_scores_dirty()
+        # Keep-alive sessions reused across requests (no TLS/TCP handshake per
+        # visit). Idle ones wait per (impersonate, proxy_url) in LRU order.
+        self._idle_sessions: OrderedDict[tuple[str, str], list] = OrderedDict()
+        self._idle_count = 0
+        self._busy_sessions: set = set()
+        # Per-request header invariants, resolved once per engine
+        self._base_headers = dict(BROWSER_HEADERS)
+        self._referers = tuple(get_referers())
+        # View time is min + span * random(), same distribution as uniform()
+        self._view_min = config.min_duration
+        self._view_span = config.max_duration - config.min_duration
         # Extract domain for session management
         self._target_domain = urlparse(config.target_url).netloc
 
@@ -53,39 +102,136 @@ class AsyncTrafficEngine:
         if self.on_log:
             self.on_log(message)
 
+    def _mark_scores_dirty(self):
+        """Recheck whether every proxy weighs the same; call after rescoring.
+
+        With uniform (floored) scores the weighted pick degenerates to a
+        plain random.choice, which _acquire_proxy then uses directly.
+        """
+        weights = {max(p.score, 0.1) for p in self.proxies}
+        self._all_equal_scores = len(weights) <= 1
+
+    def _emit_update(self, force: bool = False):
+        """Push stats to on_update, at most once per GUI_UPDATE_INTERVAL_MS.
+
+        Completions inside the interval are coalesced into the next push;
+        force (and stopping) always pushes so the final state is shown.
+        """
+        if not self.on_update:
+            return
+        now = time.monotonic()
+        if (
+            not force
+            and self.running
+            and (now - self._last_update_ts) * 1000 < GUI_UPDATE_INTERVAL_MS
+        ):
+            return
+        self._last_update_ts = now
+        self.stats.active_proxies = len(self.proxies)
+        self.on_update(self.stats)
+
     async def _acquire_proxy(self) -> ProxyConfig | None:
         """Acquire an available proxy for exclusive use by a task."""
-        async with self._proxy_lock:
-            if not self.proxies:
-                return None
-
-            # Find proxies not currently in use
-            available = [
-                p for p in self.proxies if (p.host, p.port) not in self._proxies_in_use
+        if not self.proxies:
+            return None
+
+        if self._available:
+            # Weighted pick among the next few idle proxies; the rest rotate
+            # to the back so every proxy keeps getting a turn
+            candidates = [
+                self._available.popleft()
+                for _ in range(min(PROXY_SAMPLE_SIZE, len(self._available)))
             ]
-
-            if available:
-                # Weighted selection from available proxies
-                try:
-                    weights = [max(p.score, 0.1) for p in available]
-                    proxy = random.choices(available, weights=weights, k=1)[0]
-                except (ValueError, IndexError):
-                    proxy = random.choice(available)
+            if self._all_equal_scores:
+                proxy = _choice(candidates)
             else:
-                # All proxies in use - use round-robin to distribute load
-                self._proxy_index = (self._proxy_index + 1) % len(self.proxies)
-                proxy = self.proxies[self._proxy_index]
+                proxy = _weighted_pick(candidates)
+            self._available.extend(p for p in candidates if p is not proxy)
+        else:
+            # All proxies in use - use round-robin to distribute load
+            self._proxy_index = (self._proxy_index + 1) % len(self.proxies)
+            proxy = self.proxies[self._proxy_index]
 
-            # Mark proxy as in use
-            self._proxies_in_use.add((proxy.host, proxy.port))
-            return proxy
+        # Mark proxy as in use
+        proxy.in_use += 1
+        return proxy
 
     async def _release_proxy(self, proxy: ProxyConfig | None):
         """Release a proxy back to the pool."""
         if proxy is None:
             return
-        async with self._proxy_lock:
-            self._proxies_in_use.discard((proxy.host, proxy.port))
+        if proxy.in_use <= 0:
+            return  # Not acquired, or already removed as dead
+        proxy.in_use -= 1
+        if proxy.in_use == 0:
+            self._available.append(proxy)
+
+    def _remove_proxy(self, proxy: ProxyConfig) -> bool:
+        """Drop a proxy from the pool in O(1); False if it was already gone.
+
+        The last proxy is moved into the freed slot, so list order is not kept.
+        """
+        i = self._proxy_positions.pop(id(proxy), None)
+        if i is None:
+            return False
+        last = self.proxies.pop()
+        if last is not proxy:
+            self.proxies[i] = last
+            self._proxy_positions[id(last)] = i
+        return True
+
+    def _checkout_session(self, key: tuple[str, str]):
+        """Take an idle session for (impersonate, proxy_url), or open a new one.
+
+        A session is held by one request at a time: curl_cffi corrupts
+        transfers when concurrent requests share a connection, and each
+        visit starts from a jar holding only the persisted cookies.
+        Concurrent requests on the same key therefore get separate sessions
+        instead of queueing on one.
+        """
+        idle = self._idle_sessions.get(key)
+        if idle:
+            session = idle.pop()
+            if not idle:
+                del self._idle_sessions[key]
+            self._idle_count -= 1
+        else:
+            session = requests.AsyncSession(impersonate=key[0])
+        self._busy_sessions.add(session)
+        return session
+
+    async def _checkin_session(self, key: tuple[str, str], session):
+        """Return a session to the idle pool, closing the LRU ones over the cap."""
+        self._busy_sessions.discard(session)
+        self._idle_sessions.setdefault(key, []).append(session)
+        self._idle_sessions.move_to_end(key)
+        self._idle_count += 1
+
+        while self._idle_count > SESSION_POOL_SIZE:
+            old_key, old_idle = next(iter(self._idle_sessions.items()))
+            old_session = old_idle.pop(0)
+            if not old_idle:
+                del self._idle_sessions[old_key]
+            self._idle_count -= 1
+            with contextlib.suppress(Exception):
+                await old_session.close()
+
+    async def _discard_session(self, session):
+        """Close a checked-out session instead of returning it to the pool."""
+        self._busy_sessions.discard(session)
+        with contextlib.suppress(Exception):
+            await session.close()
+
+    async def close_all(self):
+        """Close every pooled session, idle or still checked out."""
+        sessions = [s for idle in self._idle_sessions.values() for s in idle]
+        sessions.extend(self._busy_sessions)
+        self._idle_sessions = OrderedDict()
+        self._idle_count = 0
+        self._busy_sessions = set()
+        for session in sessions:
+            with contextlib.suppress(Exception):
+                await session.close()
 
     async def _make_request(self):
         """Performs a single visit using a unique proxy and browser impersonation."""
@@ -97,26 +243,30 @@ class AsyncTrafficEngine:
             self.running = False
             return
 
-        proxy = None
+        proxies_dict = None
         proxy_config = None
         if self.proxies:
             # Acquire a proxy for exclusive use during this request
             proxy_config = await self._acquire_proxy()
             if proxy_config:
-                proxy = proxy_config.to_curl_cffi_format()
+                proxies_dict = proxy_config.proxies_dict
 
         # Randomize impersonation
-        impersonate = random.choice(BROWSER_IMPERSONATIONS)
+        impersonate = _choice(BROWSER_IMPERSONATIONS)
 
+        session_key = (impersonate, proxies_dict["http"] if proxies_dict else "")
         session = None
+        cancelled = False
+        stats = self.stats
+        # Counted outside the try so the finally's decrement always pairs
+        # with this increment
+        stats.active_threads += 1
+        stats.total_requests += 1  # Increment at start so req >= success+failed always
         try:
-            self.stats.active_threads += 1
-            self.stats.total_requests += (
-                1  # Increment at start so req >= success+failed always
-            )
-
-            # Create fresh session for each request (clean cookies/TLS state per "user")
-            session = requests.AsyncSession(impersonate=impersonate)
+            # Reuse an idle keep-alive session for this impersonation/proxy
+            # (held exclusively), but start each "user" with a clean cookie jar
+            session = self._checkout_session(session_key)
+            session.cookies.clear()
 
             # Load persisted cookies if session manager is available
             if self.session_manager:
@@ -129,12 +279,9 @@ class AsyncTrafficEngine:
                             domain=cookie.get("domain", self._target_domain),
                         )
 
-            # Set proxy for this request
-            proxies_dict = {"http": proxy, "https": proxy} if proxy else None
-
             # Use browser-consistent headers (User-Agent is set by curl_cffi impersonate)
-            headers = BROWSER_HEADERS.copy()
-            headers["Referer"] = random.choice(get_referers())
+            headers = self._base_headers.copy()
+            headers["Referer"] = _choice(self._referers)
 
             logging.debug(f"Request to {self.config.target_url} via {impersonate}")
 
@@ -147,7 +294,7 @@ class AsyncTrafficEngine:
             )
 
             if response.status_code in SUCCESS_STATUS_CODES:
-                self.stats.success += 1
+                stats.success += 1
                 logging.debug(f"Success: {response.status_code}")
                 # Save cookies from successful response
                 if self.session_manager and response.cookies:
@@ -158,58 +305,62 @@ class AsyncTrafficEngine:
                     if cookies_list:
                         self.session_manager.save_session(self._target_domain, cookies_list)
             else:
-                self.stats.failed += 1
+                stats.failed += 1
                 logging.warning(f"Failed with status: {response.status_code}")
 
             # Simulate reading/view time
             if self.running:
-                view_time = random.uniform(
-                    self.config.min_duration, self.config.max_duration
-                )
-                await asyncio.sleep(view_time)
+                await asyncio.sleep(self._view_min + self._view_span * _random())
 
         except Exception as e:
-            self.stats.failed += 1
+            stats.failed += 1
             err_msg = str(e)
 
             # Identify fatal proxy errors
-            is_proxy_error = any(code in err_msg for code in PROXY_ERROR_CODES)
+            is_proxy_error = PROXY_ERROR_RE.search(err_msg) is not None
 
             if is_proxy_error and proxy_config:
                 logging.debug(f"Proxy Failure: {err_msg}")
-                if self.proxies and proxy_config in self.proxies:
-                    try:
-                        self.proxies.remove(proxy_config)
-                        remaining = len(self.proxies)
-                        self._log(
-                            f"Removed dead proxy {proxy_config.host}:{proxy_config.port}. {remaining} remaining."
-                        )
-                        if remaining == 0:
-                            self._log("CRITICAL: All proxies removed! Stopping.")
-                            self.running = False
-                    except ValueError:
-                        pass  # Already removed
+                if self._remove_proxy(proxy_config):
+                    # Zero its users so the release below doesn't re-queue it
+                    proxy_config.in_use = 0
+                    remaining = len(self.proxies)
+                    self._log(
+                        f"Removed dead proxy {proxy_config.host}:{proxy_config.port}. {remaining} remaining."
+                    )
+                    if remaining == 0:
+                        self._log("CRITICAL: All proxies removed! Stopping.")
+                        self.running = False
             elif "curl: (60)" in err_msg:
                 logging.debug(f"SSL/TLS Error: {err_msg}")
             else:
                 logging.debug(f"Request Error: {err_msg}")
+        except asyncio.CancelledError:
+            # Cut off at a burst boundary (or on shutdown): count it as failed
+            # and don't pool a session whose transfer may have been abandoned
+            stats.failed += 1
+            cancelled = True
+            raise
         finally:
             # Release proxy back to pool
             await self._release_proxy(proxy_config)
 
-            # Clean up session
-            if session:
-                with contextlib.suppress(Exception):
-                    await session.close()
-            self.stats.active_threads -= 1
-            if self.on_update:
-                self.stats.active_proxies = len(self.proxies)
-                self.on_update(self.stats)
+            # Hand the session back to the pool (kept open for reuse)
+            if session is not None:
+                if cancelled:
+                    await self._discard_session(session)
+                else:
+                    await self._checkin_session(session_key, session)
+            stats.active_threads -= 1
+            self._emit_update()
 
     async def run(self):
         """Main loop to spawn workers."""
         self.running = True
         self.stats = TrafficStats()  # Reset stats
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        stop_waiter = asyncio.create_task(self._stop_event.wait())
 
         # Burst mode tracking
         burst_count = 0
@@ -221,7 +372,9 @@ class AsyncTrafficEngine:
             f"Fast engine started ({mode_str}). {len(self.proxies)} proxies, {self.config.max_threads} threads."
         )
 
-        tasks = set()
+        # Strong references keep in-flight tasks alive (the loop only holds
+        # weak ones); asyncio.wait hands back the ones still pending
+        tasks: set[asyncio.Task] = set()
 
         try:
             while self.running:
@@ -234,9 +387,7 @@ class AsyncTrafficEngine:
                         self.running = False
                         break
 
-                    task = asyncio.create_task(self._make_request())
-                    tasks.add(task)
-                    task.add_done_callback(tasks.discard)
+                    tasks.add(asyncio.create_task(self._make_request()))
 
                     # Track burst progress
                     if burst_mode:
@@ -249,13 +400,23 @@ class AsyncTrafficEngine:
 
                 # Burst mode: sleep between bursts
                 if burst_mode and burst_count >= burst_size:
-                    # Wait for current burst to complete
+                    # Wait for current burst to complete. A request can take
+                    # up to the request timeout plus its view time; anything
+                    # still running after that is cancelled so the burst
+                    # closes before the sleep.
                     if tasks:
-                        await asyncio.wait(tasks, timeout=10)
+                        _, stragglers = await asyncio.wait(
+                            tasks,
+                            timeout=REQUEST_TIMEOUT_SECONDS + self.config.max_duration,
+                        )
+                        for task in stragglers:
+                            task.cancel()
+                        if stragglers:
+                            await asyncio.gather(*stragglers, return_exceptions=True)
                         tasks = set()
 
                     # Sleep between bursts
-                    sleep_time = random.uniform(
+                    sleep_time = _uniform(
                         self.config.burst_sleep_min, self.config.burst_sleep_max
                     )
                     self._log(
@@ -263,17 +424,32 @@ class AsyncTrafficEngine:
                     )
                     await asyncio.sleep(sleep_time)
                     burst_count = 0
+                elif tasks:
+                    # Sleep until a slot frees up (or stop() is called)
+                    _, tasks = await asyncio.wait(
+                        {*tasks, stop_waiter}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    tasks.discard(stop_waiter)
                 else:
-                    await asyncio.sleep(0.1)  # Prevent tight loop
+                    # max_threads < 1: nothing to wait on but stop()
+                    await stop_waiter
 
             # Wait for pending tasks to finish gracefully
             if tasks:
                 await asyncio.wait(tasks, timeout=5)
 
         finally:
+            stop_waiter.cancel()
+            await self.close_all()
+            self._emit_update(force=True)
             self._log(
                 f"Fast engine stopped. {self.stats.success} success, {self.stats.failed} failed."
             )
 
     def stop(self):
+        """Signal engine to stop. Safe to call from any thread."""
         self.running = False
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(self._stop_event.set)
@@ -5,6 +5,7 @@ This module provides a factory pattern for instantiating traffic engines
 based on the selected engine mode, with graceful fallback handling.
 """
 
+import dataclasses
 import logging
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Protocol
@@ -75,8 +76,8 @@ class EngineFactory:
                 if on_log:
                     on_log(f"WARNING: {msg}")
 
-                # Update config to reflect fallback
-                config.engine_mode = EngineMode.CURL
+                # Reflect the fallback in a copy (configs may be shared)
+                config = dataclasses.replace(config, engine_mode=EngineMode.CURL)
                 # Continue to fallback block below
 
         # Default to AsyncTrafficEngine (CURL mode or fallback)
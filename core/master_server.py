@@ -1,23 +1,76 @@
 import asyncio
 import contextlib
 import logging
+import math
 import threading
 import time
+from collections import deque
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
 
 from .websocket_server import MessageType, WebSocketServer
 
-
-@dataclass
+# Optional imports - graceful degradation if not available
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+    uvloop = None
+
+# Progress/status messages that on_message_batch receives coalesced (latest
+# payload per slave and type, flushed every STATS_FLUSH_INTERVAL seconds)
+COALESCED_MESSAGE_TYPES = frozenset({
+    MessageType.STATUS_UPDATE,
+    MessageType.SCRAPE_PROGRESS,
+    MessageType.CHECK_PROGRESS,
+    MessageType.TRAFFIC_STATS,
+})
+STATS_FLUSH_INTERVAL = 0.1
+
+# Seconds a command send may take, whether awaited or queued without blocking
+COMMAND_TIMEOUT = 5.0
+
+# Level label shown in the GUI log for each slave log message type
+_LOG_LEVEL_NAME = {
+    MessageType.LOG_INFO: "INFO",
+    MessageType.LOG_WARNING: "WARNING",
+    MessageType.LOG_ERROR: "ERROR",
+}
+
+# (slave_id, message_type, payload) tuples delivered to on_message_batch
+MessageBatch = list[tuple[str, MessageType, dict]]
+
+
+def _count(payload: dict, key: str) -> int:
+    """Read a counter from a slave payload (missing, None or invalid -> 0)."""
+    try:
+        return int(payload.get(key) or 0)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def _percent(payload: dict, key: str) -> float:
+    """Read a percentage from a slave payload (missing, None or invalid -> 0.0)."""
+    try:
+        value = float(payload.get(key) or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+    return value if math.isfinite(value) else 0.0
+
+
+@dataclass(slots=True)
 class SlaveStats:
     """Statistics for a single slave."""
 
     slave_id: str
     slave_name: str
     ip_address: str
-    connected_at: float
-    last_heartbeat: float
+    connected_at: float  # Wall clock, for display
+    last_heartbeat: float  # Wall clock of the last status update, for display
     status: str = "idle"  # idle, scraping, checking, traffic, scanning
     current_operation: str = ""
 
@@ -34,8 +87,18 @@ class SlaveStats:
     memory_percent: float = 0.0
     disk_percent: float = 0.0
 
+    # "[name] " prepended to this slave's log lines, built once
+    log_prefix: str = field(init=False, repr=False, compare=False)
+    # time.monotonic() of the last status update, for staleness checks
+    # (immune to wall-clock jumps, unlike last_heartbeat)
+    _last_heartbeat_mono: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.log_prefix = f"[{self.slave_name}] "
+        self._last_heartbeat_mono = time.monotonic()
+
 
-@dataclass
+@dataclass(slots=True)
 class AggregatedStats:
     """Aggregated statistics from all slaves."""
 
@@ -50,7 +113,7 @@ class AggregatedStats:
     avg_memory: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanResultEntry:
     """A single scan result entry."""
 
@@ -102,8 +165,11 @@ class MasterServer:
         on_slave_connected: Callable[[str, dict], None] | None = None,
         on_slave_disconnected: Callable[[str], None] | None = None,
         on_message: Callable[[str, MessageType, dict], None] | None = None,
+        on_message_batch: Callable[[MessageBatch], None] | None = None,
         on_scan_result: Callable[[ScanResultEntry], None] | None = None,
+        on_scan_results_batch: Callable[[list[ScanResultEntry]], None] | None = None,
         on_log: Callable[[str], None] | None = None,
+        max_scan_results: int = 100_000,
     ):
         """
         Initialize MasterServer.
@@ -119,8 +185,15 @@ class MasterServer:
             on_slave_connected: Callback when slave connects (slave_id, info)
             on_slave_disconnected: Callback when slave disconnects (slave_id)
             on_message: Callback for incoming messages (slave_id, type, payload)
+            on_message_batch: Callback receiving status/progress messages
+                              coalesced per tick as (slave_id, type, payload)
+                              tuples; when set, on_message no longer gets them
             on_scan_result: Callback for each new scan result found
+            on_scan_results_batch: Callback with all results from one
+                                   message (one GUI hop per message; when
+                                   set, on_scan_result is not called)
             on_log: Callback for log messages
+            max_scan_results: Scan results kept in memory (oldest dropped first)
         """
         self.host = host
         self.port = port
@@ -130,10 +203,14 @@ class MasterServer:
 
         # Callbacks
         self._callback_wrapper = callback_wrapper or (lambda cb: cb())
+        # Without a GUI wrapper, callbacks run inline with no trampoline
+        self._has_gui = callback_wrapper is not None
         self._on_slave_connected = on_slave_connected
         self._on_slave_disconnected = on_slave_disconnected
         self._on_message = on_message
+        self._on_message_batch = on_message_batch
         self._on_scan_result = on_scan_result
+        self._on_scan_results_batch = on_scan_results_batch
         self._on_log = on_log
 
         # Internal state
@@ -141,24 +218,82 @@ class MasterServer:
         self._loop: asyncio.AbstractEventLoop | None = None
         self._thread: threading.Thread | None = None
         self._running = False
-        self._lock = threading.Lock()
-
-        # Data storage
+        self._lock = threading.Lock()  # Server lifecycle (start/stop) only
+        self._ready = threading.Event()  # Set once the loop thread is up (or failed)
+        # Latest coalesced payload per (slave_id, type), drained by the flusher
+        self._pending_updates: dict[tuple[str, MessageType], dict] = {}
+        self._flush_task: asyncio.Task | None = None
+
+        # Data storage. Stats are written only from the server loop thread
+        # and read from the GUI thread: per-field updates and single lookups
+        # rely on CPython's atomic dict/attribute access, while adding or
+        # removing slaves, taking snapshots and touching _totals go through
+        # _stats_lock.
         self._slave_stats: dict[str, SlaveStats] = {}
-        self._scan_results: list[ScanResultEntry] = []
+        self._scan_results: deque[ScanResultEntry] = deque(maxlen=max_scan_results)
+        self._stats_lock = threading.Lock()
+        # Cached get_slaves() result; reset to None whenever a slave joins or
+        # leaves (field updates mutate the SlaveStats objects it already holds)
+        self._slaves_snapshot: tuple[SlaveStats, ...] | None = None
+        # Running totals over all slaves, kept up to date by the handlers so
+        # get_aggregated_stats() never has to scan (avg_* hold sums here)
+        self._totals = AggregatedStats()
+
+        # message_type -> handler(stats, payload) for _handle_message
+        self._dispatch: dict[MessageType, Callable[[SlaveStats, dict], None]] = {
+            MessageType.STATUS_UPDATE: self._update_slave_status,
+            MessageType.SCRAPE_PROGRESS: self._update_scrape_progress,
+            MessageType.CHECK_PROGRESS: self._update_check_progress,
+            MessageType.TRAFFIC_STATS: self._update_traffic_stats,
+            MessageType.SCAN_RESULTS: self._update_scan_results,
+        }
+        for log_type in _LOG_LEVEL_NAME:
+            self._dispatch[log_type] = (
+                lambda stats, payload, log_type=log_type: self._handle_slave_log(
+                    stats, log_type, payload
+                )
+            )
 
         self.logger = logging.getLogger(__name__)
+        self._log = self._make_log()
+
+    def _make_log(self) -> Callable[[str], None]:
+        """
+        Build the log function, specialised on whether on_log is set.
 
-    def _log(self, message: str) -> None:
-        """Log message via callback (GUI-safe)."""
-        self.logger.info(message)
-        if self._on_log:
-            self._callback_wrapper(lambda: self._on_log(message))
+        Returns:
+            Function that logs a message and, if registered, forwards it to
+            on_log via the callback wrapper (GUI-safe)
+        """
+        info = self.logger.info
+        on_log = self._on_log
+        if not on_log:
+            return info
+
+        if not self._has_gui:
+
+            def log(message: str) -> None:
+                info(message)
+                on_log(message)
+
+            return log
+
+        callback_wrapper = self._callback_wrapper
+
+        def log(message: str) -> None:
+            info(message)
+            callback_wrapper(partial(on_log, message))
+
+        return log
 
     def _wrap_callback(self, callback: Callable | None, *args) -> None:
-        """Execute callback on GUI thread."""
-        if callback:
-            self._callback_wrapper(lambda: callback(*args))
+        """Execute callback on GUI thread (inline when there is no GUI)."""
+        if not callback:
+            return
+        if self._has_gui:
+            self._callback_wrapper(partial(callback, *args))
+        else:
+            callback(*args)
 
     # ==================== Server Lifecycle ====================
 
@@ -179,8 +314,11 @@ class MasterServer:
                 return False
 
             try:
-                # Create new event loop for background thread
-                self._loop = asyncio.new_event_loop()
+                # Create new event loop for background thread (uvloop if present)
+                if UVLOOP_AVAILABLE:
+                    self._loop = uvloop.new_event_loop()
+                else:
+                    self._loop = asyncio.new_event_loop()
 
                 # Create WebSocket server
                 self._server = WebSocketServer(
@@ -195,6 +333,7 @@ class MasterServer:
                 )
 
                 # Start background thread
+                self._ready.clear()
                 self._thread = threading.Thread(
                     target=self._run_server_loop,
                     name="MasterServer",
@@ -203,9 +342,7 @@ class MasterServer:
                 self._thread.start()
 
                 # Wait for server to start (up to 5 seconds)
-                start_time = time.time()
-                while not self._running and time.time() - start_time < 5:
-                    time.sleep(0.1)
+                self._ready.wait(timeout=5)
 
                 if self._running:
                     self._log(f"Master server started on {self.host}:{self.port}")
@@ -225,7 +362,10 @@ class MasterServer:
 
         try:
             self._loop.run_until_complete(self._server.start())
+            if self._on_message_batch:
+                self._flush_task = self._loop.create_task(self._flush_updates_loop())
             self._running = True
+            self._ready.set()
 
             # Run until stopped
             self._loop.run_forever()
@@ -234,8 +374,15 @@ class MasterServer:
             self.logger.error(f"Server loop error: {e}", exc_info=True)
         finally:
             self._running = False
+            # Unblock start() right away if the server failed to come up
+            self._ready.set()
 
             # Cleanup
+            if self._flush_task:
+                self._flush_task.cancel()
+                with contextlib.suppress(BaseException):
+                    self._loop.run_until_complete(self._flush_task)
+                self._flush_task = None
             if self._server:
                 with contextlib.suppress(Exception):
                     self._loop.run_until_complete(self._server.stop())
@@ -259,7 +406,10 @@ class MasterServer:
             if self._thread and self._thread.is_alive():
                 self._thread.join(timeout=5)
 
-            self._slave_stats.clear()
+            with self._stats_lock:
+                self._slave_stats.clear()
+                self._slaves_snapshot = None
+                self._totals = AggregatedStats()
             self._scan_results.clear()
             self._log("Master server stopped")
 
@@ -268,45 +418,61 @@ class MasterServer:
     def _handle_message(
         self, slave_id: str, message_type: MessageType, payload: dict
     ) -> None:
-        """Handle incoming message from slave."""
-        try:
-            # Update slave stats based on message type
-            if message_type == MessageType.STATUS_UPDATE:
-                self._update_slave_status(slave_id, payload)
-            elif message_type == MessageType.SCRAPE_PROGRESS:
-                self._update_scrape_progress(slave_id, payload)
-            elif message_type == MessageType.CHECK_PROGRESS:
-                self._update_check_progress(slave_id, payload)
-            elif message_type == MessageType.TRAFFIC_STATS:
-                self._update_traffic_stats(slave_id, payload)
-            elif message_type == MessageType.SCAN_RESULTS:
-                self._update_scan_results(slave_id, payload)
-            elif message_type in (
-                MessageType.LOG_INFO,
-                MessageType.LOG_WARNING,
-                MessageType.LOG_ERROR,
-            ):
-                self._handle_slave_log(slave_id, message_type, payload)
-
-            # Forward to user callback
-            if self._on_message:
-                self._wrap_callback(
-                    self._on_message, slave_id, message_type, payload
-                )
+        """
+        Handle incoming message from slave.
 
-        except Exception as e:
-            self.logger.error(f"Error handling message: {e}", exc_info=True)
+        Errors propagate to WebSocketServer._handle_message, which logs them.
+        """
+        # Update slave stats based on message type (known slaves only)
+        handler = self._dispatch.get(message_type)
+        if handler:
+            stats = self._slave_stats.get(slave_id)
+            if stats is not None:
+                handler(stats, payload)
+
+        # Forward to user callback; status/progress are coalesced
+        # into on_message_batch when it is registered
+        if self._on_message_batch and message_type in COALESCED_MESSAGE_TYPES:
+            self._pending_updates[(slave_id, message_type)] = payload
+        elif self._on_message:
+            self._wrap_callback(self._on_message, slave_id, message_type, payload)
+
+    def _flush_pending_updates(self) -> None:
+        """Hand the coalesced status/progress messages to the GUI in one hop."""
+        if not self._pending_updates:
+            return
+        pending, self._pending_updates = self._pending_updates, {}
+        batch = [
+            (slave_id, message_type, payload)
+            for (slave_id, message_type), payload in pending.items()
+        ]
+        self._wrap_callback(self._on_message_batch, batch)
+
+    async def _flush_updates_loop(self) -> None:
+        """Flush coalesced updates every STATS_FLUSH_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(STATS_FLUSH_INTERVAL)
+            try:
+                self._flush_pending_updates()
+            except Exception as e:
+                self.logger.error(f"Error flushing updates: {e}", exc_info=True)
 
     def _handle_slave_connected(self, slave_id: str, info: dict) -> None:
         """Handle slave connection."""
         # Create stats entry
-        self._slave_stats[slave_id] = SlaveStats(
+        entry = SlaveStats(
             slave_id=slave_id,
             slave_name=info.get("name", "Unknown"),
             ip_address=info.get("ip", ""),
             connected_at=info.get("connected_at", time.time()),
             last_heartbeat=time.time(),
         )
+        with self._stats_lock:
+            old = self._slave_stats.get(slave_id)
+            if old is not None:
+                self._remove_from_totals(old)
+            self._slave_stats[slave_id] = entry
+            self._slaves_snapshot = None
 
         self._log(f"Slave connected: {info.get('name', slave_id)}")
 
@@ -315,7 +481,13 @@ class MasterServer:
 
     def _handle_slave_disconnected(self, slave_id: str) -> None:
         """Handle slave disconnection."""
-        stats = self._slave_stats.pop(slave_id, None)
+        with self._stats_lock:
+            stats = self._slave_stats.pop(slave_id, None)
+            self._slaves_snapshot = None
+            if not self._slave_stats:
+                self._totals = AggregatedStats()  # Drop accumulated float drift
+            elif stats is not None:
+                self._remove_from_totals(stats)
         name = stats.slave_name if stats else slave_id
 
         self._log(f"Slave disconnected: {name}")
@@ -324,92 +496,117 @@ class MasterServer:
             self._wrap_callback(self._on_slave_disconnected, slave_id)
 
     def _handle_slave_log(
-        self, slave_id: str, log_type: MessageType, payload: dict
+        self, stats: SlaveStats, log_type: MessageType, payload: dict
     ) -> None:
         """Handle log message from slave."""
-        stats = self._slave_stats.get(slave_id)
-        name = stats.slave_name if stats else slave_id
         message = payload.get("message", "")
-        level = log_type.value.replace("log_", "").upper()
-
-        self._log(f"[{name}] [{level}] {message}")
+        self._log(f"{stats.log_prefix}[{_LOG_LEVEL_NAME[log_type]}] {message}")
 
-    def _update_slave_status(self, slave_id: str, payload: dict) -> None:
+    def _update_slave_status(self, stats: SlaveStats, payload: dict) -> None:
         """Update slave status from status update message."""
-        stats = self._slave_stats.get(slave_id)
-        if not stats:
-            return
+        cpu = _percent(payload, "cpu_percent")
+        memory = _percent(payload, "memory_percent")
+        with self._stats_lock:
+            totals = self._totals
+            totals.avg_cpu += cpu - stats.cpu_percent
+            totals.avg_memory += memory - stats.memory_percent
+            stats.cpu_percent = cpu
+            stats.memory_percent = memory
 
         stats.status = payload.get("status", "idle")
         stats.current_operation = payload.get("operation", "")
-        stats.cpu_percent = payload.get("cpu_percent", 0.0)
-        stats.memory_percent = payload.get("memory_percent", 0.0)
-        stats.disk_percent = payload.get("disk_percent", 0.0)
+        stats.disk_percent = _percent(payload, "disk_percent")
         stats.last_heartbeat = time.time()
+        stats._last_heartbeat_mono = time.monotonic()
 
-    def _update_scrape_progress(self, slave_id: str, payload: dict) -> None:
+    def _update_scrape_progress(self, stats: SlaveStats, payload: dict) -> None:
         """Update slave scrape progress."""
-        stats = self._slave_stats.get(slave_id)
-        if not stats:
-            return
+        found = _count(payload, "proxies_found")
+        with self._stats_lock:
+            self._totals.total_proxies_found += found - stats.proxies_found
+            stats.proxies_found = found
 
         stats.status = "scraping"
-        stats.proxies_found = payload.get("proxies_found", 0)
 
-    def _update_check_progress(self, slave_id: str, payload: dict) -> None:
+    def _update_check_progress(self, stats: SlaveStats, payload: dict) -> None:
         """Update slave check progress."""
-        stats = self._slave_stats.get(slave_id)
-        if not stats:
-            return
+        checked = _count(payload, "checked")
+        alive = _count(payload, "alive")
+        with self._stats_lock:
+            totals = self._totals
+            totals.total_proxies_checked += checked - stats.proxies_checked
+            totals.total_proxies_alive += alive - stats.proxies_alive
+            stats.proxies_checked = checked
+            stats.proxies_alive = alive
 
         stats.status = "checking"
-        stats.proxies_checked = payload.get("checked", 0)
-        stats.proxies_alive = payload.get("alive", 0)
 
-    def _update_traffic_stats(self, slave_id: str, payload: dict) -> None:
+    def _update_traffic_stats(self, stats: SlaveStats, payload: dict) -> None:
         """Update slave traffic stats."""
-        stats = self._slave_stats.get(slave_id)
-        if not stats:
-            return
+        requests = _count(payload, "total_requests")
+        success = _count(payload, "success")
+        failed = _count(payload, "failed")
+        with self._stats_lock:
+            totals = self._totals
+            totals.total_requests += requests - stats.requests
+            totals.total_success += success - stats.success
+            totals.total_failed += failed - stats.failed
+            stats.requests = requests
+            stats.success = success
+            stats.failed = failed
 
         stats.status = "traffic"
-        stats.requests = payload.get("total_requests", 0)
-        stats.success = payload.get("success", 0)
-        stats.failed = payload.get("failed", 0)
 
-    def _update_scan_results(self, slave_id: str, payload: dict) -> None:
+    def _remove_from_totals(self, stats: SlaveStats) -> None:
+        """Take a departing slave's counters out of the totals (under _stats_lock)."""
+        totals = self._totals
+        totals.total_requests -= stats.requests
+        totals.total_success -= stats.success
+        totals.total_failed -= stats.failed
+        totals.total_proxies_found -= stats.proxies_found
+        totals.total_proxies_checked -= stats.proxies_checked
+        totals.total_proxies_alive -= stats.proxies_alive
+        totals.avg_cpu -= stats.cpu_percent
+        totals.avg_memory -= stats.memory_percent
+
+    def _update_scan_results(self, stats: SlaveStats, payload: dict) -> None:
         """Update slave scan results and invoke callback."""
-        stats = self._slave_stats.get(slave_id)
-        if not stats:
-            return
-
         stats.status = "scanning"
         
         # Parse results list
         results = payload.get("results", [])
+        slave_id = stats.slave_id
         slave_name = stats.slave_name
         current_time = time.time()
 
-        for res in results:
-            entry = ScanResultEntry(
-                slave_id=slave_id,
-                slave_name=slave_name,
-                ip=res.get("ip", ""),
-                port=res.get("port", 0),
-                service=res.get("service", "unknown"),
-                banner=res.get("banner", ""),
-                fingerprint=res.get("fingerprint", ""),
-                version=res.get("version", ""),
-                scan_time=res.get("scan_time", 0.0),
-                has_valid_credentials=res.get("has_valid_credentials", False),
-                username=res.get("username", ""),
-                timestamp=current_time
+        # Positional in ScanResultEntry field order (hot for large scans)
+        entries = [
+            ScanResultEntry(
+                slave_id,
+                slave_name,
+                res.get("ip", ""),
+                res.get("port", 0),
+                res.get("service", "unknown"),
+                res.get("banner", ""),
+                res.get("fingerprint", ""),
+                res.get("version", ""),
+                res.get("scan_time", 0.0),
+                res.get("has_valid_credentials", False),
+                res.get("username", ""),
+                current_time,
             )
-            
-            self._scan_results.append(entry)
-            
-            # Notify via callback if registered
-            if self._on_scan_result:
+            for res in results
+        ]
+        if not entries:
+            return
+
+        self._scan_results.extend(entries)
+
+        # Notify via callback if registered
+        if self._on_scan_results_batch:
+            self._wrap_callback(self._on_scan_results_batch, entries)
+        elif self._on_scan_result:
+            for entry in entries:
                 self._wrap_callback(self._on_scan_result, entry)
 
     # ==================== Command Distribution ====================
@@ -436,11 +633,75 @@ class MasterServer:
                 self._server.send_command(slave_id, command_type, params),
                 self._loop,
             )
-            return future.result(timeout=5)
+            return future.result(timeout=COMMAND_TIMEOUT)
         except Exception as e:
             self.logger.error(f"Error sending command: {e}")
             return False
 
+    def send_command_async(
+        self,
+        slave_id: str,
+        command_type: MessageType,
+        params: dict,
+        on_done: Callable[[bool], None] | None = None,
+    ) -> bool:
+        """
+        Queue a command for a slave without blocking the calling thread.
+
+        Args:
+            slave_id: Target slave ID
+            command_type: Command type (MessageType enum)
+            params: Command parameters
+            on_done: Called on the GUI thread with True if the command was
+                delivered, False otherwise
+
+        Returns:
+            True if the slave is connected and the command was queued
+        """
+        if not self._running or not self._loop:
+            return False
+        if slave_id not in self._slave_stats:
+            return False
+
+        return self._submit(
+            self._server.send_command(slave_id, command_type, params), on_done, False
+        )
+
+    def _submit(self, coro, on_done: Callable | None, failed) -> bool:
+        """
+        Run a send coroutine on the server loop, reporting via on_done.
+
+        Args:
+            coro: WebSocketServer send coroutine
+            on_done: Called on the GUI thread with the coroutine's result
+            failed: Result passed to on_done if the send errors or times out
+
+        Returns:
+            True if the coroutine was scheduled
+        """
+        waiter = asyncio.wait_for(coro, COMMAND_TIMEOUT)
+        try:
+            future = asyncio.run_coroutine_threadsafe(waiter, self._loop)
+        except Exception as e:
+            waiter.close()
+            coro.close()
+            self.logger.error(f"Error queueing command: {e}")
+            return False
+
+        future.add_done_callback(partial(self._on_command_done, on_done, failed))
+        return True
+
+    def _on_command_done(self, on_done: Callable | None, failed, future) -> None:
+        """Report the outcome of a command queued by _submit."""
+        if future.cancelled():
+            result = failed
+        elif (exc := future.exception()) is not None:
+            self.logger.error(f"Error sending command: {exc!r}")
+            result = failed
+        else:
+            result = future.result()
+        self._wrap_callback(on_done, result)
+
     def broadcast_command(self, command_type: MessageType, params: dict) -> int:
         """
         Broadcast command to all connected slaves.
@@ -460,43 +721,134 @@ class MasterServer:
                 self._server.broadcast_command(command_type, params),
                 self._loop,
             )
-            return future.result(timeout=10)
+            return future.result(timeout=COMMAND_TIMEOUT)
         except Exception as e:
             self.logger.error(f"Error broadcasting command: {e}")
             return 0
 
+    def send_command_many(
+        self, slave_ids: list[str], command_type: MessageType, params: dict
+    ) -> int:
+        """
+        Send command to several slaves in a single hop to the event loop.
+
+        Args:
+            slave_ids: Target slave IDs
+            command_type: Command type (MessageType enum)
+            params: Command parameters
+
+        Returns:
+            Number of slaves that received the command
+        """
+        if not self._running or not self._loop:
+            return 0
+
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                self._server.send_command_many(slave_ids, command_type, params),
+                self._loop,
+            )
+            return future.result(timeout=COMMAND_TIMEOUT)
+        except Exception as e:
+            self.logger.error(f"Error sending command: {e}")
+            return 0
+
+    def send_command_many_async(
+        self,
+        slave_ids: list[str] | None,
+        command_type: MessageType,
+        params: dict,
+        on_done: Callable[[int], None] | None = None,
+    ) -> bool:
+        """
+        Queue a command for several slaves without blocking the calling thread.
+
+        Args:
+            slave_ids: Target slave IDs (None = all slaves)
+            command_type: Command type (MessageType enum)
+            params: Command parameters
+            on_done: Called on the GUI thread with the number of slaves that
+                received the command
+
+        Returns:
+            True if the command was queued
+        """
+        if not self._running or not self._loop:
+            return False
+
+        if slave_ids:
+            coro = self._server.send_command_many(slave_ids, command_type, params)
+        else:
+            coro = self._server.broadcast_command(command_type, params)
+        return self._submit(coro, on_done, 0)
+
+    def _distribute(
+        self,
+        slave_ids: list[str] | None,
+        command_type: MessageType,
+        params: dict,
+        sent_message: str | None,
+        broadcast_message: str | None,
+        on_done: Callable[[int], None] | None,
+    ) -> int | None:
+        """
+        Send a task command to the given slaves (or all) and log the count.
+
+        Blocks for the count unless on_done is given, in which case the
+        command is queued and the count is logged and passed to on_done.
+        """
+        message = sent_message if slave_ids else broadcast_message
+
+        if on_done is None:
+            if slave_ids:
+                count = self.send_command_many(slave_ids, command_type, params)
+            else:
+                count = self.broadcast_command(command_type, params)
+            if message:
+                self._log(message.format(count))
+            return count
+
+        def report(count: int) -> None:
+            if message:
+                self._log(message.format(count))
+            on_done(count)
+
+        if not self.send_command_many_async(slave_ids, command_type, params, report):
+            report(0)
+        return None
+
     # ==================== Task Distribution ====================
 
     def start_scrape_on_slaves(
         self,
         slave_ids: list[str] | None = None,
         sources: list[str] | None = None,
-    ) -> int:
+        on_done: Callable[[int], None] | None = None,
+    ) -> int | None:
         """
         Start proxy scraping on specified slaves.
 
         Args:
             slave_ids: List of slave IDs (None = all slaves)
             sources: List of source URLs (None = use default sources)
+            on_done: Send without blocking and call this on the GUI thread
+                with the number of slaves that received the command
 
         Returns:
-            Number of slaves that received the command
+            Number of slaves that received the command (None with on_done)
         """
         params = {}
         if sources:
             params["sources"] = sources
 
-        if slave_ids:
-            count = 0
-            for slave_id in slave_ids:
-                if self.send_command(slave_id, MessageType.START_SCRAPE, params):
-                    count += 1
-            self._log(f"Started scrape on {count} slaves")
-            return count
-        else:
-            count = self.broadcast_command(MessageType.START_SCRAPE, params)
-            self._log(f"Broadcast scrape to {count} slaves")
-            return count
+        return self._distribute(
+            slave_ids,
+            MessageType.START_SCRAPE,
+            params,
+            "Started scrape on {} slaves",
+            "Broadcast scrape to {} slaves",
+            on_done,
+        )
 
     def start_check_on_slaves(
         self,
@@ -504,7 +856,8 @@ class MasterServer:
         proxies: list[str] | None = None,
         threads: int = 100,
         timeout: int = 5000,
-    ) -> int:
+        on_done: Callable[[int], None] | None = None,
+    ) -> int | None:
         """
         Start proxy checking on specified slaves.
 
@@ -513,9 +866,11 @@ class MasterServer:
             proxies: List of proxy strings (None = use scraped proxies)
             threads: Number of concurrent threads
             timeout: Check timeout in milliseconds
+            on_done: Send without blocking and call this on the GUI thread
+                with the number of slaves that received the command
 
         Returns:
-            Number of slaves that received the command
+            Number of slaves that received the command (None with on_done)
         """
         params = {
             "threads": threads,
@@ -524,17 +879,14 @@ class MasterServer:
         if proxies:
             params["proxies"] = proxies
 
-        if slave_ids:
-            count = 0
-            for slave_id in slave_ids:
-                if self.send_command(slave_id, MessageType.START_CHECK, params):
-                    count += 1
-            self._log(f"Started check on {count} slaves")
-            return count
-        else:
-            count = self.broadcast_command(MessageType.START_CHECK, params)
-            self._log(f"Broadcast check to {count} slaves")
-            return count
+        return self._distribute(
+            slave_ids,
+            MessageType.START_CHECK,
+            params,
+            "Started check on {} slaves",
+            "Broadcast check to {} slaves",
+            on_done,
+        )
 
     def start_traffic_on_slaves(
         self,
@@ -544,7 +896,8 @@ class MasterServer:
         duration: int = 0,
         min_view_time: int = 5,
         max_view_time: int = 30,
-    ) -> int:
+        on_done: Callable[[int], None] | None = None,
+    ) -> int | None:
         """
         Start traffic generation on specified slaves.
 
@@ -555,9 +908,11 @@ class MasterServer:
             duration: Duration in seconds (0 = infinite)
             min_view_time: Minimum view time per request
             max_view_time: Maximum view time per request
+            on_done: Send without blocking and call this on the GUI thread
+                with the number of slaves that received the command
 
         Returns:
-            Number of slaves that received the command
+            Number of slaves that received the command (None with on_done)
         """
         params = {
             "target_url": target_url,
@@ -567,39 +922,39 @@ class MasterServer:
             "max_view_time": max_view_time,
         }
 
-        if slave_ids:
-            count = 0
-            for slave_id in slave_ids:
-                if self.send_command(slave_id, MessageType.START_TRAFFIC, params):
-                    count += 1
-            self._log(f"Started traffic on {count} slaves")
-            return count
-        else:
-            count = self.broadcast_command(MessageType.START_TRAFFIC, params)
-            self._log(f"Broadcast traffic to {count} slaves")
-            return count
+        return self._distribute(
+            slave_ids,
+            MessageType.START_TRAFFIC,
+            params,
+            "Started traffic on {} slaves",
+            "Broadcast traffic to {} slaves",
+            on_done,
+        )
 
-    def stop_slaves(self, slave_ids: list[str] | None = None) -> int:
+    def stop_slaves(
+        self,
+        slave_ids: list[str] | None = None,
+        on_done: Callable[[int], None] | None = None,
+    ) -> int | None:
         """
         Stop current operation on specified slaves.
 
         Args:
             slave_ids: List of slave IDs (None = all slaves)
+            on_done: Send without blocking and call this on the GUI thread
+                with the number of slaves that received the command
 
         Returns:
-            Number of slaves that received the command
+            Number of slaves that received the command (None with on_done)
         """
-        if slave_ids:
-            count = 0
-            for slave_id in slave_ids:
-                if self.send_command(slave_id, MessageType.STOP, {}):
-                    count += 1
-            self._log(f"Stopped {count} slaves")
-            return count
-        else:
-            count = self.broadcast_command(MessageType.STOP, {})
-            self._log(f"Broadcast stop to {count} slaves")
-            return count
+        return self._distribute(
+            slave_ids,
+            MessageType.STOP,
+            {},
+            "Stopped {} slaves",
+            "Broadcast stop to {} slaves",
+            on_done,
+        )
 
     def start_scan_on_slaves(
         self,
@@ -613,7 +968,8 @@ class MasterServer:
         test_credentials: bool = False,
         usernames: list[str] | None = None,
         passwords: list[str] | None = None,
-    ) -> int:
+        on_done: Callable[[int], None] | None = None,
+    ) -> int | None:
         """
         Start network scanning on specified slaves.
 
@@ -628,9 +984,11 @@ class MasterServer:
             test_credentials: Whether to test SSH credentials
             usernames: SSH usernames to test
             passwords: SSH passwords to test
+            on_done: Send without blocking and call this on the GUI thread
+                with the number of slaves that received the command
 
         Returns:
-            Number of slaves that received the command
+            Number of slaves that received the command (None with on_done)
         """
         params = {
             "targets": targets,
@@ -644,47 +1002,52 @@ class MasterServer:
             "passwords": passwords or [],
         }
 
-        if slave_ids:
-            count = 0
-            for slave_id in slave_ids:
-                if self.send_command(slave_id, MessageType.START_SCAN, params):
-                    count += 1
-            self._log(f"Started scan on {count} slaves")
-            return count
-        else:
-            count = self.broadcast_command(MessageType.START_SCAN, params)
-            self._log(f"Broadcast scan to {count} slaves")
-            return count
+        return self._distribute(
+            slave_ids,
+            MessageType.START_SCAN,
+            params,
+            "Started scan on {} slaves",
+            "Broadcast scan to {} slaves",
+            on_done,
+        )
 
-    def request_status(self, slave_ids: list[str] | None = None) -> int:
+    def request_status(
+        self,
+        slave_ids: list[str] | None = None,
+        on_done: Callable[[int], None] | None = None,
+    ) -> int | None:
         """
         Request status update from specified slaves.
 
         Args:
             slave_ids: List of slave IDs (None = all slaves)
+            on_done: Send without blocking and call this on the GUI thread
+                with the number of slaves that received the command
 
         Returns:
-            Number of slaves that received the command
+            Number of slaves that received the command (None with on_done)
         """
-        if slave_ids:
-            count = 0
-            for slave_id in slave_ids:
-                if self.send_command(slave_id, MessageType.GET_STATUS, {}):
-                    count += 1
-            return count
-        else:
-            return self.broadcast_command(MessageType.GET_STATUS, {})
+        return self._distribute(
+            slave_ids, MessageType.GET_STATUS, {}, None, None, on_done
+        )
 
     # ==================== Slave Management ====================
 
-    def get_slaves(self) -> list[SlaveStats]:
+    def get_slaves(self) -> tuple[SlaveStats, ...]:
         """
-        Get list of connected slaves with their stats.
+        Get snapshot of connected slaves with their stats.
 
         Returns:
-            List of SlaveStats objects
+            Tuple of SlaveStats objects
         """
-        return list(self._slave_stats.values())
+        snapshot = self._slaves_snapshot
+        if snapshot is None:
+            with self._stats_lock:
+                snapshot = self._slaves_snapshot
+                if snapshot is None:
+                    snapshot = tuple(self._slave_stats.values())
+                    self._slaves_snapshot = snapshot
+        return snapshot
 
     def get_slave(self, slave_id: str) -> SlaveStats | None:
         """
@@ -730,38 +1093,39 @@ class MasterServer:
         Returns:
             AggregatedStats object with totals
         """
-        stats = AggregatedStats()
-        slaves = list(self._slave_stats.values())
-
-        if not slaves:
-            return stats
-
-        stats.active_slaves = len(slaves)
-
-        for slave in slaves:
-            stats.total_requests += slave.requests
-            stats.total_success += slave.success
-            stats.total_failed += slave.failed
-            stats.total_proxies_found += slave.proxies_found
-            stats.total_proxies_checked += slave.proxies_checked
-            stats.total_proxies_alive += slave.proxies_alive
-            stats.avg_cpu += slave.cpu_percent
-            stats.avg_memory += slave.memory_percent
-
-        if stats.active_slaves > 0:
-            stats.avg_cpu /= stats.active_slaves
-            stats.avg_memory /= stats.active_slaves
-
-        return stats
+        with self._stats_lock:
+            totals = self._totals
+            active = len(self._slave_stats)
+            if not active:
+                return AggregatedStats()
+
+            return AggregatedStats(
+                active_slaves=active,
+                total_requests=totals.total_requests,
+                total_success=totals.total_success,
+                total_failed=totals.total_failed,
+                total_proxies_found=totals.total_proxies_found,
+                total_proxies_checked=totals.total_proxies_checked,
+                total_proxies_alive=totals.total_proxies_alive,
+                avg_cpu=totals.avg_cpu / active,
+                avg_memory=totals.avg_memory / active,
+            )
 
-    def get_scan_results(self) -> list[ScanResultEntry]:
+    def get_scan_results(
+        self, limit: int | None = None
+    ) -> tuple[ScanResultEntry, ...]:
         """
-        Get all collected scan results.
+        Get snapshot of collected scan results, oldest first.
+
+        Args:
+            limit: Only return the newest N results (None = all kept results)
 
         Returns:
-            List of ScanResultEntry objects
+            Tuple of ScanResultEntry objects
         """
-        return list(self._scan_results)
+        if limit is None:
+            return tuple(self._scan_results)
+        return tuple(islice(reversed(self._scan_results), limit))[::-1]
 
     def clear_scan_results(self) -> None:
         """Clear all collected scan results."""
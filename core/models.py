@@ -1,16 +1,20 @@
 import time
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 
 
-class EngineMode(Enum):
+# Option enums mix in str so members hash in C (str.__hash__) rather than
+# through the Python-level Enum.__hash__; they are used heavily as dict keys.
+# (StrEnum would be the 3.11+ spelling; requires-python is 3.10.)
+class EngineMode(str, Enum):
     """Traffic engine mode selection."""
 
     CURL = "curl"  # Fast, curl_cffi-based
     BROWSER = "browser"  # Realistic, Playwright-based
 
 
-class CaptchaProvider(Enum):
+class CaptchaProvider(str, Enum):
     """Supported captcha solving providers."""
 
     NONE = "none"
@@ -19,7 +23,7 @@ class CaptchaProvider(Enum):
     AUTO = "auto"  # Automatically select based on availability
 
 
-class CaptchaType(Enum):
+class CaptchaType(str, Enum):
     """Types of captchas that can be solved."""
 
     TURNSTILE = "turnstile"  # Cloudflare Turnstile
@@ -28,7 +32,7 @@ class CaptchaType(Enum):
     HCAPTCHA = "hcaptcha"  # hCaptcha
 
 
-class BrowserSelection(Enum):
+class BrowserSelection(str, Enum):
     """Browser selection options."""
 
     AUTO = "auto"  # Auto-detect best available
@@ -40,6 +44,18 @@ class BrowserSelection(Enum):
     OTHER = "other"  # Custom path
 
 
+# BrowserConfig field holding the executable path for each selection
+# (AUTO has none and falls through to auto-detection)
+_BROWSER_PATH_ATTR: dict[BrowserSelection, str] = {
+    BrowserSelection.CHROME: "chrome_path",
+    BrowserSelection.CHROMIUM: "chromium_path",
+    BrowserSelection.EDGE: "edge_path",
+    BrowserSelection.BRAVE: "brave_path",
+    BrowserSelection.FIREFOX: "firefox_path",
+    BrowserSelection.OTHER: "other_path",
+}
+
+
 @dataclass
 class ProxyConfig:
     host: str
@@ -49,6 +65,8 @@ class ProxyConfig:
     protocol: str = "http"  # http, socks5
     score: float = 0.0
     source: str = ""
+    # Requests currently holding this proxy (fast engine pool bookkeeping)
+    in_use: int = field(default=0, compare=False, repr=False)
 
     def to_curl_cffi_format(self) -> str:
         """Returns proxy string formatted for curl_cffi."""
@@ -59,8 +77,14 @@ class ProxyConfig:
         )
         return f"{self.protocol}://{auth}{self.host}:{self.port}"
 
+    @cached_property
+    def proxies_dict(self) -> dict[str, str]:
+        """curl_cffi ``proxies`` mapping, built once per proxy (treat as read-only)."""
+        url = self.to_curl_cffi_format()
+        return {"http": url, "https": url}
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class BrowserConfig:
     """Configuration for browser-based traffic generation."""
 
@@ -87,23 +111,12 @@ class BrowserConfig:
 
     def get_executable_path(self) -> str | None:
         """Get the executable path based on selection."""
-        if self.selected_browser == BrowserSelection.CHROME and self.chrome_path:
-            return self.chrome_path
-        elif self.selected_browser == BrowserSelection.CHROMIUM and self.chromium_path:
-            return self.chromium_path
-        elif self.selected_browser == BrowserSelection.EDGE and self.edge_path:
-            return self.edge_path
-        elif self.selected_browser == BrowserSelection.BRAVE and self.brave_path:
-            return self.brave_path
-        elif self.selected_browser == BrowserSelection.FIREFOX and self.firefox_path:
-            return self.firefox_path
-        elif self.selected_browser == BrowserSelection.OTHER and self.other_path:
-            return self.other_path
+        attr = _BROWSER_PATH_ATTR.get(self.selected_browser)
         # AUTO or no path set - return None for auto-detection
-        return None
+        return (getattr(self, attr) if attr else "") or None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CaptchaConfig:
     """Configuration for captcha solving services with multi-provider support."""
 
@@ -114,6 +127,9 @@ class CaptchaConfig:
     primary_provider: CaptchaProvider = CaptchaProvider.AUTO
     fallback_enabled: bool = True  # Try other provider if primary fails
     timeout_seconds: int = 120  # Max wait for solution
+    # Reuse a solved token for the same site/page until it expires. Off by
+    # default: most sites verify tokens as single-use.
+    reuse_tokens: bool = False
 
     def get_available_providers(self) -> list:
         """Return list of providers that have API keys configured."""
@@ -129,7 +145,7 @@ class CaptchaConfig:
         return bool(self.twocaptcha_key or self.anticaptcha_key)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProtectionBypassConfig:
     """Settings for bypassing bot protection systems."""
 
@@ -139,7 +155,7 @@ class ProtectionBypassConfig:
     auto_solve_captcha: bool = True  # Auto-trigger solver on detection
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TrafficConfig:
     """Configuration for traffic generation."""
 
@@ -162,7 +178,7 @@ class TrafficConfig:
     burst_sleep_max: float = 5.0  # Max sleep between bursts (seconds)
 
 
-@dataclass
+@dataclass(slots=True)
 class TrafficStats:
     """Traffic generation statistics with browser and captcha tracking."""
 
@@ -196,7 +212,7 @@ class TrafficStats:
     last_protection_event: str = ""  # e.g., "Cloudflare bypassed", "Solving captcha..."
 
 
-@dataclass
+@dataclass(slots=True)
 class ProxyCheckResult:
     proxy: ProxyConfig
     status: str  # "Active" or "Dead"
@@ -210,7 +226,7 @@ class ProxyCheckResult:
     bytes_transferred: int = 0  # Total bytes (request + response + TLS overhead)
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionData:
     domain: str
     cookies: list[dict]
@@ -218,7 +234,7 @@ class SessionData:
     created: float
 
 
-@dataclass
+@dataclass(slots=True)
 class SourceHealth:
     url: str
     total_scraped: int = 0
@@ -57,6 +57,7 @@ class SettingsKeys:
     CAPTCHA_ANTICAPTCHA_KEY = "captcha_anticaptcha_key"
     CAPTCHA_FALLBACK_ENABLED = "captcha_fallback_enabled"
     CAPTCHA_TIMEOUT = "captcha_timeout"
+    CAPTCHA_REUSE_TOKENS = "captcha_reuse_tokens"
     CLOUDFLARE_BYPASS = "cloudflare_bypass"
     AKAMAI_BYPASS = "akamai_bypass"
     AUTO_SOLVE_CAPTCHA = "auto_solve_captcha"
@@ -133,6 +134,7 @@ class Defaults:
     CAPTCHA_ANTICAPTCHA_KEY: str = ""
     CAPTCHA_FALLBACK_ENABLED: bool = True
     CAPTCHA_TIMEOUT: int = 120
+    CAPTCHA_REUSE_TOKENS: bool = False
     CLOUDFLARE_BYPASS: bool = True
     AKAMAI_BYPASS: bool = True
     AUTO_SOLVE_CAPTCHA: bool = False
@@ -65,7 +65,8 @@ class SlaveConnection:
     authenticated: bool = False
     session_token: Optional[str] = None
     connected_at: float = field(default_factory=time.time)
-    last_heartbeat: float = field(default_factory=time.time)
+    # Monotonic clock: only compared against other monotonic readings
+    last_heartbeat: float = field(default_factory=time.monotonic)
     ip_address: str = ""
     slave_name: str = ""
 
@@ -328,7 +329,7 @@ class WebSocketServer:
 
             # Handle heartbeat
             if msg_type == MessageType.HEARTBEAT.value:
-                slave.last_heartbeat = time.time()
+                slave.last_heartbeat = time.monotonic()
                 await self._send_message(
                     slave.websocket,
                     MessageType.HEARTBEAT_ACK,
@@ -337,13 +338,14 @@ class WebSocketServer:
                 )
                 return
 
-            # Route message to callback
+            # Route message to callback (errors it raises are logged below)
             if self.on_message:
                 try:
                     message_type = MessageType(msg_type)
-                    self.on_message(slave.slave_id, message_type, payload)
                 except ValueError:
                     self.logger.warning(f"Unknown message type: {msg_type}")
+                    return
+                self.on_message(slave.slave_id, message_type, payload)
 
         except json.JSONDecodeError as e:
             self.logger.error(f"Invalid JSON from {slave.slave_id}: {e}")
@@ -407,11 +409,22 @@ class WebSocketServer:
         Returns:
             Number of slaves that received the command
         """
-        count = 0
-        for slave_id in list(self.slaves.keys()):
-            if await self.send_command(slave_id, command_type, params):
-                count += 1
-        return count
+        return await self.send_command_many(list(self.slaves), command_type, params)
+
+    async def send_command_many(
+        self, slave_ids: list[str], command_type: MessageType, params: dict
+    ) -> int:
+        """
+        Send command to several slaves concurrently.
+
+        Returns:
+            Number of slaves that received the command
+        """
+        results = await asyncio.gather(
+            *(self.send_command(sid, command_type, params) for sid in slave_ids),
+            return_exceptions=True,
+        )
+        return sum(1 for result in results if result is True)
 
     async def _heartbeat_monitor(self):
         """Monitor slave heartbeats and disconnect timed-out slaves."""
@@ -421,7 +434,7 @@ class WebSocketServer:
             try:
                 await asyncio.sleep(self.heartbeat_interval)
 
-                current_time = time.time()
+                current_time = time.monotonic()
                 timed_out = []
 
                 for slave_id, slave in self.slaves.items():
@@ -469,14 +482,22 @@ class WebSocketServer:
             self.on_slave_disconnected(slave_id)
 
     def get_connected_slaves(self) -> list[dict]:
-        """Get list of connected slaves with their info."""
+        """
+        Get list of connected slaves with their info.
+
+        connected_at and last_heartbeat are both wall-clock (time.time())
+        timestamps; last_heartbeat is converted from the monotonic reading
+        used internally for timeouts.
+        """
+        # Wall-clock time corresponding to a monotonic reading of 0
+        wall_offset = time.time() - time.monotonic()
         return [
             {
                 "slave_id": slave.slave_id,
                 "slave_name": slave.slave_name,
                 "ip_address": slave.ip_address,
                 "connected_at": slave.connected_at,
-                "last_heartbeat": slave.last_heartbeat,
+                "last_heartbeat": wall_offset + slave.last_heartbeat,
                 "authenticated": slave.authenticated,
             }
             for slave in self.slaves.values()
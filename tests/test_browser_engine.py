@@ -3,6 +3,8 @@ Unit tests for the browser engine module (core/browser_engine.py).
 Covers stealth script generation, proxy filtering logic, and protection detection.
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -192,6 +194,17 @@ class TestProtectionDetection:
         
         assert prot_type == "cloudflare"
 
+    @pytest.mark.asyncio
+    async def test_detect_cloudflare_title_plus_marker(self):
+        """Test that one weak marker plus a challenge title (any case) is Cloudflare."""
+        self.mock_page.content.return_value = "<html><body>Ray ID: 123</body></html>"
+        self.mock_page.title.return_value = "JUST A MOMENT..."
+        self.engine._extract_turnstile_key = AsyncMock(return_value=None)
+
+        prot_type, _site_key = await self.engine._detect_protection(self.mock_page)
+
+        assert prot_type == "cloudflare"
+
     @pytest.mark.asyncio
     async def test_detect_cloudflare_multiple_markers(self):
         """Test Cloudflare detection via multiple weak markers."""
@@ -275,3 +288,298 @@ class TestProtectionDetection:
         
         assert prot_type == "cloudflare"
         assert site_key == "0x4AAAAAAAAAI"
+
+    @pytest.mark.asyncio
+    async def test_clean_response_skips_dom_serialization(self):
+        """Test that a marker-free response body never renders page content."""
+        mock_response = AsyncMock()
+        mock_response.body.return_value = b"<html><body>Plain page</body></html>"
+
+        prot_type, site_key = await self.engine._detect_protection(
+            self.mock_page, mock_response
+        )
+
+        assert prot_type is None
+        assert site_key is None
+        self.mock_page.content.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_detect_cloudflare_from_response_body(self):
+        """Test Cloudflare detection from raw response bytes."""
+        mock_response = AsyncMock()
+        mock_response.body.return_value = b"<html>... challenge-platform ...</html>"
+        self.engine._extract_turnstile_key = AsyncMock(return_value=None)
+
+        prot_type, _ = await self.engine._detect_protection(
+            self.mock_page, mock_response
+        )
+
+        assert prot_type == "cloudflare"
+        self.mock_page.content.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_markers_past_scan_window_ignored(self):
+        """Test that markers beyond the head scan window are not matched."""
+        from core.browser_engine import PROTECTION_SCAN_BYTES
+
+        mock_response = AsyncMock()
+        mock_response.body.return_value = (
+            b"<html>" + b" " * PROTECTION_SCAN_BYTES + b"challenge-platform</html>"
+        )
+
+        prot_type, _ = await self.engine._detect_protection(
+            self.mock_page, mock_response
+        )
+
+        assert prot_type is None
+
+
+# =============================================================================
+# Shared Playwright Driver Tests
+# =============================================================================
+
+class TestSharedPlaywright:
+    """Tests for the per-loop shared Playwright driver."""
+
+    @pytest.mark.asyncio
+    async def test_driver_shared_and_refcounted(self):
+        """Test that engines share one driver and the last release stops it."""
+        from core import browser_engine
+
+        mock_pw = AsyncMock()
+        starter = MagicMock()
+        starter.return_value.start = AsyncMock(return_value=mock_pw)
+
+        with patch("core.browser_engine.async_playwright", starter):
+            first = await browser_engine._acquire_playwright()
+            second = await browser_engine._acquire_playwright()
+
+            assert first is second
+            assert starter.return_value.start.await_count == 1
+
+            await browser_engine._release_playwright()
+            mock_pw.stop.assert_not_awaited()
+
+            await browser_engine._release_playwright()
+            mock_pw.stop.assert_awaited_once()
+
+
+# =============================================================================
+# Context Pool Tests
+# =============================================================================
+
+class TestContextPool:
+    """Tests for the proxy-keyed browser context pool."""
+
+    def setup_method(self):
+        """Setup mock engine with two proxied contexts."""
+        self.mock_config = MagicMock()
+        self.mock_config.browser.get_executable_path.return_value = None
+        self.mock_config.browser.max_contexts = 2
+        self.mock_config.target_url = "https://example.com"
+
+        self.proxy_a = build_proxy_config(host="1.1.1.1", port=1080, protocol="socks5")
+        self.proxy_b = build_proxy_config(host="2.2.2.2", port=1080, protocol="socks5")
+
+        with patch("core.browser_engine.playwright_available", True):
+            self.engine = PlaywrightTrafficEngine(
+                self.mock_config, [self.proxy_a, self.proxy_b]
+            )
+
+        self.ctx_a = AsyncMock()
+        self.ctx_b = AsyncMock()
+        self.engine._contexts = {
+            ("1.1.1.1", 1080): (self.ctx_a, self.proxy_a, {"request_count": 0}),
+            ("2.2.2.2", 1080): (self.ctx_b, self.proxy_b, {"request_count": 0}),
+        }
+
+    @pytest.mark.asyncio
+    async def test_mark_proxy_dead_removes_only_its_context(self):
+        """Test that a dead proxy closes and drops only its own context."""
+        await self.engine._mark_proxy_dead(self.proxy_a, self.ctx_a)
+
+        self.ctx_a.close.assert_awaited_once()
+        self.ctx_b.close.assert_not_awaited()
+        assert ("1.1.1.1", 1080) not in self.engine._contexts
+        assert ("2.2.2.2", 1080) in self.engine._contexts
+        assert self.proxy_a not in self.engine.proxies
+
+    @pytest.mark.asyncio
+    async def test_dead_proxy_recycled_with_spare(self):
+        """Test that a dead proxy's context is replaced using a spare proxy."""
+        from collections import deque
+
+        spare = build_proxy_config(host="3.3.3.3", port=1080, protocol="socks5")
+        self.engine.proxies.append(spare)
+        self.engine._spare_proxies = deque([spare])
+        self.engine._browser = MagicMock()
+        self.engine._create_context = AsyncMock(
+            return_value=(AsyncMock(), {"request_count": 0})
+        )
+
+        await self.engine._mark_proxy_dead(self.proxy_a, self.ctx_a)
+
+        assert ("3.3.3.3", 1080) in self.engine._contexts
+        assert not self.engine._spare_proxies
+
+    @pytest.mark.asyncio
+    async def test_run_dispatches_until_visit_limit(self):
+        """Test that context workers keep visiting until the visit limit."""
+        self.mock_config.total_visits = 5
+        self.mock_config.browser.fingerprint_rotation_enabled = False
+        self.mock_config.captcha.has_any_provider.return_value = False
+        self.engine._contexts = {}
+
+        async def fake_create_context(proxy=None):
+            return AsyncMock(), {"created_at": 0, "request_count": 0, "profile_name": "x"}
+
+        used = []
+
+        async def fake_make_request(context, proxy=None):
+            self.engine.stats.total_requests += 1
+            used.append(proxy)
+            await asyncio.sleep(0)
+
+        self.engine._launch_browser = AsyncMock()
+        self.engine._create_context = fake_create_context
+        self.engine._make_request = fake_make_request
+
+        await asyncio.wait_for(self.engine.run(), timeout=5)
+
+        assert self.engine.stats.total_requests == 5
+        assert {p.host for p in used} == {"1.1.1.1", "2.2.2.2"}
+        assert self.engine._contexts == {}
+
+    @pytest.mark.asyncio
+    async def test_stop_from_other_thread_wakes_run(self):
+        """Test that stop() from another thread ends run() without polling."""
+        import threading
+
+        self.mock_config.total_visits = 0
+        self.mock_config.browser.fingerprint_rotation_enabled = False
+        self.mock_config.captcha.has_any_provider.return_value = False
+        self.engine._contexts = {}
+
+        async def fake_create_context(proxy=None):
+            return AsyncMock(), {"created_at": 0, "request_count": 0, "profile_name": "x"}
+
+        async def fake_make_request(context, proxy=None):
+            self.engine.stats.total_requests += 1
+            await asyncio.sleep(0.01)
+
+        self.engine._launch_browser = AsyncMock()
+        self.engine._create_context = fake_create_context
+        self.engine._make_request = fake_make_request
+
+        threading.Timer(0.1, self.engine.stop).start()
+        await asyncio.wait_for(self.engine.run(), timeout=2)
+
+        assert not self.engine.running
+        assert self.engine.stats.total_requests > 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_run_still_cleans_up(self):
+        """Test that cancelling run() still releases browser resources."""
+        self.mock_config.total_visits = 0
+        self.mock_config.browser.fingerprint_rotation_enabled = False
+        self.mock_config.captcha.has_any_provider.return_value = False
+        self.engine._contexts = {}
+
+        async def fake_create_context(proxy=None):
+            return AsyncMock(), {"created_at": 0, "request_count": 0, "profile_name": "x"}
+
+        async def fake_make_request(context, proxy=None):
+            await asyncio.sleep(0.01)
+
+        self.engine._launch_browser = AsyncMock()
+        self.engine._create_context = fake_create_context
+        self.engine._make_request = fake_make_request
+        self.engine._cleanup = AsyncMock()
+
+        run_task = asyncio.create_task(self.engine.run())
+        await asyncio.sleep(0.05)
+        run_task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await run_task
+        self.engine._cleanup.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_workers_finish_before_cleanup(self):
+        """Test that run() waits for cancelled workers before closing contexts."""
+        self.mock_config.total_visits = 0
+        self.mock_config.browser.fingerprint_rotation_enabled = False
+        self.mock_config.captcha.has_any_provider.return_value = False
+        self.engine._contexts = {}
+        in_flight = 0
+
+        async def fake_create_context(proxy=None):
+            return AsyncMock(), {"created_at": 0, "request_count": 0, "profile_name": "x"}
+
+        async def fake_make_request(context, proxy=None):
+            nonlocal in_flight
+            in_flight += 1
+            try:
+                await asyncio.sleep(60)
+            finally:
+                await asyncio.sleep(0)  # Unwinding still touches the context
+                in_flight -= 1
+
+        in_flight_at_cleanup = []
+
+        async def fake_cleanup():
+            in_flight_at_cleanup.append(in_flight)
+
+        self.engine._launch_browser = AsyncMock()
+        self.engine._create_context = fake_create_context
+        self.engine._make_request = fake_make_request
+        self.engine._cleanup = fake_cleanup
+
+        run_task = asyncio.create_task(self.engine.run())
+        await asyncio.sleep(0.05)
+        run_task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await run_task
+        assert in_flight_at_cleanup == [0]
+
+    @pytest.mark.asyncio
+    async def test_readded_context_in_use_is_not_queued_twice(self):
+        """Test that a context re-added while checked out is queued only once."""
+        self.engine._ctx_queue = asyncio.Queue()
+        self.engine._create_context = AsyncMock(
+            return_value=(AsyncMock(), {"created_at": 0, "request_count": 0})
+        )
+        key = ("1.1.1.1", 1080)
+        self.engine._contexts.pop(key)
+        self.engine._checked_out.add(key)
+
+        await self.engine._add_context(self.proxy_a)
+
+        assert key in self.engine._contexts
+        assert self.engine._ctx_queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_async_context_manager_inits_and_cleans_up(self):
+        """Test that "async with" builds the pool and releases it on exit."""
+        self.mock_config.captcha.has_any_provider.return_value = False
+        self.engine._contexts = {}
+
+        async def fake_launch():
+            self.engine._browser = MagicMock()
+
+        async def fake_create_context(proxy=None):
+            return AsyncMock(), {"created_at": 0, "request_count": 0, "profile_name": "x"}
+
+        self.engine._launch_browser = fake_launch
+        self.engine._create_context = fake_create_context
+        self.engine._cleanup = AsyncMock()
+
+        async with self.engine as engine:
+            assert engine is self.engine
+            assert engine.running is True
+            assert len(engine._contexts) == 2
+            self.engine._cleanup.assert_not_awaited()
+
+        assert self.engine.running is False
+        self.engine._cleanup.assert_awaited_once()
@@ -5,6 +5,17 @@ from core.browser_manager import BrowserManager, BrowserInfo
 
 class TestBrowserManager:
 
+    @pytest.fixture(autouse=True)
+    def isolated_disk_cache(self, tmp_path):
+        """Keep the persisted browser cache out of the real resources dir."""
+        with patch.object(BrowserManager, "_DISK_CACHE_PATH", tmp_path / "browsers.json"):
+            BrowserManager.refresh()
+            yield
+
+    def setup_method(self):
+        """Start every test with empty detection caches."""
+        BrowserManager.refresh()
+
     def test_get_browser_type_from_path(self):
         """Test detection of browser type from path."""
         assert BrowserManager.get_browser_type_from_path("C:/Program Files/Google/Chrome/Application/chrome.exe") == "chromium"
@@ -58,6 +69,58 @@ class TestBrowserManager:
         info = BrowserManager.get_browser_info_from_path(r"C:\Program Files\Microsoft\Edge\Application\msedge.exe")
         assert info.name == "Edge"
 
+    @patch("os.path.isfile")
+    def test_get_browser_info_name_rules(self, mock_isfile):
+        """Test browser name disambiguation across path shapes."""
+        mock_isfile.return_value = True
+        cases = {
+            "C:/Chromium/Application/chrome.exe": "Chromium",
+            "C:/Apps/ungoogled-chromium-win/bin/x/chrome.exe": "Chromium",
+            "C:/Users/u/AppData/Local/ms-playwright/c-1097/chrome-win/chrome.exe": "Chromium",
+            "C:/Program Files/Google/Chrome/Application/chrome.exe": "Chrome",
+            "C:/Tools/chrome.exe": "Chrome",
+            "C:/Edge/msedge.exe": "Edge",
+            "C:/BraveSoftware/brave.exe": "Brave",
+            "C:/Mozilla Firefox/firefox.exe": "Firefox",
+            "C:/Other/opera.exe": "Unknown",
+        }
+
+        for path, expected in cases.items():
+            info = BrowserManager.get_browser_info_from_path(path, fetch_version=False)
+            assert info.name == expected, path
+
+    @patch("os.path.isfile")
+    @patch("core.browser_manager.BrowserManager._get_browser_version")
+    def test_get_browser_info_from_path_cached(self, mock_version, mock_isfile):
+        """Test that repeated lookups for a path reuse the cached BrowserInfo."""
+        mock_isfile.return_value = True
+        mock_version.return_value = "121.0"
+        path = r"C:\Cached\Brave\brave.exe"
+
+        first = BrowserManager.get_browser_info_from_path(path)
+        second = BrowserManager.get_browser_info_from_path(path)
+
+        assert first is second
+        assert mock_version.call_count == 1
+
+        # Missing file is still reported even when the path is cached
+        mock_isfile.return_value = False
+        assert BrowserManager.get_browser_info_from_path(path) is None
+
+    @patch("os.path.isfile")
+    @patch("core.browser_manager.BrowserManager._get_browser_version")
+    def test_get_browser_info_without_version(self, mock_version, mock_isfile):
+        """Test that fetch_version=False never resolves the version."""
+        mock_isfile.return_value = True
+
+        info = BrowserManager.get_browser_info_from_path(
+            r"C:\Mozilla Firefox\firefox.exe", fetch_version=False
+        )
+
+        assert info.name == "Firefox"
+        assert info.version is None
+        mock_version.assert_not_called()
+
     @patch("os.path.isfile")
     @patch("core.browser_manager.BrowserManager._get_browser_version")
     def test_detect_browsers(self, mock_version, mock_isfile):
@@ -97,6 +160,151 @@ class TestBrowserManager:
         # If none found, we might need to be more aggressive with mocking or patch the PATH lists.
         pass # Actual assertions will be done by pytest
 
+    @patch("core.browser_manager.BrowserManager._list_dir_files")
+    @patch("core.browser_manager.BrowserManager._get_browser_version")
+    def test_detect_browsers_memoized(self, mock_version, mock_list_dir):
+        """Test that detection runs once until refresh() is called."""
+        mock_version.return_value = "1.0"
+        mock_list_dir.return_value = frozenset()
+
+        BrowserManager.detect_browsers()
+        calls_after_first_scan = mock_list_dir.call_count
+        assert calls_after_first_scan > 0
+
+        BrowserManager.detect_browsers()
+        assert mock_list_dir.call_count == calls_after_first_scan
+
+        BrowserManager.refresh()
+        BrowserManager.detect_browsers()
+        assert mock_list_dir.call_count > calls_after_first_scan
+
+    @patch("core.browser_manager.BrowserManager._get_browser_version")
+    def test_detect_browsers_reuses_disk_cache(self, mock_version, tmp_path):
+        """Test that a later run trusts the persisted result while paths exist."""
+        mock_version.return_value = "1.0"
+        exe = tmp_path / "chromium.exe"
+        exe.write_text("")
+
+        with patch.object(BrowserManager, "WINDOWS_CHROMIUM_PATHS", [str(exe)]):
+            first = BrowserManager.detect_browsers()
+        assert BrowserManager._DISK_CACHE_PATH.is_file()
+
+        # New process: memo empty, disk cache valid -> no directory scan
+        BrowserManager._detect_cache = None
+        with patch.object(BrowserManager, "_list_dir_files") as mock_list_dir:
+            second = BrowserManager.detect_browsers()
+        mock_list_dir.assert_not_called()
+        assert second == first
+
+        # A cached path vanished -> full rescan
+        BrowserManager._detect_cache = None
+        exe.unlink()
+        with patch.object(
+            BrowserManager, "_list_dir_files", return_value=frozenset()
+        ) as mock_list_dir:
+            assert BrowserManager.detect_browsers() == []
+        mock_list_dir.assert_called()
+
+    @patch("core.browser_manager.BrowserManager._get_browser_version")
+    def test_disk_cache_expires_and_tracks_updated_executables(
+        self, mock_version, tmp_path
+    ):
+        """Test that an old cache or a newer executable forces a rescan."""
+        mock_version.return_value = "1.0"
+        exe = tmp_path / "chromium.exe"
+        exe.write_text("")
+        with patch.object(BrowserManager, "WINDOWS_CHROMIUM_PATHS", [str(exe)]):
+            BrowserManager.detect_browsers()
+        cache = BrowserManager._DISK_CACHE_PATH
+        written = cache.stat().st_mtime
+        assert BrowserManager._load_disk_cache()
+
+        # Browser updated in place after the scan
+        os.utime(exe, (written + 60, written + 60))
+        assert BrowserManager._load_disk_cache() == []
+
+        # Cache older than the TTL
+        old = written - BrowserManager._DISK_CACHE_TTL - 1
+        os.utime(cache, (old, old))
+        os.utime(exe, (old, old))
+        assert BrowserManager._load_disk_cache() == []
+
+    def test_refresh_removes_disk_cache(self):
+        """Test that refresh() forces the next detection to rescan."""
+        BrowserManager._DISK_CACHE_PATH.write_text("{}")
+        BrowserManager.refresh()
+        assert not BrowserManager._DISK_CACHE_PATH.exists()
+
+    @patch("core.browser_manager.BrowserManager._get_browser_version")
+    def test_detect_browsers_lists_each_directory_once(self, mock_version, tmp_path):
+        """Test that candidates sharing a directory trigger a single listing."""
+        mock_version.return_value = None
+        (tmp_path / "chromium.exe").write_text("")
+        candidates = [str(tmp_path / "chrome.exe"), str(tmp_path / "chromium.exe")]
+
+        with patch.multiple(
+            BrowserManager,
+            WINDOWS_CHROME_PATHS=[],
+            WINDOWS_CHROMIUM_PATHS=candidates,
+            WINDOWS_EDGE_PATHS=[],
+            WINDOWS_BRAVE_PATHS=[],
+            WINDOWS_FIREFOX_PATHS=[],
+        ), patch("core.browser_manager.os.scandir", wraps=os.scandir) as scandir:
+            browsers = BrowserManager.detect_browsers()
+
+        assert scandir.call_count == 1
+        assert [b.path for b in browsers] == [candidates[1]]
+
+    @patch("core.browser_manager.BrowserManager._get_browser_version")
+    def test_detect_browsers_wildcard_path(self, mock_version, tmp_path):
+        """Test that wildcard entries resolve to the first matching file."""
+        mock_version.return_value = None
+        exe = tmp_path / "chromium-1097" / "chrome-win" / "chrome.exe"
+        exe.parent.mkdir(parents=True)
+        exe.write_text("")
+        pattern = str(tmp_path / "chromium-*" / "chrome-win" / "chrome.exe")
+
+        with patch.multiple(
+            BrowserManager,
+            WINDOWS_CHROME_PATHS=[],
+            WINDOWS_CHROMIUM_PATHS=[pattern],
+            WINDOWS_EDGE_PATHS=[],
+            WINDOWS_BRAVE_PATHS=[],
+            WINDOWS_FIREFOX_PATHS=[],
+        ):
+            browsers = BrowserManager.detect_browsers()
+
+        assert [b.name for b in browsers] == ["Chromium"]
+        assert browsers[0].path == str(exe)
+
+    def test_get_playwright_chromium_path_compares_revisions_numerically(
+        self, tmp_path
+    ):
+        """Test a 4-digit revision beats a 3-digit one (not string order)."""
+        for revision in ("999", "1000"):
+            exe = tmp_path / "ms-playwright" / f"chromium-{revision}" / "chrome-win" / "chrome.exe"
+            exe.parent.mkdir(parents=True)
+            exe.write_text("")
+
+        with patch.dict("core.browser_manager._ENV", {"LOCALAPPDATA": str(tmp_path)}):
+            path = BrowserManager.get_playwright_chromium_path()
+
+        assert path is not None
+        assert "chromium-1000" in path
+
+    def test_get_playwright_chromium_path_newest_revision(self, tmp_path):
+        """Test that the newest bundled Chromium revision is returned."""
+        for revision in ("1090", "1097"):
+            exe = tmp_path / "ms-playwright" / f"chromium-{revision}" / "chrome-win" / "chrome.exe"
+            exe.parent.mkdir(parents=True)
+            exe.write_text("")
+
+        with patch.dict("core.browser_manager._ENV", {"LOCALAPPDATA": str(tmp_path)}):
+            path = BrowserManager.get_playwright_chromium_path()
+
+        assert path is not None
+        assert "chromium-1097" in path
+
     @patch("subprocess.run")
     def test_get_browser_version_subprocess(self, mock_run):
         """Test getting version via subprocess."""
@@ -108,6 +316,18 @@ class TestBrowserManager:
         version = BrowserManager._get_browser_version("chrome.exe")
         assert version == "120.0.6099.130"
 
+    @patch("subprocess.run")
+    @patch("core.browser_manager.BrowserManager._get_pe_file_version")
+    def test_get_browser_version_windows_no_subprocess(self, mock_pe, mock_run):
+        """Test that Windows reads the PE version resource instead of forking."""
+        mock_pe.return_value = "120.0.6099.130"
+
+        with patch("core.browser_manager.sys.platform", "win32"):
+            version = BrowserManager._get_browser_version(r"C:\Chrome\chrome.exe")
+
+        assert version == "120.0.6099.130"
+        mock_run.assert_not_called()
+
     def test_get_browser_version_from_path(self):
         """Test extracting version from path string."""
         path = r"C:\Users\App\Local\Google\Chrome\Application\120.0.6099.130\chrome.exe"
@@ -135,3 +355,40 @@ class TestBrowserManager:
         path, source = BrowserManager.get_best_browser()
         assert path == "path/to/pw/chrome"
         assert "Playwright" in source
+
+    @pytest.mark.asyncio
+    @patch("core.browser_manager.BrowserManager.detect_browsers")
+    async def test_detect_browsers_async(self, mock_detect):
+        """Test that the async wrapper returns the sync scan result."""
+        mock_detect.return_value = [BrowserInfo(name="Chrome", path="path/to/chrome")]
+
+        browsers = await BrowserManager.detect_browsers_async()
+
+        assert [b.name for b in browsers] == ["Chrome"]
+        mock_detect.assert_called_once()
+
+    @patch("subprocess.Popen")
+    def test_browser_launch_quick_exit_fails(self, mock_popen):
+        """Test that a browser exiting immediately with an error is a failure."""
+        mock_popen.return_value.wait.return_value = 1
+
+        ok, msg = BrowserManager.test_browser_launch("chrome.exe")
+
+        assert not ok
+        assert "code 1" in msg
+        mock_popen.return_value.terminate.assert_not_called()
+
+    @patch("subprocess.Popen")
+    def test_browser_launch_running_is_terminated(self, mock_popen):
+        """Test that a browser still running after the grace period succeeds."""
+        import subprocess
+
+        mock_popen.return_value.wait.side_effect = [
+            subprocess.TimeoutExpired("chrome.exe", 0.5),
+            0,
+        ]
+
+        ok, _ = BrowserManager.test_browser_launch("chrome.exe")
+
+        assert ok
+        mock_popen.return_value.terminate.assert_called_once()
@@ -0,0 +1,445 @@
+"""Unit tests for CaptchaManager provider selection and fallback."""
+
+import asyncio
+import dataclasses
+import inspect
+import logging
+from unittest.mock import ANY, AsyncMock, patch
+
+import pytest
+
+from core.captcha_manager import CaptchaManager
+from core.captcha_solver import AntiCaptchaSolver, CaptchaSolution, TwoCaptchaSolver
+from core.models import CaptchaConfig, CaptchaProvider, CaptchaType
+
+
+@pytest.fixture(autouse=True)
+async def close_manager_session(request):
+    """Close the HTTP session opened by the test's manager, if any."""
+    yield
+    manager = getattr(request.instance, "manager", None)
+    if manager is not None:
+        await manager.aclose()
+
+
+class TestCaptchaManagerSolve:
+    """Tests for the shared solve dispatcher."""
+
+    def setup_method(self):
+        """Setup manager with both providers replaced by mocks."""
+        self.config = CaptchaConfig(twocaptcha_key="two", anticaptcha_key="anti")
+        self.manager = CaptchaManager(self.config)
+        self.two = AsyncMock()
+        self.anti = AsyncMock()
+        self.manager._solvers[CaptchaProvider.TWOCAPTCHA] = self.two
+        self.manager._solvers[CaptchaProvider.ANTICAPTCHA] = self.anti
+        self.manager.reconfigure()
+
+    @pytest.mark.asyncio
+    async def test_solve_dispatches_to_matching_solver_method(self):
+        """Test that each public solve method calls the same solver method."""
+        self.two.solve_recaptcha_v3.return_value = CaptchaSolution(
+            success=True, token="tok"
+        )
+
+        result = await self.manager.solve_recaptcha_v3("key", "https://x", "login")
+
+        assert result.token == "tok"
+        self.two.solve_recaptcha_v3.assert_awaited_once_with(
+            "key", "https://x", "login", session=ANY
+        )
+        self.anti.solve_recaptcha_v3.assert_not_awaited()
+
+    def test_public_solve_methods_are_documented(self):
+        """Test that help() on the bound solve methods shows their docstrings."""
+        for name in (
+            "solve_turnstile",
+            "solve_recaptcha_v2",
+            "solve_recaptcha_v3",
+            "solve_hcaptcha",
+        ):
+            assert "provider selection" in inspect.getdoc(getattr(self.manager, name))
+            assert "provider selection" in inspect.getdoc(getattr(CaptchaManager, name))
+
+    @pytest.mark.asyncio
+    async def test_solve_forwards_keyword_arguments(self):
+        """Test that keyword arguments reach the solver method."""
+        self.two.solve_recaptcha_v3.return_value = CaptchaSolution(success=True)
+
+        await self.manager.solve_recaptcha_v3("key", "https://x", action="submit")
+
+        self.two.solve_recaptcha_v3.assert_awaited_once_with(
+            "key", "https://x", action="submit", session=ANY
+        )
+
+    @pytest.mark.asyncio
+    async def test_solve_falls_back_to_next_provider(self):
+        """Test that a failed provider falls back in preference order."""
+        self.anti.solve_hcaptcha.return_value = CaptchaSolution(
+            success=False, error="no workers"
+        )
+        self.two.solve_hcaptcha.return_value = CaptchaSolution(success=True, token="ok")
+
+        result = await self.manager.solve_hcaptcha("key", "https://x")
+
+        assert result.success
+        self.anti.solve_hcaptcha.assert_awaited_once()
+        self.two.solve_hcaptcha.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_solve_without_fallback_reports_last_error(self):
+        """Test that fallback disabled stops after the first provider."""
+        self.manager.config = dataclasses.replace(self.config, fallback_enabled=False)
+        self.manager.reconfigure()
+        self.two.solve_turnstile.side_effect = RuntimeError("timeout")
+
+        result = await self.manager.solve_turnstile("key", "https://x")
+
+        assert not result.success
+        assert "timeout" in result.error
+        self.anti.solve_turnstile.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_solve_logs_provider_display_name(self, caplog):
+        """Test that attempts are logged with the solver's provider name."""
+        self.two.PROVIDER_NAME = "2captcha"
+        self.two.solve_turnstile.return_value = CaptchaSolution(success=True, token="t")
+
+        with caplog.at_level(logging.INFO):
+            await self.manager.solve_turnstile("key", "https://x")
+
+        assert "Attempting Turnstile solve with 2captcha" in caplog.text
+        assert "Turnstile solved successfully by 2captcha" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_solve_without_solvers(self):
+        """Test the error returned when no provider is available."""
+        self.manager._solvers.clear()
+        self.manager.reconfigure()
+
+        result = await self.manager._solve(
+            CaptchaType.TURNSTILE, "solve_turnstile", "key", "https://x"
+        )
+
+        assert result.error == "No captcha solver configured"
+
+
+class TestCaptchaManagerCooldown:
+    """Tests for skipping providers after transient failures."""
+
+    def setup_method(self):
+        """Setup manager with both providers replaced by mocks."""
+        self.manager = CaptchaManager(
+            CaptchaConfig(twocaptcha_key="two", anticaptcha_key="anti")
+        )
+        self.two = AsyncMock()
+        self.anti = AsyncMock()
+        self.manager._solvers[CaptchaProvider.TWOCAPTCHA] = self.two
+        self.manager._solvers[CaptchaProvider.ANTICAPTCHA] = self.anti
+        self.manager.reconfigure()
+
+    @pytest.mark.asyncio
+    async def test_no_slot_error_skips_provider_until_cooldown_ends(self):
+        """Test that a busy provider is skipped for the next solves only."""
+        self.two.solve_turnstile.return_value = CaptchaSolution(
+            success=False, error="Failed to submit task: ERROR_NO_SLOT_AVAILABLE"
+        )
+        self.anti.solve_turnstile.return_value = CaptchaSolution(success=True, token="t")
+
+        with patch("core.captcha_manager.time.monotonic", return_value=100.0):
+            await self.manager.solve_turnstile("key", "https://x")
+            await self.manager.solve_turnstile("key", "https://x")
+        assert self.two.solve_turnstile.await_count == 1
+        assert self.anti.solve_turnstile.await_count == 2
+
+        with patch("core.captcha_manager.time.monotonic", return_value=106.0):
+            await self.manager.solve_turnstile("key", "https://x")
+        assert self.two.solve_turnstile.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_does_not_cool_down(self):
+        """Test that non-transient failures keep the provider in rotation."""
+        self.two.solve_turnstile.return_value = CaptchaSolution(
+            success=False, error="ERROR_CAPTCHA_UNSOLVABLE"
+        )
+        self.anti.solve_turnstile.return_value = CaptchaSolution(success=True, token="t")
+
+        await self.manager.solve_turnstile("key", "https://x")
+        await self.manager.solve_turnstile("key", "https://x")
+
+        assert self.two.solve_turnstile.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_all_providers_cooling_down(self):
+        """Test the failure returned when every provider is on cooldown."""
+        self.two.solve_turnstile.side_effect = RuntimeError("boom")
+        self.anti.solve_turnstile.return_value = CaptchaSolution(
+            success=False, error="ERROR_ZERO_BALANCE"
+        )
+
+        await self.manager.solve_turnstile("key", "https://x")
+        result = await self.manager.solve_turnstile("key", "https://x")
+
+        assert result.error == "All captcha providers are cooling down"
+        assert self.two.solve_turnstile.await_count == 1
+        assert self.anti.solve_turnstile.await_count == 1
+
+
+class TestCaptchaManagerTokenCache:
+    """Tests for reusing solved tokens (config.reuse_tokens)."""
+
+    def _manager(self, reuse_tokens):
+        manager = CaptchaManager(
+            CaptchaConfig(twocaptcha_key="two", reuse_tokens=reuse_tokens)
+        )
+        solver = AsyncMock()
+        solver.solve_turnstile.return_value = CaptchaSolution(success=True, token="t")
+        manager._solvers[CaptchaProvider.TWOCAPTCHA] = solver
+        manager.reconfigure()
+        self.manager = manager
+        return manager, solver
+
+    @pytest.mark.asyncio
+    async def test_token_reused_until_ttl_expires(self):
+        """Test that a solved token is returned again until it expires."""
+        manager, solver = self._manager(reuse_tokens=True)
+
+        with patch("core.captcha_manager.time.monotonic", return_value=100.0):
+            first = await manager.solve_turnstile("key", "https://x")
+            second = await manager.solve_turnstile("key", "https://x")
+            await manager.solve_turnstile("other", "https://x")
+        assert second is first
+        assert solver.solve_turnstile.await_count == 2
+
+        with patch("core.captcha_manager.time.monotonic", return_value=211.0):
+            await manager.solve_turnstile("key", "https://x")
+        assert solver.solve_turnstile.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_tokens_not_reused_by_default(self):
+        """Test that every solve hits the provider when reuse is off."""
+        manager, solver = self._manager(reuse_tokens=False)
+
+        await manager.solve_turnstile("key", "https://x")
+        await manager.solve_turnstile("key", "https://x")
+
+        assert solver.solve_turnstile.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_token_cache_is_bounded(self):
+        """Test that the least recently used token is evicted past the limit."""
+        manager, _solver = self._manager(reuse_tokens=True)
+
+        with patch("core.captcha_manager.TOKEN_CACHE_SIZE", 2):
+            for site_key in ("a", "b", "c"):
+                await manager.solve_turnstile(site_key, "https://x")
+
+        assert [key[1][0] for key in manager._token_cache] == ["b", "c"]
+
+
+class TestCaptchaManagerBalances:
+    """Tests for multi-provider balance queries."""
+
+    def setup_method(self):
+        """Setup manager with both providers replaced by mocks."""
+        self.manager = CaptchaManager(
+            CaptchaConfig(twocaptcha_key="two", anticaptcha_key="anti")
+        )
+        self.two = AsyncMock()
+        self.anti = AsyncMock()
+        self.manager._solvers[CaptchaProvider.TWOCAPTCHA] = self.two
+        self.manager._solvers[CaptchaProvider.ANTICAPTCHA] = self.anti
+
+    @pytest.mark.asyncio
+    async def test_get_balances_queries_providers_concurrently(self):
+        """Test that balance requests overlap instead of running in sequence."""
+        in_flight = 0
+        peak = 0
+
+        async def slow_balance(value):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return value
+
+        self.two.get_balance = lambda session: slow_balance(1.5)
+        self.anti.get_balance = lambda session: slow_balance(2.5)
+
+        balances = await self.manager.get_balances()
+
+        assert balances == {"2captcha": 1.5, "anticaptcha": 2.5}
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_get_balances_failed_provider_reports_minus_one(self):
+        """Test that one failing provider doesn't hide the other's balance."""
+        self.two.get_balance.side_effect = RuntimeError("bad key")
+        self.anti.get_balance.return_value = 3.0
+
+        balances = await self.manager.get_balances()
+
+        assert balances == {"2captcha": -1, "anticaptcha": 3.0}
+
+
+class TestCaptchaManagerSession:
+    """Tests for the HTTP session shared between solvers."""
+
+    @pytest.mark.asyncio
+    async def test_solvers_share_one_session_until_closed(self):
+        """Test that both real solvers get the same session and aclose() ends it."""
+        self.manager = CaptchaManager(
+            CaptchaConfig(twocaptcha_key="two", anticaptcha_key="anti")
+        )
+        two = self.manager._solvers[CaptchaProvider.TWOCAPTCHA]
+        anti = self.manager._solvers[CaptchaProvider.ANTICAPTCHA]
+        two.get_balance = AsyncMock(return_value=1.0)
+        anti.get_balance = AsyncMock(return_value=2.0)
+
+        await self.manager.get_balances()
+        session = two.get_balance.await_args.kwargs["session"]
+        await self.manager.get_balances()
+
+        assert session is not None
+        anti.get_balance.assert_awaited_with(session=session)
+        two.get_balance.assert_awaited_with(session=session)
+
+        await self.manager.aclose()
+        assert session.closed
+
+    def test_session_from_stopped_loop_is_released(self):
+        """Test that a new event loop gets a new session and the old one is let go."""
+        self.manager = None
+        manager = CaptchaManager(CaptchaConfig(twocaptcha_key="two"))
+
+        async def ensure():
+            return manager._ensure_session()
+
+        first = asyncio.run(ensure())
+        second = asyncio.run(ensure())
+        try:
+            assert second is not first
+            assert first.closed
+            assert not second.closed
+        finally:
+            asyncio.run(second.close())
+
+
+class _FakeResponse:
+    """Minimal aiohttp response: an async context manager with json()."""
+
+    def __init__(self, data):
+        self._data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        await asyncio.sleep(0)
+        return self._data
+
+
+class _FakeSession:
+    """Session whose replies depend on the request, for concurrent submits."""
+
+    closed = False
+
+    def __init__(self, reply):
+        self._reply = reply
+
+    def get(self, url, params=None):
+        return _FakeResponse(self._reply(params))
+
+    def post(self, url, json=None):
+        return _FakeResponse(self._reply(json))
+
+
+class TestCaptchaSolverSubmitErrors:
+    """Tests that rejected submissions report their own provider error."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_2captcha_rejections_keep_their_errors(self):
+        """Test each concurrent solve reports the error of its own submit."""
+        solver = TwoCaptchaSolver("key")
+        session = _FakeSession(lambda params: {"status": 0, "request": params["sitekey"]})
+
+        results = await asyncio.gather(
+            solver.solve_turnstile("ERROR_NO_SLOT_AVAILABLE", "https://x", session=session),
+            solver.solve_turnstile("ERROR_ZERO_BALANCE", "https://x", session=session),
+        )
+
+        assert [r.error for r in results] == [
+            "Failed to submit task: ERROR_NO_SLOT_AVAILABLE",
+            "Failed to submit task: ERROR_ZERO_BALANCE",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_anticaptcha_rejection_reports_error_code(self):
+        """Test a rejected AntiCaptcha task carries the provider error code."""
+        solver = AntiCaptchaSolver("key")
+        session = _FakeSession(
+            lambda payload: {"errorId": 1, "errorCode": "ERROR_ZERO_BALANCE"}
+        )
+
+        result = await solver.solve_hcaptcha("site", "https://x", session=session)
+
+        assert result.error == "Failed to create task: ERROR_ZERO_BALANCE"
+
+
+class TestCaptchaManagerSolverOrder:
+    """Tests for the precomputed per-type solver order."""
+
+    def _manager(self, **config_kwargs):
+        config = CaptchaConfig(twocaptcha_key="two", anticaptcha_key="anti", **config_kwargs)
+        manager = CaptchaManager(config)
+        return manager, manager._solvers
+
+    def test_auto_mode_follows_type_preferences(self):
+        """Test that AUTO mode orders providers per captcha type."""
+        manager, solvers = self._manager()
+
+        assert manager._get_solver_order(CaptchaType.TURNSTILE) == (
+            solvers[CaptchaProvider.TWOCAPTCHA],
+            solvers[CaptchaProvider.ANTICAPTCHA],
+        )
+        assert manager._get_solver_order(CaptchaType.HCAPTCHA) == (
+            solvers[CaptchaProvider.ANTICAPTCHA],
+            solvers[CaptchaProvider.TWOCAPTCHA],
+        )
+
+    def test_primary_provider_without_fallback(self):
+        """Test that a fixed primary without fallback yields a single solver."""
+        manager, solvers = self._manager(
+            primary_provider=CaptchaProvider.ANTICAPTCHA, fallback_enabled=False
+        )
+
+        for captcha_type in CaptchaType:
+            assert manager._get_solver_order(captcha_type) == (
+                solvers[CaptchaProvider.ANTICAPTCHA],
+            )
+
+    def test_primary_provider_with_fallback(self):
+        """Test that a fixed primary comes first, then the other providers."""
+        manager, solvers = self._manager(primary_provider=CaptchaProvider.ANTICAPTCHA)
+
+        assert manager._get_solver_order(CaptchaType.TURNSTILE) == (
+            solvers[CaptchaProvider.ANTICAPTCHA],
+            solvers[CaptchaProvider.TWOCAPTCHA],
+        )
+
+    def test_order_is_cached_until_reconfigure(self):
+        """Test that the order is precomputed and rebuilt by reconfigure()."""
+        manager, solvers = self._manager()
+        order = manager._get_solver_order(CaptchaType.TURNSTILE)
+        assert manager._get_solver_order(CaptchaType.TURNSTILE) is order
+
+        del solvers[CaptchaProvider.TWOCAPTCHA]
+        manager.reconfigure()
+
+        assert manager._get_solver_order(CaptchaType.TURNSTILE) == (
+            solvers[CaptchaProvider.ANTICAPTCHA],
+        )
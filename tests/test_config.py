@@ -64,3 +64,53 @@ class TestConfigLoading:
             del os.environ["DM_MASTER_PORT"]
             del os.environ["DM_SLAVE_SECRET"]
             del os.environ["DM_HEADLESS"]
+
+
+class TestTrafficConfigBuilderCache:
+    """Tests for reusing the last config built from unchanged settings."""
+
+    def setup_method(self):
+        from core.config_builder import TrafficConfigBuilder
+
+        self.builder = TrafficConfigBuilder
+        self.builder._last_build = None
+
+    def test_unchanged_settings_reuse_config(self):
+        """Test that identical settings return the cached config."""
+        settings = {"threads": 3, "engine_mode": "browser"}
+
+        first = self.builder.from_settings(settings, "https://a.com")
+        second = self.builder.from_settings(dict(settings), "https://a.com")
+
+        assert second is first
+        assert first.max_threads == 3
+
+    def test_url_change_swaps_only_target(self):
+        """Test that a new URL reuses the rest of the cached config."""
+        first = self.builder.from_settings({"threads": 3}, "https://a.com")
+        second = self.builder.from_settings({"threads": 3}, "https://b.com")
+
+        assert second.target_url == "https://b.com"
+        assert second.browser is first.browser
+        assert first.target_url == "https://a.com"
+
+    def test_changed_setting_rebuilds(self):
+        """Test that a changed relevant setting builds a new config."""
+        first = self.builder.from_settings({"threads": 3}, "https://a.com")
+        second = self.builder.from_settings({"threads": 4}, "https://a.com")
+
+        assert second is not first
+        assert second.max_threads == 4
+
+    def test_config_keys_cover_every_setting_read(self):
+        """Test that CONFIG_KEYS lists every key the builder reads."""
+        read = set()
+
+        class RecordingDict(dict):
+            def get(self, key, default=None):
+                read.add(key)
+                return super().get(key, default)
+
+        self.builder._build(RecordingDict(), "https://a.com")
+
+        assert read == set(self.builder.CONFIG_KEYS)
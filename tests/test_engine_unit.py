@@ -5,12 +5,14 @@ burst mode logic, and error handling.
 """
 
 import asyncio
+import random
+import re
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from core.engine import AsyncTrafficEngine
-from core.models import ProxyConfig
+from core.engine import AsyncTrafficEngine, _weighted_pick
+from core.models import ProxyConfig, SessionData
 from tests.fixtures.mock_responses import (
     build_proxy_config,
     build_proxy_list,
@@ -18,6 +20,11 @@ from tests.fixtures.mock_responses import (
 )
 
 
+def in_use_count(proxies):
+    """Count proxies currently held by at least one request."""
+    return sum(p.in_use > 0 for p in proxies)
+
+
 # =============================================================================
 # Proxy Acquisition Tests
 # =============================================================================
@@ -44,8 +51,8 @@ class TestProxyAcquisition:
 
         assert proxy is not None
         assert isinstance(proxy, ProxyConfig)
-        assert (proxy.host, proxy.port) in self.engine._proxies_in_use
-        assert len(self.engine._proxies_in_use) == 1
+        assert proxy.in_use == 1
+        assert in_use_count(self.proxies) == 1
 
     @pytest.mark.asyncio
     async def test_acquire_proxy_empty_pool_returns_none(self):
@@ -58,7 +65,7 @@ class TestProxyAcquisition:
     async def test_acquire_proxy_marks_in_use(self):
         """Test acquired proxy is marked as in-use."""
         proxy = await self.engine._acquire_proxy()
-        assert (proxy.host, proxy.port) in self.engine._proxies_in_use
+        assert proxy.in_use == 1
 
     @pytest.mark.asyncio
     async def test_acquire_multiple_proxies(self):
@@ -67,10 +74,10 @@ class TestProxyAcquisition:
         p2 = await self.engine._acquire_proxy()
         p3 = await self.engine._acquire_proxy()
 
-        assert len(self.engine._proxies_in_use) == 3
-        assert (p1.host, p1.port) in self.engine._proxies_in_use
-        assert (p2.host, p2.port) in self.engine._proxies_in_use
-        assert (p3.host, p3.port) in self.engine._proxies_in_use
+        assert in_use_count(self.proxies) == 3
+        assert p1.in_use == 1
+        assert p2.in_use == 1
+        assert p3.in_use == 1
 
     @pytest.mark.asyncio
     async def test_acquire_proxy_round_robin_fallback(self):
@@ -82,7 +89,7 @@ class TestProxyAcquisition:
         # Acquire all available proxies
         await engine._acquire_proxy()
         await engine._acquire_proxy()
-        assert len(engine._proxies_in_use) == 2
+        assert in_use_count(proxies) == 2
 
         # Next acquisition should still work (round-robin reuse)
         p3 = await engine._acquire_proxy()
@@ -115,6 +122,35 @@ class TestProxyAcquisition:
         # High-score proxy should be selected most often
         assert selections.get("3.3.3.3", 0) > selections.get("1.1.1.1", 0)
 
+    @pytest.mark.asyncio
+    async def test_equal_scores_skip_weighted_pick(self):
+        """Test uniform scores use random.choice instead of the weighted pick."""
+        assert self.engine._all_equal_scores is True
+
+        with patch("core.engine._weighted_pick") as mock_pick:
+            proxy = await self.engine._acquire_proxy()
+
+        assert proxy in self.proxies
+        mock_pick.assert_not_called()
+
+    def test_mark_scores_dirty_detects_rescoring(self):
+        """Test rescoring a proxy turns the weighted path back on."""
+        self.proxies[0].score = 50.0
+        self.engine._mark_scores_dirty()
+        assert self.engine._all_equal_scores is False
+
+    def test_weighted_pick_matches_score_ratio(self):
+        """Test A-Res pick frequencies follow the score weights."""
+        low = build_proxy_config(host="1.1.1.1")
+        high = build_proxy_config(host="2.2.2.2")
+        low.score, high.score = 1.0, 3.0
+
+        random.seed(1234)
+        hits = sum(_weighted_pick([low, high]) is high for _ in range(4000))
+
+        # Expected share is 3 / (1 + 3) = 0.75
+        assert 0.72 < hits / 4000 < 0.78
+
 
 # =============================================================================
 # Proxy Release Tests
@@ -134,10 +170,10 @@ class TestProxyRelease:
     async def test_release_proxy_removes_from_use_set(self):
         """Test proxy release removes from in-use set."""
         proxy = await self.engine._acquire_proxy()
-        assert len(self.engine._proxies_in_use) == 1
+        assert in_use_count(self.proxies) == 1
 
         await self.engine._release_proxy(proxy)
-        assert len(self.engine._proxies_in_use) == 0
+        assert in_use_count(self.proxies) == 0
 
     @pytest.mark.asyncio
     async def test_release_unknown_proxy_no_error(self):
@@ -145,13 +181,13 @@ class TestProxyRelease:
         proxy = build_proxy_config(host="9.9.9.9")
         # Should not raise
         await self.engine._release_proxy(proxy)
-        assert len(self.engine._proxies_in_use) == 0
+        assert in_use_count(self.proxies) == 0
 
     @pytest.mark.asyncio
     async def test_release_none_proxy_no_error(self):
         """Test releasing None proxy doesn't crash."""
         await self.engine._release_proxy(None)
-        assert len(self.engine._proxies_in_use) == 0
+        assert in_use_count(self.proxies) == 0
 
     @pytest.mark.asyncio
     async def test_acquire_release_cycle(self):
@@ -162,13 +198,141 @@ class TestProxyRelease:
             proxy = await self.engine._acquire_proxy()
             acquired.append(proxy)
 
-        assert len(self.engine._proxies_in_use) == 5
+        assert in_use_count(self.proxies) == 5
 
         # Release all proxies
         for proxy in acquired:
             await self.engine._release_proxy(proxy)
 
-        assert len(self.engine._proxies_in_use) == 0
+        assert in_use_count(self.proxies) == 0
+        assert len(self.engine._available) == 5
+
+    @pytest.mark.asyncio
+    async def test_shared_proxy_requeued_after_last_release(self):
+        """Test a round-robin shared proxy only goes back when all users release it."""
+        proxies = build_proxy_list(count=1)
+        engine = AsyncTrafficEngine(self.config, proxies)
+
+        first = await engine._acquire_proxy()
+        second = await engine._acquire_proxy()
+        assert first is second
+
+        await engine._release_proxy(first)
+        assert len(engine._available) == 0
+        await engine._release_proxy(second)
+        assert list(engine._available) == proxies
+
+    @pytest.mark.asyncio
+    async def test_release_forgotten_proxy_not_requeued(self):
+        """Test a proxy whose users were zeroed (dead) is not put back."""
+        proxy = await self.engine._acquire_proxy()
+        proxy.in_use = 0
+
+        await self.engine._release_proxy(proxy)
+        assert proxy not in self.engine._available
+
+
+# =============================================================================
+# Session Pool Tests
+# =============================================================================
+
+
+class TestSessionPool:
+    """Tests for keep-alive session reuse."""
+
+    def setup_method(self):
+        """Setup common test objects."""
+        self.config = build_traffic_config()
+        self.engine = AsyncTrafficEngine(self.config, build_proxy_list(count=2))
+
+    @pytest.mark.asyncio
+    async def test_same_key_reuses_session(self):
+        """Test same impersonation/proxy gets the same session back."""
+        with patch("core.engine.requests.AsyncSession", side_effect=lambda **_: AsyncMock()):
+            key = ("chrome120", "http://1.1.1.1:8080")
+            first = self.engine._checkout_session(key)
+            await self.engine._checkin_session(key, first)
+            second = self.engine._checkout_session(key)
+            other = self.engine._checkout_session(("safari", ""))
+
+        assert first is second
+        assert other is not first
+        first.close.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_get_separate_sessions(self):
+        """Test a session is never shared by two in-flight requests."""
+        with patch("core.engine.requests.AsyncSession", side_effect=lambda **_: AsyncMock()):
+            key = ("chrome120", "")
+            first = self.engine._checkout_session(key)
+            second = self.engine._checkout_session(key)
+
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_idle_cap_closes_least_recent(self):
+        """Test idle sessions over the cap are closed oldest first."""
+        with (
+            patch("core.engine.SESSION_POOL_SIZE", 2),
+            patch("core.engine.requests.AsyncSession", side_effect=lambda **_: AsyncMock()),
+        ):
+            sessions = {k: self.engine._checkout_session((k, "")) for k in "abc"}
+            for k in "abc":
+                await self.engine._checkin_session((k, ""), sessions[k])
+
+        assert ("a", "") not in self.engine._idle_sessions
+        assert self.engine._idle_count == 2
+        sessions["a"].close.assert_awaited_once()
+        sessions["c"].close.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unsaved_response_cookies_not_reused(self):
+        """Test a cookie set by a 403 does not ride along on the next visit."""
+        session_data = SessionData(
+            domain="example.com",
+            cookies=[{"name": "sid", "value": "1"}],
+            last_used=0.0,
+            created=0.0,
+        )
+        self.engine.session_manager = MagicMock()
+        self.engine.session_manager.get_session.return_value = session_data
+        self.engine._view_min = self.engine._view_span = 0
+
+        jar = {}
+        session = AsyncMock()
+        session.cookies = MagicMock()
+        session.cookies.set.side_effect = lambda name, value, **_: jar.update(
+            {name: value}
+        )
+        session.cookies.clear.side_effect = jar.clear
+        sent = []
+
+        async def fake_get(*args, **kwargs):
+            sent.append(dict(jar))
+            jar["challenge"] = "x"  # Server sets a cookie on the error page
+            return MagicMock(status_code=403, cookies=[])
+
+        session.get = fake_get
+        self.engine.running = True
+        with patch("core.engine.requests.AsyncSession", return_value=session):
+            await self.engine._make_request()
+            await self.engine._make_request()
+
+        assert sent == [{"sid": "1"}, {"sid": "1"}]
+
+    @pytest.mark.asyncio
+    async def test_close_all_closes_pooled_sessions(self):
+        """Test close_all closes idle and checked-out sessions."""
+        with patch("core.engine.requests.AsyncSession", side_effect=lambda **_: AsyncMock()):
+            idle = self.engine._checkout_session(("chrome120", ""))
+            await self.engine._checkin_session(("chrome120", ""), idle)
+            busy = self.engine._checkout_session(("safari", ""))
+
+        await self.engine.close_all()
+
+        idle.close.assert_awaited_once()
+        busy.close.assert_awaited_once()
+        assert len(self.engine._idle_sessions) == 0
 
 
 # =============================================================================
@@ -207,6 +371,7 @@ class TestRequestExecution:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(return_value=mock_response)
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
         self.engine.running = True
@@ -216,6 +381,27 @@ class TestRequestExecution:
         assert self.engine.stats.success == 1
         assert self.engine.stats.failed == 0
 
+    @pytest.mark.asyncio
+    @patch("core.engine.requests.AsyncSession")
+    async def test_make_request_sends_cached_headers(self, mock_session_cls):
+        """Test each request gets its own copy of the cached headers plus a referer."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+
+        mock_session = AsyncMock()
+        mock_session.get = AsyncMock(return_value=mock_response)
+        mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
+        mock_session_cls.return_value = mock_session
+
+        self.engine.running = True
+        await self.engine._make_request()
+
+        headers = mock_session.get.call_args.kwargs["headers"]
+        assert headers["Referer"] in self.engine._referers
+        assert headers is not self.engine._base_headers
+        assert "Referer" not in self.engine._base_headers
+
     @pytest.mark.asyncio
     @patch("core.engine.requests.AsyncSession")
     async def test_make_request_failure_status(self, mock_session_cls):
@@ -226,6 +412,7 @@ class TestRequestExecution:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(return_value=mock_response)
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
         self.engine.running = True
@@ -242,6 +429,7 @@ class TestRequestExecution:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(side_effect=Exception("Network error"))
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
         self.engine.running = True
@@ -260,13 +448,14 @@ class TestRequestExecution:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(return_value=mock_response)
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
         self.engine.running = True
         await self.engine._make_request()
 
         # Proxy should be released
-        assert len(self.engine._proxies_in_use) == 0
+        assert in_use_count(self.proxies) == 0
 
     @pytest.mark.asyncio
     @patch("core.engine.requests.AsyncSession")
@@ -275,13 +464,14 @@ class TestRequestExecution:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(side_effect=Exception("Network error"))
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
         self.engine.running = True
         await self.engine._make_request()
 
         # Proxy should still be released
-        assert len(self.engine._proxies_in_use) == 0
+        assert in_use_count(self.proxies) == 0
 
     @pytest.mark.asyncio
     @patch("core.engine.requests.AsyncSession")
@@ -293,6 +483,7 @@ class TestRequestExecution:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(return_value=mock_response)
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
         self.engine.running = True
@@ -333,9 +524,10 @@ class TestDeadProxyRemoval:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(side_effect=Exception("Fatal Proxy Error"))
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
-        with patch("core.engine.PROXY_ERROR_CODES", ["Fatal Proxy Error"]):
+        with patch("core.engine.PROXY_ERROR_RE", re.compile("Fatal Proxy Error")):
             engine.running = True
             initial_count = len(engine.proxies)
 
@@ -355,15 +547,52 @@ class TestDeadProxyRemoval:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(side_effect=Exception("Fatal Proxy Error"))
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
-        with patch("core.engine.PROXY_ERROR_CODES", ["Fatal Proxy Error"]):
+        with patch("core.engine.PROXY_ERROR_RE", re.compile("Fatal Proxy Error")):
             engine.running = True
             await engine._make_request()
 
             assert len(engine.proxies) == 0
             assert engine.running is False
 
+    @pytest.mark.asyncio
+    @patch("core.engine.requests.AsyncSession")
+    async def test_curl_proxy_error_code_removes_proxy(self, mock_session_cls):
+        """Test a real curl proxy error code matches the precompiled pattern."""
+        proxies = build_proxy_list(count=3)
+        engine = AsyncTrafficEngine(self.config, proxies)
+
+        mock_session = AsyncMock()
+        mock_session.get = AsyncMock(
+            side_effect=Exception("Failed to perform, curl: (7) Couldn't connect")
+        )
+        mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
+        mock_session_cls.return_value = mock_session
+
+        engine.running = True
+        await engine._make_request()
+
+        assert len(engine.proxies) == 2
+
+    def test_remove_proxy_swaps_in_last(self):
+        """Test O(1) removal keeps the position index consistent."""
+        proxies = build_proxy_list(count=4)
+        engine = AsyncTrafficEngine(self.config, proxies)
+        first, second, third, last = proxies
+
+        assert engine._remove_proxy(second) is True
+        assert engine._remove_proxy(second) is False
+        assert engine.proxies[1] is last
+        assert len(engine.proxies) == 3
+
+        # Moved proxy can still be removed through its updated position
+        assert engine._remove_proxy(last) is True
+        assert engine._remove_proxy(first) is True
+        assert engine.proxies == [third]
+
     @pytest.mark.asyncio
     @patch("core.engine.requests.AsyncSession")
     async def test_non_proxy_error_keeps_proxy(self, mock_session_cls):
@@ -374,9 +603,10 @@ class TestDeadProxyRemoval:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(side_effect=Exception("Generic network error"))
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
-        with patch("core.engine.PROXY_ERROR_CODES", ["SPECIFIC_PROXY_ERROR"]):
+        with patch("core.engine.PROXY_ERROR_RE", re.compile("SPECIFIC_PROXY_ERROR")):
             engine.running = True
             initial_count = len(engine.proxies)
 
@@ -415,6 +645,7 @@ class TestStatisticsTracking:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(return_value=mock_response)
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
         self.engine.running = True
@@ -433,6 +664,7 @@ class TestStatisticsTracking:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(return_value=mock_response)
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
         self.engine.running = True
@@ -478,6 +710,7 @@ class TestBurstMode:
             mock_session = AsyncMock()
             mock_session.get = AsyncMock(return_value=mock_response)
             mock_session.close = AsyncMock()
+            mock_session.cookies = MagicMock()
             mock_session_cls.return_value = mock_session
 
             await engine.run()
@@ -485,6 +718,41 @@ class TestBurstMode:
         # Verify it ran the expected number of requests
         assert engine.stats.total_requests >= 2
 
+    @pytest.mark.asyncio
+    async def test_burst_cancels_stragglers_before_sleep(self):
+        """Test requests outliving the burst window are cancelled, not orphaned."""
+        config = build_traffic_config(
+            burst_mode=True,
+            burst_requests=2,
+            burst_sleep_min=0.001,
+            burst_sleep_max=0.002,
+            total_visits=2,
+            min_duration=0.001,
+            max_duration=0.002,
+        )
+        engine = AsyncTrafficEngine(config, self.proxies, on_log=self.mock_on_log)
+
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(60)
+
+        with (
+            patch("core.engine.REQUEST_TIMEOUT_SECONDS", 0.05),
+            patch("core.engine.requests.AsyncSession") as mock_session_cls,
+        ):
+            mock_session = AsyncMock()
+            mock_session.get = hang
+            mock_session.cookies = MagicMock()
+            mock_session_cls.return_value = mock_session
+
+            await asyncio.wait_for(engine.run(), timeout=5)
+
+        assert engine.stats.failed == 2
+        assert engine.stats.active_threads == 0
+        assert in_use_count(self.proxies) == 0
+        # Abandoned sessions are closed rather than pooled
+        assert engine._idle_count == 0
+        mock_session.close.assert_awaited()
+
     @pytest.mark.asyncio
     async def test_continuous_mode_no_burst_sleep(self):
         """Test continuous mode doesn't have burst sleeps."""
@@ -503,6 +771,7 @@ class TestBurstMode:
             mock_session = AsyncMock()
             mock_session.get = AsyncMock(return_value=mock_response)
             mock_session.close = AsyncMock()
+            mock_session.cookies = MagicMock()
             mock_session_cls.return_value = mock_session
 
             await engine.run()
@@ -543,6 +812,7 @@ class TestRunLoop:
             mock_session = AsyncMock()
             mock_session.get = AsyncMock(return_value=mock_response)
             mock_session.close = AsyncMock()
+            mock_session.cookies = MagicMock()
             mock_session_cls.return_value = mock_session
 
             await engine.run()
@@ -580,6 +850,7 @@ class TestRunLoop:
             mock_session = AsyncMock()
             mock_session.get = delayed_get
             mock_session.close = AsyncMock()
+            mock_session.cookies = MagicMock()
             mock_session_cls.return_value = mock_session
 
             await engine.run()
@@ -605,6 +876,7 @@ class TestRunLoop:
             mock_session = AsyncMock()
             mock_session.get = AsyncMock(return_value=mock_response)
             mock_session.close = AsyncMock()
+            mock_session.cookies = MagicMock()
             mock_session_cls.return_value = mock_session
 
             # Run in background and stop after a short time
@@ -617,6 +889,26 @@ class TestRunLoop:
         assert engine.running is False
         assert engine.stats.total_requests > 0
 
+    @pytest.mark.asyncio
+    async def test_run_refills_slot_when_task_completes(self):
+        """Test a finished request is replaced immediately, not on a poll tick."""
+        config = build_traffic_config(total_visits=20, max_threads=1)
+        engine = AsyncTrafficEngine(config, self.proxies)
+
+        async def quick_request():
+            engine.stats.total_requests += 1
+            await asyncio.sleep(0.005)
+
+        engine._make_request = quick_request
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.wait_for(engine.run(), timeout=5)
+
+        # 20 sequential requests; a 100 ms poll would need ~2 s
+        assert engine.stats.total_requests == 20
+        assert loop.time() - started < 1.0
+
 
 # =============================================================================
 # Callback Tests
@@ -645,6 +937,7 @@ class TestCallbacks:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(return_value=mock_response)
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
         await engine.run()
@@ -668,6 +961,7 @@ class TestCallbacks:
         mock_session = AsyncMock()
         mock_session.get = AsyncMock(return_value=mock_response)
         mock_session.close = AsyncMock()
+        mock_session.cookies = MagicMock()
         mock_session_cls.return_value = mock_session
 
         await engine.run()
@@ -676,3 +970,32 @@ class TestCallbacks:
         log_messages = [str(call) for call in mock_on_log.call_args_list]
         stopped_logged = any("stopped" in msg.lower() for msg in log_messages)
         assert stopped_logged
+
+    def test_on_update_throttled_while_running(self):
+        """Test back-to-back completions are coalesced into one on_update."""
+        mock_on_update = MagicMock()
+        engine = AsyncTrafficEngine(self.config, self.proxies, on_update=mock_on_update)
+        engine.running = True
+
+        engine._emit_update()
+        engine._emit_update()
+        assert mock_on_update.call_count == 1
+
+        engine._emit_update(force=True)
+        assert mock_on_update.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_on_update_flushed_when_run_ends(self):
+        """Test the final stats are pushed once the run loop exits."""
+        mock_on_update = MagicMock()
+        config = build_traffic_config(total_visits=5, max_threads=5)
+        engine = AsyncTrafficEngine(config, self.proxies, on_update=mock_on_update)
+
+        async def counted_request():
+            engine.stats.total_requests += 1
+            engine._emit_update()
+
+        engine._make_request = counted_request
+        await engine.run()
+
+        assert mock_on_update.call_args.args[0].total_requests == 5
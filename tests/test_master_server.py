@@ -1,8 +1,9 @@
 """Tests for MasterServer class."""
 
 import asyncio
+import threading
 import time
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -27,6 +28,19 @@ class TestDataClasses:
         assert stats.status == "idle"
         assert stats.requests == 0
         assert stats.cpu_percent == 0.0
+        assert stats.log_prefix == "[test-slave] "
+
+    def test_stats_dataclasses_are_slotted(self):
+        """Test per-slave/per-result records carry no instance dict."""
+        stats = SlaveStats(
+            slave_id="test-id",
+            slave_name="test-slave",
+            ip_address="192.168.1.1",
+            connected_at=1000.0,
+            last_heartbeat=1000.0,
+        )
+        assert not hasattr(stats, "__dict__")
+        assert not hasattr(AggregatedStats(), "__dict__")
 
     def test_aggregated_stats_defaults(self):
         """Test AggregatedStats default values."""
@@ -93,9 +107,32 @@ class TestSlaveStatsTracking:
     """Test slave stats tracking functionality."""
 
     def test_get_slaves_empty(self):
-        """Test get_slaves returns empty list when no slaves."""
+        """Test get_slaves returns empty tuple when no slaves."""
         server = MasterServer(secret_key="a" * 32)
-        assert server.get_slaves() == []
+        assert server.get_slaves() == ()
+
+    def test_get_slaves_is_snapshot(self):
+        """Test get_slaves is not affected by later connects."""
+        server = MasterServer(secret_key="a" * 32)
+        server._handle_slave_connected("slave1", {"name": "Slave 1"})
+
+        slaves = server.get_slaves()
+        server._handle_slave_connected("slave2", {"name": "Slave 2"})
+
+        assert [s.slave_id for s in slaves] == ["slave1"]
+
+    def test_get_slaves_cached_until_membership_changes(self):
+        """Test get_slaves reuses its snapshot until a slave joins or leaves."""
+        server = MasterServer(secret_key="a" * 32)
+        server._handle_slave_connected("slave1", {"name": "Slave 1"})
+
+        first = server.get_slaves()
+        server._handle_message("slave1", MessageType.STATUS_UPDATE, {"cpu_percent": 5})
+        assert server.get_slaves() is first
+        assert first[0].cpu_percent == 5
+
+        server._handle_slave_disconnected("slave1")
+        assert server.get_slaves() == ()
 
     def test_get_slave_not_found(self):
         """Test get_slave returns None for unknown slave."""
@@ -113,30 +150,27 @@ class TestSlaveStatsTracking:
         """Test stats aggregation from multiple slaves."""
         server = MasterServer(secret_key="a" * 32)
 
-        # Manually add slave stats for testing
-        server._slave_stats["slave1"] = SlaveStats(
-            slave_id="slave1",
-            slave_name="Slave 1",
-            ip_address="1.1.1.1",
-            connected_at=time.time(),
-            last_heartbeat=time.time(),
-            requests=100,
-            success=90,
-            failed=10,
-            cpu_percent=50.0,
-            memory_percent=60.0,
+        server._handle_slave_connected("slave1", {"name": "Slave 1", "ip": "1.1.1.1"})
+        server._handle_slave_connected("slave2", {"name": "Slave 2", "ip": "2.2.2.2"})
+        server._handle_message(
+            "slave1",
+            MessageType.TRAFFIC_STATS,
+            {"total_requests": 100, "success": 90, "failed": 10},
         )
-        server._slave_stats["slave2"] = SlaveStats(
-            slave_id="slave2",
-            slave_name="Slave 2",
-            ip_address="2.2.2.2",
-            connected_at=time.time(),
-            last_heartbeat=time.time(),
-            requests=200,
-            success=180,
-            failed=20,
-            cpu_percent=70.0,
-            memory_percent=80.0,
+        server._handle_message(
+            "slave2",
+            MessageType.TRAFFIC_STATS,
+            {"total_requests": 200, "success": 180, "failed": 20},
+        )
+        server._handle_message(
+            "slave1",
+            MessageType.STATUS_UPDATE,
+            {"cpu_percent": 50.0, "memory_percent": 60.0},
+        )
+        server._handle_message(
+            "slave2",
+            MessageType.STATUS_UPDATE,
+            {"cpu_percent": 70.0, "memory_percent": 80.0},
         )
 
         stats = server.get_aggregated_stats()
@@ -147,6 +181,53 @@ class TestSlaveStatsTracking:
         assert stats.avg_cpu == 60.0  # (50 + 70) / 2
         assert stats.avg_memory == 70.0  # (60 + 80) / 2
 
+    def test_aggregated_stats_track_updates_and_disconnects(self):
+        """Test running totals follow repeated updates and slave departures."""
+        server = MasterServer(secret_key="a" * 32)
+        server._handle_slave_connected("slave-1", {"name": "A", "ip": "1.1.1.1"})
+        server._handle_slave_connected("slave-2", {"name": "B", "ip": "2.2.2.2"})
+
+        # Progress messages carry cumulative values, not increments
+        check = MessageType.CHECK_PROGRESS
+        server._handle_message("slave-1", check, {"checked": 10, "alive": 2})
+        server._handle_message("slave-1", check, {"checked": 25, "alive": 5})
+        server._handle_message("slave-2", check, {"checked": 5, "alive": 1})
+
+        stats = server.get_aggregated_stats()
+        assert stats.total_proxies_checked == 30
+        assert stats.total_proxies_alive == 6
+
+        server._handle_slave_disconnected("slave-1")
+        stats = server.get_aggregated_stats()
+        assert stats.active_slaves == 1
+        assert stats.total_proxies_checked == 5
+
+        server._handle_slave_disconnected("slave-2")
+        assert server.get_aggregated_stats() == AggregatedStats()
+
+    def test_invalid_payload_values_count_as_zero(self):
+        """Test None or malformed numbers from a slave don't break the totals."""
+        server = MasterServer(secret_key="a" * 32)
+        server._handle_slave_connected("slave-1", {"name": "A"})
+
+        server._handle_message(
+            "slave-1",
+            MessageType.TRAFFIC_STATS,
+            {"total_requests": None, "success": "7", "failed": "lots"},
+        )
+        server._handle_message(
+            "slave-1",
+            MessageType.STATUS_UPDATE,
+            {"cpu_percent": None, "memory_percent": float("nan")},
+        )
+
+        stats = server.get_aggregated_stats()
+        assert stats.total_requests == 0
+        assert stats.total_success == 7
+        assert stats.total_failed == 0
+        assert stats.avg_cpu == 0.0
+        assert stats.avg_memory == 0.0
+
 
 class TestCallbackWrapper:
     """Test callback wrapper functionality."""
@@ -186,6 +267,28 @@ class TestCallbackWrapper:
         server._log("test message")
         assert "test message" in log_messages
 
+    def test_callbacks_run_inline_without_wrapper(self):
+        """Test callbacks are called directly when no GUI wrapper is given."""
+        logs = []
+        callback = MagicMock()
+        server = MasterServer(secret_key="a" * 32, on_log=logs.append)
+
+        server._log("test message")
+        server._wrap_callback(callback, "slave-1", 2)
+
+        assert logs == ["test message"]
+        callback.assert_called_once_with("slave-1", 2)
+
+    def test_log_without_on_log_skips_wrapper(self):
+        """Test _log goes straight to the logger when on_log is not set."""
+        wrapper = MagicMock()
+        server = MasterServer(secret_key="a" * 32, callback_wrapper=wrapper)
+
+        server._log("test message")
+
+        assert server._log == server.logger.info
+        wrapper.assert_not_called()
+
 
 class TestMessageHandlers:
     """Test message handler methods."""
@@ -252,7 +355,7 @@ class TestMessageHandlers:
             last_heartbeat=time.time(),
         )
 
-        server._update_slave_status("slave-1", {
+        server._handle_message("slave-1", MessageType.STATUS_UPDATE, {
             "status": "scraping",
             "operation": "proxy scrape",
             "cpu_percent": 45.5,
@@ -264,6 +367,8 @@ class TestMessageHandlers:
         assert stats.current_operation == "proxy scrape"
         assert stats.cpu_percent == 45.5
         assert stats.memory_percent == 62.3
+        assert 0 <= time.time() - stats.last_heartbeat < 1
+        assert 0 <= time.monotonic() - stats._last_heartbeat_mono < 1
 
     def test_update_traffic_stats(self):
         """Test traffic stats update."""
@@ -277,7 +382,7 @@ class TestMessageHandlers:
             last_heartbeat=time.time(),
         )
 
-        server._update_traffic_stats("slave-1", {
+        server._handle_message("slave-1", MessageType.TRAFFIC_STATS, {
             "total_requests": 1000,
             "success": 950,
             "failed": 50,
@@ -290,6 +395,209 @@ class TestMessageHandlers:
         assert stats.failed == 50
 
 
+class TestScanResults:
+    """Test scan result storage."""
+
+    def _add_results(self, server, ports):
+        results = [{"ip": "10.0.0.1", "port": port, "service": "ssh"} for port in ports]
+        server._handle_message(
+            "slave-1", MessageType.SCAN_RESULTS, {"results": results}
+        )
+
+    def test_scan_result_fields_mapped(self):
+        """Test every payload field lands on the matching entry attribute."""
+        server = MasterServer(secret_key="a" * 32)
+        server._handle_slave_connected("slave-1", {"name": "Scanner", "ip": "1.1.1.1"})
+        result = {
+            "ip": "10.0.0.1",
+            "port": 22,
+            "service": "ssh",
+            "banner": "SSH-2.0-OpenSSH_9.6",
+            "fingerprint": "openssh",
+            "version": "9.6",
+            "scan_time": 0.25,
+            "has_valid_credentials": True,
+            "username": "root",
+        }
+
+        server._handle_message(
+            "slave-1", MessageType.SCAN_RESULTS, {"results": [result]}
+        )
+
+        (entry,) = server.get_scan_results()
+        assert entry.slave_id == "slave-1"
+        assert entry.slave_name == "Scanner"
+        for key, value in result.items():
+            assert getattr(entry, key) == value
+        assert entry.timestamp > 0
+
+    def test_scan_results_bounded(self):
+        """Test the oldest scan results are dropped past the cap."""
+        server = MasterServer(secret_key="a" * 32, max_scan_results=3)
+        server._handle_slave_connected("slave-1", {"name": "Scanner", "ip": "1.1.1.1"})
+
+        self._add_results(server, [1, 2, 3, 4, 5])
+
+        assert [r.port for r in server.get_scan_results()] == [3, 4, 5]
+
+    def test_scan_results_limit_returns_newest(self):
+        """Test limit returns the newest results, oldest first."""
+        server = MasterServer(secret_key="a" * 32)
+        server._handle_slave_connected("slave-1", {"name": "Scanner", "ip": "1.1.1.1"})
+
+        self._add_results(server, [1, 2, 3, 4])
+
+        assert [r.port for r in server.get_scan_results(limit=2)] == [3, 4]
+        assert len(server.get_scan_results(limit=10)) == 4
+
+    def test_scan_results_batch_callback_once_per_message(self):
+        """Test a multi-result message reaches the batch callback in one hop."""
+        hops = []
+        batches = []
+        per_entry = MagicMock()
+        server = MasterServer(
+            secret_key="a" * 32,
+            callback_wrapper=lambda cb: (hops.append(cb), cb()),
+            on_scan_result=per_entry,
+            on_scan_results_batch=batches.append,
+        )
+        server._handle_slave_connected("slave-1", {"name": "Scanner", "ip": "1.1.1.1"})
+        hops.clear()
+
+        self._add_results(server, [22, 3389, 2222])
+
+        assert len(hops) == 1
+        assert [r.port for r in batches[0]] == [22, 3389, 2222]
+        per_entry.assert_not_called()
+
+    def test_scan_result_per_entry_callback_without_batch(self):
+        """Test the per-entry callback still fires when no batch callback is set."""
+        per_entry = MagicMock()
+        server = MasterServer(secret_key="a" * 32, on_scan_result=per_entry)
+        server._handle_slave_connected("slave-1", {"name": "Scanner", "ip": "1.1.1.1"})
+
+        self._add_results(server, [22, 3389])
+
+        assert per_entry.call_count == 2
+
+
+class TestMessageCoalescing:
+    """Test coalescing of status/progress messages for the GUI."""
+
+    def setup_method(self):
+        """Create a server with a batch callback."""
+        self.batches = []
+        self.on_message = MagicMock()
+        self.server = MasterServer(
+            secret_key="a" * 32,
+            on_message=self.on_message,
+            on_message_batch=self.batches.append,
+        )
+        self.server._handle_slave_connected("slave-1", {"name": "A", "ip": "1.1.1.1"})
+
+    def test_progress_messages_coalesced_to_latest(self):
+        """Test repeated progress frames collapse into one batched entry."""
+        for checked in (10, 20, 30):
+            self.server._handle_message(
+                "slave-1", MessageType.CHECK_PROGRESS, {"checked": checked, "alive": 1}
+            )
+
+        # Stats are applied immediately; only the GUI forwarding waits
+        assert self.server.get_slave("slave-1").proxies_checked == 30
+        assert self.batches == []
+
+        self.server._flush_pending_updates()
+
+        assert self.batches == [
+            [("slave-1", MessageType.CHECK_PROGRESS, {"checked": 30, "alive": 1})]
+        ]
+        self.on_message.assert_not_called()
+
+    def test_logs_still_forwarded_immediately(self):
+        """Test non-progress messages bypass the coalescing."""
+        self.server._handle_message(
+            "slave-1", MessageType.LOG_INFO, {"message": "hello"}
+        )
+
+        self.on_message.assert_called_once()
+        self.server._flush_pending_updates()
+        assert self.batches == []
+
+    @pytest.mark.asyncio
+    async def test_flush_loop_delivers_batches(self):
+        """Test the flusher task drains pending updates on its tick."""
+        self.server._handle_message(
+            "slave-1", MessageType.TRAFFIC_STATS, {"total_requests": 5}
+        )
+
+        with patch("core.master_server.STATS_FLUSH_INTERVAL", 0.01):
+            task = asyncio.create_task(self.server._flush_updates_loop())
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+        assert len(self.batches) == 1
+
+
+class TestMessageDispatch:
+    """Test _handle_message routing."""
+
+    def test_dispatch_routes_updates_and_logs(self):
+        """Test stats and log messages reach their handlers."""
+        logs = []
+        server = MasterServer(secret_key="a" * 32, on_log=logs.append)
+        server._handle_slave_connected("slave-1", {"name": "A", "ip": "1.1.1.1"})
+
+        server._handle_message(
+            "slave-1", MessageType.SCRAPE_PROGRESS, {"proxies_found": 7}
+        )
+        server._handle_message(
+            "slave-1", MessageType.LOG_ERROR, {"message": "boom"}
+        )
+
+        assert server.get_slave("slave-1").proxies_found == 7
+        assert logs[-1] == "[A] [ERROR] boom"
+
+    @pytest.mark.parametrize(
+        ("log_type", "level"),
+        [
+            (MessageType.LOG_INFO, "INFO"),
+            (MessageType.LOG_WARNING, "WARNING"),
+            (MessageType.LOG_ERROR, "ERROR"),
+        ],
+    )
+    def test_slave_log_levels(self, log_type, level):
+        """Test each slave log type is labelled with its level."""
+        logs = []
+        server = MasterServer(secret_key="a" * 32, on_log=logs.append)
+        server._handle_slave_connected("slave-1", {"name": "A"})
+
+        server._handle_message("slave-1", log_type, {"message": "hi"})
+
+        assert logs[-1] == f"[A] [{level}] hi"
+
+    def test_unknown_slave_skips_handler(self):
+        """Test messages from an unknown slave are only forwarded."""
+        logs = []
+        on_message = MagicMock()
+        server = MasterServer(
+            secret_key="a" * 32, on_log=logs.append, on_message=on_message
+        )
+
+        server._handle_message("ghost", MessageType.LOG_ERROR, {"message": "boom"})
+
+        assert logs == []
+        on_message.assert_called_once()
+
+    def test_unhandled_type_is_ignored(self):
+        """Test a message type without a handler is only forwarded."""
+        on_message = MagicMock()
+        server = MasterServer(secret_key="a" * 32, on_message=on_message)
+
+        server._handle_message("slave-1", MessageType.HEARTBEAT, {})
+
+        on_message.assert_called_once()
+
+
 class TestCommandDistribution:
     """Test command distribution methods (without actual server)."""
 
@@ -323,6 +631,132 @@ class TestCommandDistribution:
         result = server.start_traffic_on_slaves(target_url="http://test.com")
         assert result == 0
 
+    def _run_loop(self, server):
+        """Give the server a real event loop running in a background thread."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        server._running = True
+        server._loop = loop
+        server._server = MagicMock()
+        return loop, thread
+
+    def _stop_loop(self, loop, thread):
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+    def test_send_command_async_skips_unknown_slave(self):
+        """Test send_command_async rejects slaves that are not connected."""
+        server = MasterServer(secret_key="a" * 32)
+        server._running = True
+        server._loop = MagicMock()
+
+        with patch("asyncio.run_coroutine_threadsafe") as schedule:
+            assert not server.send_command_async("ghost", MessageType.STOP, {})
+        schedule.assert_not_called()
+
+    def test_send_command_async_reports_via_callback(self):
+        """Test the send result reaches on_done without blocking the caller."""
+        server = MasterServer(secret_key="a" * 32)
+        loop, thread = self._run_loop(server)
+        server._server.send_command = AsyncMock(return_value=True)
+        server._handle_slave_connected("slave-1", {"name": "A"})
+        results = []
+        done = threading.Event()
+
+        def on_done(sent):
+            results.append(sent)
+            done.set()
+
+        try:
+            assert server.send_command_async(
+                "slave-1", MessageType.STOP, {}, on_done=on_done
+            )
+            assert done.wait(timeout=5)
+        finally:
+            self._stop_loop(loop, thread)
+
+        assert results == [True]
+        server._server.send_command.assert_awaited_once_with(
+            "slave-1", MessageType.STOP, {}
+        )
+
+    def test_send_command_async_times_out(self):
+        """Test a send that exceeds COMMAND_TIMEOUT reports failure."""
+        server = MasterServer(secret_key="a" * 32)
+        loop, thread = self._run_loop(server)
+
+        async def hang(*args):
+            await asyncio.sleep(60)
+
+        server._server.send_command = hang
+        server._handle_slave_connected("slave-1", {"name": "A"})
+        results = []
+        done = threading.Event()
+
+        def on_done(sent):
+            results.append(sent)
+            done.set()
+
+        try:
+            with patch("core.master_server.COMMAND_TIMEOUT", 0.05):
+                server.send_command_async(
+                    "slave-1", MessageType.STOP, {}, on_done=on_done
+                )
+            assert done.wait(timeout=5)
+        finally:
+            self._stop_loop(loop, thread)
+
+        assert results == [False]
+
+    def test_stop_slaves_with_on_done_does_not_block(self):
+        """Test bulk commands with on_done report the count via the callback."""
+        server = MasterServer(secret_key="a" * 32)
+        loop, thread = self._run_loop(server)
+        server._server.broadcast_command = AsyncMock(return_value=3)
+        results = []
+        done = threading.Event()
+
+        def on_done(count):
+            results.append(count)
+            done.set()
+
+        try:
+            assert server.stop_slaves(on_done=on_done) is None
+            assert done.wait(timeout=5)
+        finally:
+            self._stop_loop(loop, thread)
+
+        assert results == [3]
+        server._server.broadcast_command.assert_awaited_once_with(MessageType.STOP, {})
+
+    def test_bulk_on_done_reports_zero_when_not_running(self):
+        """Test on_done still fires when the command cannot be queued."""
+        server = MasterServer(secret_key="a" * 32)
+        results = []
+
+        server.start_scrape_on_slaves(["slave-1"], on_done=results.append)
+
+        assert results == [0]
+
+    def test_stop_slaves_uses_single_hop(self):
+        """Test explicit slave lists are sent in one call to the loop."""
+        server = MasterServer(secret_key="a" * 32)
+        server._running = True
+        server._loop = MagicMock()
+        server._server = MagicMock()
+
+        with patch("asyncio.run_coroutine_threadsafe") as schedule:
+            schedule.return_value.result.return_value = 2
+            count = server.stop_slaves(["slave-1", "slave-2", "ghost"])
+
+        assert count == 2
+        schedule.assert_called_once()
+        server._server.send_command_many.assert_called_once_with(
+            ["slave-1", "slave-2", "ghost"], MessageType.STOP, {}
+        )
+
     def test_stop_slaves_not_running(self):
         """Test stop_slaves when not running."""
         server = MasterServer(secret_key="a" * 32)
@@ -356,3 +790,35 @@ class TestServerLifecycle:
 
         # Cleanup
         server._running = False
+
+    def test_start_prefers_uvloop(self):
+        """Test the background loop comes from uvloop when it is installed."""
+        fake_uvloop = MagicMock()
+        fake_uvloop.new_event_loop.side_effect = asyncio.new_event_loop
+        server = MasterServer(host="127.0.0.1", port=18767, secret_key="a" * 32)
+
+        with (
+            patch("core.master_server.UVLOOP_AVAILABLE", True),
+            patch("core.master_server.uvloop", fake_uvloop),
+        ):
+            assert server.start()
+
+        try:
+            fake_uvloop.new_event_loop.assert_called_once()
+        finally:
+            server.stop()
+
+    def test_start_failure_returns_without_waiting(self):
+        """Test start() returns as soon as the server fails to come up."""
+        ws_server = MagicMock()
+        ws_server.start = AsyncMock(side_effect=OSError("address in use"))
+        ws_server.stop = AsyncMock()
+        server = MasterServer(host="127.0.0.1", port=18768, secret_key="a" * 32)
+
+        with patch("core.master_server.WebSocketServer", return_value=ws_server):
+            began = time.monotonic()
+            result = server.start()
+            elapsed = time.monotonic() - began
+
+        assert not result
+        assert elapsed < 1
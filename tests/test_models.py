@@ -9,7 +9,12 @@ from core.models import (
     CaptchaConfig, 
     ProtectionBypassConfig, 
     EngineMode,
-    CaptchaProvider
+    CaptchaProvider,
+    BrowserSelection,
+    TrafficStats,
+    ProxyCheckResult,
+    SessionData,
+    SourceHealth,
 )
 
 def test_proxy_config_serialization():
@@ -45,6 +50,45 @@ def test_proxy_config_curl_format():
     p2 = ProxyConfig(host="1.1.1.1", port=80, protocol="socks5")
     assert p2.to_curl_cffi_format() == "socks5://1.1.1.1:80"
 
+def test_proxy_config_proxies_dict_cached():
+    """Test proxies_dict maps both schemes and is built only once."""
+    p = ProxyConfig(host="1.1.1.1", port=80, protocol="socks5")
+    assert p.proxies_dict == {"http": "socks5://1.1.1.1:80", "https": "socks5://1.1.1.1:80"}
+    assert p.proxies_dict is p.proxies_dict
+
+def test_traffic_stats_is_slotted():
+    """Test TrafficStats counters live in slots, not a per-instance dict."""
+    stats = TrafficStats()
+    stats.success += 1
+    assert stats.success == 1
+    assert not hasattr(stats, "__dict__")
+
+def test_record_dataclasses_are_slotted():
+    """Test the high-volume record types carry no per-instance dict."""
+    proxy = ProxyConfig(host="1.1.1.1", port=80)
+    result = ProxyCheckResult(proxy, "Active", 100, "HTTP", "Testland", "TL")
+    session = SessionData("example.com", [], 0.0, 0.0)
+    health = SourceHealth(url="https://example.com/list.txt")
+    for record in (result, session, health):
+        assert not hasattr(record, "__dict__")
+
+def test_option_enums_use_str_hashing():
+    """Test option enums hash like their values and round-trip from them."""
+    assert hash(EngineMode.CURL) == hash("curl")
+    assert {CaptchaProvider.AUTO: 1}[CaptchaProvider.AUTO] == 1
+    assert EngineMode("browser") is EngineMode.BROWSER
+    assert str(EngineMode.CURL) == "EngineMode.CURL"
+
+def test_browser_executable_path():
+    """Test get_executable_path picks the selected browser's path, if set."""
+    cfg = BrowserConfig(
+        selected_browser=BrowserSelection.EDGE, edge_path="/opt/edge", chrome_path="/c"
+    )
+    assert cfg.get_executable_path() == "/opt/edge"
+    brave = BrowserConfig(selected_browser=BrowserSelection.BRAVE)
+    assert brave.get_executable_path() is None
+    assert BrowserConfig(chrome_path="/c").get_executable_path() is None
+
 def test_traffic_config_defaults():
     """Test TrafficConfig initialization with minimal args."""
     # Setup nested configs
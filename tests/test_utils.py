@@ -43,3 +43,24 @@ class TestUtils:
         assert "socks5://1.1.1.1:80" in result
         assert "http://2.2.2.2:80" in result
         assert "https://3.3.3.3:443" in result
+
+    def test_save_proxies_slotted_results(self, tmp_path):
+        """Slotted ProxyCheckResult objects are serialized field by field."""
+        import json
+
+        from core.models import ProxyCheckResult, ProxyConfig
+
+        result = ProxyCheckResult(
+            proxy=ProxyConfig(host="1.1.1.1", port=80),
+            status="Active",
+            speed=120,
+            type="HTTP",
+            country="Testland",
+            country_code="TL",
+        )
+        path = tmp_path / "proxies.json"
+
+        assert Utils.save_proxies([result], str(path))
+        saved = json.loads(path.read_text())
+        assert saved[0]["host"] == "1.1.1.1"
+        assert saved[0]["speed"] == 120
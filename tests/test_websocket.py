@@ -5,6 +5,8 @@ Tests authentication, message passing, heartbeat, and reconnection logic.
 """
 
 import asyncio
+import time
+
 import pytest
 
 from core.websocket_client import WebSocketClient
@@ -203,6 +205,31 @@ class TestMessagePassing:
 
         await client.disconnect()
 
+    @pytest.mark.asyncio
+    async def test_on_message_error_is_contained(self, server, client, caplog):
+        """Test an on_message error is logged and later messages still arrive."""
+        received = []
+
+        def on_message(slave_id, message_type, payload):
+            received.append(payload["n"])
+            if payload["n"] == 1:
+                raise ValueError("handler bug")
+
+        server.on_message = on_message
+
+        await client.connect()
+        await asyncio.sleep(0.5)
+
+        await client.send_stats(MessageType.TRAFFIC_STATS, {"n": 1})
+        await client.send_stats(MessageType.TRAFFIC_STATS, {"n": 2})
+        await asyncio.sleep(0.2)
+
+        assert received == [1, 2]
+        assert "handler bug" in caplog.text
+        assert "Unknown message type" not in caplog.text
+
+        await client.disconnect()
+
     @pytest.mark.asyncio
     async def test_broadcast_command(self, server):
         """Test broadcasting command to multiple slaves."""
@@ -244,6 +271,44 @@ class TestMessagePassing:
             await client.disconnect()
 
 
+    @pytest.mark.asyncio
+    async def test_send_command_many(self, server):
+        """Test sending to a list of slaves counts only delivered commands."""
+        clients = []
+        received_count = 0
+
+        def on_command(command_type, params):
+            nonlocal received_count
+            received_count += 1
+
+        for i in range(2):
+            client = WebSocketClient(
+                master_host="127.0.0.1",
+                master_port=18765,
+                secret_key="test_secret_key_at_least_32_characters_long_for_security",
+                slave_name=f"slave-{i}",
+                heartbeat_interval=1,
+            )
+            client.on_command = on_command
+            await client.connect()
+            clients.append(client)
+
+        await asyncio.sleep(0.5)
+        slave_ids = [s["slave_id"] for s in server.get_connected_slaves()]
+
+        sent_count = await server.send_command_many(
+            slave_ids + ["ghost"], MessageType.STOP, {}
+        )
+
+        await asyncio.sleep(0.2)
+
+        assert sent_count == 2
+        assert received_count == 2
+
+        for client in clients:
+            await client.disconnect()
+
+
 class TestHeartbeat:
     """Test heartbeat mechanism."""
 
@@ -264,6 +329,8 @@ class TestHeartbeat:
         slaves = server.get_connected_slaves()
         assert len(slaves) == 1
         assert slaves[0]["last_heartbeat"] > initial_heartbeat
+        # Both timestamps are wall clock, so they can be compared directly
+        assert slaves[0]["connected_at"] <= slaves[0]["last_heartbeat"] <= time.time()
 
         await client.disconnect()
 
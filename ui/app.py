@@ -533,6 +533,8 @@ class ModernTrafficBot(ctk.CTk):
         """Auto-detect all installed browsers and populate paths."""
         from core.browser_manager import BrowserManager
 
+        # Explicit user request: rescan instead of using cached results
+        BrowserManager.refresh()
         browsers = BrowserManager.detect_browsers()
 
         if not browsers:
@@ -594,7 +596,14 @@ class ModernTrafficBot(ctk.CTk):
                 )
 
                 manager = CaptchaManager(config)
-                balances = asyncio.run(manager.get_balances())
+
+                async def _fetch_balances():
+                    try:
+                        return await manager.get_balances()
+                    finally:
+                        await manager.aclose()
+
+                balances = asyncio.run(_fetch_balances())
 
                 # Format balance display
                 parts = []
@@ -633,6 +633,11 @@ class MasterControlPage:
         )
         self._no_results_label.grid(row=0, column=0, columnspan=6, pady=20)
 
+    def _add_scan_results(self, entries: list[Any]) -> None:
+        """Add every result from one slave message to the table."""
+        for entry in entries:
+            self._add_scan_result(entry)
+
     def _add_scan_result(self, entry: Any) -> None:
         """Add a scan result to the display (thread-safe callback)."""
         # Hide the "no results" placeholder
@@ -843,7 +848,7 @@ class MasterControlPage:
             callback_wrapper=lambda cb: self.app.after(0, cb),
             on_slave_connected=self._on_slave_connected,
             on_slave_disconnected=self._on_slave_disconnected,
-            on_scan_result=self._add_scan_result,
+            on_scan_results_batch=self._add_scan_results,
             on_log=self.log,
         )
 
@@ -1004,8 +1009,21 @@ class MasterControlPage:
     def _stop_slave(self, slave_id: str) -> None:
         """Stop operation on a specific slave."""
         if self.master_server:
-            self.master_server.stop_slaves([slave_id])
-            self.log(f"Sent stop command to slave {slave_id[:8]}...")
+            from core.websocket_server import MessageType
+
+            short_id = slave_id[:8]
+            queued = self.master_server.send_command_async(
+                slave_id,
+                MessageType.STOP,
+                {},
+                on_done=lambda sent: self.log(
+                    f"Sent stop command to slave {short_id}..."
+                    if sent
+                    else f"Failed to send stop command to slave {short_id}..."
+                ),
+            )
+            if not queued:
+                self.log(f"Slave {short_id}... is not connected")
 
     def _disconnect_slave(self, slave_id: str) -> None:
         """Disconnect a specific slave."""
@@ -1020,8 +1038,9 @@ class MasterControlPage:
             self.log("Server not running")
             return
 
-        count = self.master_server.start_scrape_on_slaves()
-        self.log(f"Started proxy scraping on {count} slaves")
+        self.master_server.start_scrape_on_slaves(
+            on_done=lambda count: self.log(f"Started proxy scraping on {count} slaves")
+        )
 
     def _start_check_all(self) -> None:
         """Start proxy checking on all slaves."""
@@ -1030,8 +1049,12 @@ class MasterControlPage:
             return
 
         threads = int(self.slider_threads.get())
-        count = self.master_server.start_check_on_slaves(threads=threads)
-        self.log(f"Started proxy checking on {count} slaves ({threads} threads each)")
+        self.master_server.start_check_on_slaves(
+            threads=threads,
+            on_done=lambda count: self.log(
+                f"Started proxy checking on {count} slaves ({threads} threads each)"
+            ),
+        )
 
     def _start_traffic_all(self) -> None:
         """Start traffic generation on all slaves."""
@@ -1049,11 +1072,13 @@ class MasterControlPage:
             return
 
         threads = int(self.slider_threads.get())
-        count = self.master_server.start_traffic_on_slaves(
+        self.master_server.start_traffic_on_slaves(
             target_url=target_url,
             threads=threads,
+            on_done=lambda count: self.log(
+                f"Started traffic to {target_url} on {count} slaves"
+            ),
         )
-        self.log(f"Started traffic to {target_url} on {count} slaves")
 
     def _stop_all_slaves(self) -> None:
         """Stop all operations on all slaves."""
@@ -1061,8 +1086,9 @@ class MasterControlPage:
             self.log("Server not running")
             return
 
-        count = self.master_server.stop_slaves()
-        self.log(f"Stopped operations on {count} slaves")
+        self.master_server.stop_slaves(
+            on_done=lambda count: self.log(f"Stopped operations on {count} slaves")
+        )
 
     def _start_scan_all(self) -> None:
         """Start network scanning on all slaves."""
@@ -1093,11 +1119,14 @@ class MasterControlPage:
             ports = [22, 3389]  # Default SSH and RDP
 
         # Start scan
-        count = self.master_server.start_scan_on_slaves(
+        self.master_server.start_scan_on_slaves(
             targets=targets,
             ports=ports,
+            on_done=lambda count: self.log(
+                f"Started network scan on {count} slaves: "
+                f"{len(targets)} targets, ports {ports}"
+            ),
         )
-        self.log(f"Started network scan on {count} slaves: {len(targets)} targets, ports {ports}")
 
     # ==================== Stats Display ====================
 
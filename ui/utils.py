@@ -217,8 +217,8 @@ class Utils:
         # Convert to serializable format first (outside retry loop)
         data = []
         for p in proxy_results:
-            if hasattr(p, '__dict__'):
-                # It's an object, extract relevant fields
+            if not isinstance(p, dict):
+                # It's an object (possibly slotted), extract relevant fields
                 entry = {
                     "host": p.proxy.host if hasattr(p, 'proxy') else "",
                     "port": p.proxy.port if hasattr(p, 'proxy') else 0,
@@ -232,7 +232,7 @@ class Utils:
                     "anonymity": p.anonymity if hasattr(p, 'anonymity') else "Unknown",
                 }
                 data.append(entry)
-            elif isinstance(p, dict):
+            else:
                 data.append(p)
 
         # Ensure directory exists